@@ -0,0 +1,67 @@
+"""
+Compares the import extraction engines on large generated modules.
+
+Usage:
+    python -m benchmarks.bench_extractors [--functions N] [--repeat N]
+"""
+import argparse
+import ast
+import time
+from src.parser import EXTRACTORS
+
+
+def generate_large_module(functions: int) -> str:
+    """
+    Generates an expression-heavy module, similar to generated code (tables, protobuf descriptors, ...).
+
+    :param functions: Number of functions in the module
+
+    :return: Source code of the module
+    """
+    lines = ["import os", "from collections import OrderedDict", ""]
+    for i in range(functions):
+        lines.append(f"def function_{i}(x):")
+        lines.append(f"    if x > {i}:")
+        lines.append(f"        import json")
+        lines.append(f"    table = {{{', '.join(f'{j}: (x * {j} + {i}) // 3' for j in range(20))}}}")
+        lines.append(f"    return [table[k] + len(str(k)) for k in sorted(table) if k % 2 == 0]")
+        lines.append("")
+    return "\n".join(lines)
+
+
+def best_time(func, repeat: int) -> float:
+    """
+    :return: Best wall time of 'repeat' calls, in seconds
+    """
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark of the import extraction engines.")
+    parser.add_argument("--functions", type=int, default=2000, help="Number of functions in the generated module.")
+    parser.add_argument("--repeat", type=int, default=5, help="Number of measures (the best one is kept).")
+    args = parser.parse_args()
+
+    source = generate_large_module(args.functions)
+    tree = ast.parse(source)
+    parse_time = best_time(lambda: ast.parse(source), args.repeat)
+
+    print(f"Module: {len(source.splitlines())} lines, {len(source) / 1024:.0f} KiB")
+    print(f"ast.parse: {parse_time * 1000:.1f} ms")
+
+    reference = None
+    for name, iter_import_nodes in EXTRACTORS.items():
+        count = len(list(iter_import_nodes(tree)))
+        elapsed = best_time(lambda: list(iter_import_nodes(tree)), args.repeat)
+        reference = reference or elapsed
+        print(f"{name:>12}: {elapsed * 1000:8.1f} ms traversal ({count} imports), "
+              f"x{reference / elapsed:.1f} vs 'ast', {(parse_time + elapsed) * 1000:.1f} ms with parsing")
+
+
+if __name__ == "__main__":
+    main()
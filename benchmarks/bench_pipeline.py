@@ -0,0 +1,138 @@
+"""
+Times each stage of the analysis (walk, parse, module map, resolve, render, metrics) on a generated project,
+and writes the results as JSON so that they can be compared between revisions.
+
+Usage:
+    python -m benchmarks.bench_pipeline [--files N] [--imports N] [--depth N]
+                                        [--relative SHARE] [--stdlib SHARE] [--external SHARE]
+                                        [--repeat N] [--jobs N] [--project PATH] [--output PATH]
+"""
+import argparse
+import json
+import platform
+import shutil
+import sys
+import tempfile
+import time
+from src.classifier import ModuleClassifier
+from src.graph import build_graph
+from src.graph_generator import to_digraph
+from src.metrics import compute_metrics
+from src.parser import (build_module_map, collect_all_dependencies)
+from src.scanner import scan_project
+from src.utils import ModuleResolver
+from .synthetic import generate_project
+
+STAGES = ["walk", "parse", "module_map", "resolve", "render", "metrics"]
+
+
+def run_pipeline(project_path: str, jobs: int = 1) -> tuple[dict[str, float], dict[str, int]]:
+    """
+    Runs the analysis stages once, without parse cache. The resolution uses a new module classifier,
+    so that each run classifies the imported modules again.
+
+    The 'render' stage generates the DOT source of the graph; the layout itself is done by the Graphviz binaries.
+
+    :param project_path: Path to the project to be analysed
+    :param jobs: Number of worker processes of the parsing stage
+
+    :return: (wall time of each stage in seconds, size of the analysed project)
+    """
+    timings = {}
+
+    start = time.perf_counter()
+    files = scan_project(project_path)
+    timings["walk"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    dependencies = collect_all_dependencies(project_path, files=files, jobs=jobs)
+    timings["parse"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    module_map = build_module_map(project_path, files=files)
+    timings["module_map"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    graph = build_graph(dependencies, module_map, resolver=ModuleResolver(module_map), classifier=ModuleClassifier())
+    timings["resolve"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    to_digraph(graph, output_format="dot", max_nodes=None).source
+    timings["render"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    compute_metrics(graph)
+    timings["metrics"] = time.perf_counter() - start
+
+    size = {
+        "files": len(files),
+        "imports": sum(len(imports) for imports in dependencies.values()),
+        "nodes": graph.node_count,
+        "edges": graph.edge_count,
+    }
+    return timings, size
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark of the analysis stages on a generated project.")
+    parser.add_argument("--files", type=int, default=2000, help="Number of modules of the generated project.")
+    parser.add_argument("--imports", type=int, default=10, help="Number of imports per module.")
+    parser.add_argument("--depth", type=int, default=3, help="Number of package levels.")
+    parser.add_argument("--relative", type=float, default=0.2, help="Share of relative imports.")
+    parser.add_argument("--stdlib", type=float, default=0.3, help="Share of standard library imports.")
+    parser.add_argument("--external", type=float, default=0.1, help="Share of external imports.")
+    parser.add_argument("--seed", type=int, default=0, help="Seed of the generated project.")
+    parser.add_argument("--repeat", type=int, default=3, help="Number of runs (the best time of each stage is kept).")
+    parser.add_argument("--jobs", type=int, default=1, help="Number of processes used to parse files (0 = one per CPU).")
+    parser.add_argument("--project", metavar="PATH", help="Generate the project in this folder and keep it (default: temporary folder).")
+    parser.add_argument("--output", metavar="PATH", help="Write the results as JSON to this file ('-' for stdout).")
+    args = parser.parse_args()
+    if args.repeat < 1:
+        parser.error(f"the number of runs must be at least 1: {args.repeat}")
+
+    parameters = {name: getattr(args, name) for name in ("files", "imports", "depth", "relative", "stdlib", "external", "seed", "repeat", "jobs")}
+    project_path = args.project or tempfile.mkdtemp(prefix="depviz_bench_")
+    log = print if args.output != "-" else lambda *a: print(*a, file=sys.stderr)
+
+    try:
+        start = time.perf_counter()
+        generate_project(project_path, files=args.files, imports=args.imports, depth=args.depth,
+                         relative=args.relative, stdlib=args.stdlib, external=args.external, seed=args.seed)
+        log(f"Generated {args.files} module(s) in {project_path} ({time.perf_counter() - start:.1f} s)")
+
+        best = dict.fromkeys(STAGES, float("inf"))
+        for _ in range(args.repeat):
+            timings, size = run_pipeline(project_path, jobs=args.jobs)
+            for stage, elapsed in timings.items():
+                best[stage] = min(best[stage], elapsed)
+    finally:
+        if not args.project:
+            shutil.rmtree(project_path, ignore_errors=True)
+
+    log(f"Project: {size['files']} files, {size['imports']} imports, {size['nodes']} nodes, {size['edges']} edges")
+    for stage in STAGES:
+        log(f"{stage:>12}: {best[stage] * 1000:9.1f} ms")
+    log(f"{'total':>12}: {sum(best.values()) * 1000:9.1f} ms")
+
+    results = {
+        "benchmark": "pipeline",
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "parameters": parameters,
+        "project": size,
+        "stages": best,
+        "total": sum(best.values()),
+    }
+
+    if args.output == "-":
+        json.dump(results, sys.stdout, indent=2)
+        sys.stdout.write("\n")
+    elif args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+        log(f"Results written to: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
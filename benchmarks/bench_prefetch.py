@@ -0,0 +1,132 @@
+"""
+Measures the throughput of the parsing stage with and without read-ahead threads, on a generated project
+whose file system calls are slowed down to simulate a network file system (NFS, SMB, ...).
+
+The latency is added to each 'os.stat' and each opening of a file, the calls which cost a round trip to
+the server on such file systems; reads themselves are not slowed down.
+
+Usage:
+    python -m benchmarks.bench_prefetch [--files N] [--imports N] [--latency MS] [--threads N,N,...]
+                                        [--project PATH] [--output PATH]
+"""
+import argparse
+import builtins
+import json
+import os
+import platform
+import shutil
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+from src.cache import ParseCache
+from src.parser import collect_all_dependencies
+from src.scanner import scan_project
+from .synthetic import generate_project
+
+
+@contextmanager
+def simulated_latency(seconds: float):
+    """
+    Slows down the file system calls of the whole process: 'os.stat', 'os.open' and 'open'.
+
+    Like a network round trip, the delay releases the GIL, so that calls made by several threads overlap.
+
+    :param seconds: Delay added to each call
+    """
+    originals = {"stat": os.stat, "open": os.open}
+    original_open = builtins.open
+
+    def slowed(function):
+        def call(*args, **kwargs):
+            time.sleep(seconds)
+            return function(*args, **kwargs)
+        return call
+
+    os.stat = slowed(originals["stat"])
+    os.open = slowed(originals["open"])
+    builtins.open = slowed(original_open)
+    try:
+        yield
+    finally:
+        os.stat = originals["stat"]
+        os.open = originals["open"]
+        builtins.open = original_open
+
+
+def run_parse(project_path: str, files: list[str], io_threads: int, cache_dir: str | None) -> float:
+    """
+    :param project_path: Path to the project
+    :param files: Inventory of the project
+    :param io_threads: Number of read-ahead threads (0 = none)
+    :param cache_dir: Folder of a parse cache, or None to parse every file
+
+    :return: Wall time of the parsing stage, in seconds
+    """
+    start = time.perf_counter()
+    if cache_dir is None:
+        collect_all_dependencies(project_path, files=files, io_threads=io_threads)
+    else:
+        with ParseCache(cache_dir) as cache:
+            collect_all_dependencies(project_path, files=files, cache=cache, io_threads=io_threads)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark of the read-ahead threads on a simulated high-latency file system.")
+    parser.add_argument("--files", type=int, default=2000, help="Number of modules of the generated project.")
+    parser.add_argument("--imports", type=int, default=10, help="Number of imports per module.")
+    parser.add_argument("--latency", type=float, default=1.0, help="Delay added to each file system call, in milliseconds.")
+    parser.add_argument("--threads", default="0,4,16", help="Comma-separated numbers of read-ahead threads to compare (0 = no read-ahead).")
+    parser.add_argument("--seed", type=int, default=0, help="Seed of the generated project.")
+    parser.add_argument("--project", metavar="PATH", help="Generate the project in this folder and keep it (default: temporary folder).")
+    parser.add_argument("--output", metavar="PATH", help="Write the results as JSON to this file ('-' for stdout).")
+    args = parser.parse_args()
+
+    threads = [int(value) for value in args.threads.split(",")]
+    project_path = args.project or tempfile.mkdtemp(prefix="depviz_bench_")
+    cache_dir = tempfile.mkdtemp(prefix="depviz_bench_cache_")
+    log = print if args.output != "-" else lambda *a: print(*a, file=sys.stderr)
+
+    results = {"no_cache": {}, "warm_cache": {}}
+    try:
+        generate_project(project_path, files=args.files, imports=args.imports, seed=args.seed)
+        files = scan_project(project_path)
+        run_parse(project_path, files, 0, cache_dir)
+
+        with simulated_latency(args.latency / 1000):
+            for count in threads:
+                results["no_cache"][count] = run_parse(project_path, files, count, None)
+                results["warm_cache"][count] = run_parse(project_path, files, count, cache_dir)
+    finally:
+        shutil.rmtree(cache_dir, ignore_errors=True)
+        if not args.project:
+            shutil.rmtree(project_path, ignore_errors=True)
+
+    log(f"Project: {len(files)} files, {args.latency} ms per file system call")
+    for scenario, timings in results.items():
+        baseline = timings[threads[0]]
+        for count, elapsed in timings.items():
+            log(f"{scenario:>12}, {count:>3} thread(s): {elapsed * 1000:9.1f} ms, "
+                f"{len(files) / elapsed:8.0f} files/s, x{baseline / elapsed:.1f}")
+
+    report = {
+        "benchmark": "prefetch",
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "parameters": {"files": args.files, "imports": args.imports, "latency_ms": args.latency, "seed": args.seed},
+        "results": {scenario: {str(count): elapsed for count, elapsed in timings.items()} for scenario, timings in results.items()},
+    }
+
+    if args.output == "-":
+        json.dump(report, sys.stdout, indent=2)
+        sys.stdout.write("\n")
+    elif args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        log(f"Results written to: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
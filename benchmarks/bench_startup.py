@@ -0,0 +1,175 @@
+"""
+Measures the start-up time of the command line in fresh interpreters, for the quick invocations made by editor
+integrations: importing the entry point, '--help' and 'query' on a saved index. The run fails if a median exceeds
+the budget, or if the start-up loads a module that only some options need.
+
+Each command is timed on a copy of the package, in two cases:
+- precompiled: the bytecode is compiled beforehand with 'compileall', as after an installation;
+- no bytecode: every module is compiled from source at each start, as in read-only installations where the
+  '__pycache__' folders cannot be written (or with PYTHONDONTWRITEBYTECODE).
+
+The time of a bare interpreter start ('python -c pass') is measured as well, and subtracted before comparing
+with the budget.
+
+Usage:
+    python -m benchmarks.bench_startup [--repeat N] [--budget MS] [--output PATH]
+"""
+import argparse
+import compileall
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from .synthetic import generate_project
+
+# Budget of the median start-up of each command, precompiled, on top of a bare interpreter start (milliseconds)
+STARTUP_BUDGET_MS = 75.0
+
+# Modules needed by some options only (rendering, process pools, watch mode, profiling, monorepos, ...):
+# loading them at start-up costs more than the rest of the entry point
+HEAVY_MODULES = (
+    "graphviz", "importlib.metadata", "multiprocessing", "concurrent.futures", "ctypes", "tracemalloc",
+    "tomllib", "configparser",
+)
+
+SOURCE_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src")
+
+
+def startup_commands(index_path: str, module: str) -> dict[str, list[str]]:
+    """
+    :param index_path: Index saved by '--save-index', for the 'query' command
+    :param module: Module looked up by the 'query' command
+
+    :return: Name -> interpreter arguments of each measured command
+    """
+    return {
+        "import": ["-c", "import src.depviz"],
+        "help": ["-m", "src.depviz", "--help"],
+        "query": ["-m", "src.depviz", "query", "--index", index_path, "--rdeps", module],
+    }
+
+
+def time_command(arguments: list[str], cwd: str, repeat: int) -> list[float]:
+    """
+    :param arguments: Interpreter arguments (e.g. ['-m', 'src.depviz', '--help'])
+    :param cwd: Folder holding the 'src' package
+    :param repeat: Number of runs
+
+    :return: Wall time of each run, in seconds
+    """
+    env = dict(os.environ, PYTHONDONTWRITEBYTECODE="1")
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.run([sys.executable] + arguments, cwd=cwd, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, check=True)
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def loaded_modules(arguments: list[str], cwd: str) -> set[str]:
+    """
+    :param arguments: Interpreter arguments
+    :param cwd: Folder holding the 'src' package
+
+    :return: Names of the modules imported by the command (from '-X importtime')
+    """
+    result = subprocess.run([sys.executable, "-X", "importtime"] + arguments, cwd=cwd, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True, check=True)
+    return {
+        line.rpartition("|")[2].strip()
+        for line in result.stderr.splitlines()
+        if line.startswith("import time:") and not line.rstrip().endswith("imported package")
+    }
+
+
+def copy_package(destination: str, precompile: bool) -> str:
+    """
+    :param destination: Folder receiving the copy of the 'src' package
+    :param precompile: True to compile the bytecode of the copy
+
+    :return: Folder to run the commands from
+    """
+    shutil.copytree(SOURCE_PATH, os.path.join(destination, "src"), ignore=shutil.ignore_patterns("__pycache__"))
+    if precompile:
+        compileall.compile_dir(os.path.join(destination, "src"), quiet=1)
+    return destination
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark of the start-up time of the command line.")
+    parser.add_argument("--repeat", type=int, default=10, help="Number of runs of each command.")
+    parser.add_argument("--budget", type=float, default=STARTUP_BUDGET_MS, help="Budget of the median start-up, precompiled, on top of a bare interpreter start, in milliseconds.")
+    parser.add_argument("--output", metavar="PATH", help="Write the results as JSON to this file ('-' for stdout).")
+    args = parser.parse_args()
+
+    log = print if args.output != "-" else lambda *a: print(*a, file=sys.stderr)
+    workdir = tempfile.mkdtemp(prefix="depviz_bench_startup_")
+
+    try:
+        project_path = os.path.join(workdir, "project")
+        files = generate_project(project_path, files=200, imports=8, seed=0)
+        index_path = os.path.join(workdir, "index.bin")
+        cases = {
+            "precompiled": copy_package(os.path.join(workdir, "precompiled"), precompile=True),
+            "no_bytecode": copy_package(os.path.join(workdir, "no_bytecode"), precompile=False),
+        }
+        subprocess.run([sys.executable, "-m", "src.depviz", "--path", project_path, "--no-cache", "--save-index", index_path],
+                       cwd=cases["precompiled"], stdout=subprocess.DEVNULL, check=True)
+
+        commands = startup_commands(index_path, files[0])
+        baseline = statistics.median(time_command(["-c", "pass"], workdir, args.repeat))
+        results = {
+            case: {name: statistics.median(time_command(arguments, cwd, args.repeat)) for name, arguments in commands.items()}
+            for case, cwd in cases.items()
+        }
+        heavy = {
+            name: sorted(loaded_modules(arguments, cases["precompiled"]).intersection(HEAVY_MODULES))
+            for name, arguments in commands.items()
+        }
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    log(f"Bare interpreter: {baseline * 1000:.1f} ms (subtracted below), budget: {args.budget:.0f} ms")
+    failures = []
+    for case, timings in results.items():
+        for name, elapsed in timings.items():
+            overhead = (elapsed - baseline) * 1000
+            over_budget = case == "precompiled" and overhead > args.budget
+            log(f"{case:>12}, {name:>6}: {overhead:7.1f} ms{'  ❌ over budget' if over_budget else ''}")
+            if over_budget:
+                failures.append(f"{name} takes {overhead:.1f} ms")
+
+    for name, modules in heavy.items():
+        if modules:
+            log(f"❌ '{name}' loads {', '.join(modules)} at start-up")
+            failures.append(f"{name} loads {', '.join(modules)}")
+
+    report = {
+        "benchmark": "startup",
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "parameters": {"repeat": args.repeat, "budget_ms": args.budget},
+        "baseline": baseline,
+        "results": results,
+        "heavy_modules": heavy,
+    }
+
+    if args.output == "-":
+        json.dump(report, sys.stdout, indent=2)
+        sys.stdout.write("\n")
+    elif args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        log(f"Results written to: {args.output}")
+
+    if failures:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
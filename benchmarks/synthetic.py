@@ -0,0 +1,113 @@
+"""
+Generates synthetic Python projects of configurable size, to measure the analysis on realistic shapes.
+"""
+import os
+import random
+
+
+STDLIB_MODULES = ["os", "sys", "json", "re", "typing", "pathlib", "functools", "itertools", "collections", "dataclasses", "os.path", "logging"]
+EXTERNAL_MODULES = ["requests", "numpy", "yaml", "click", "attr", "jinja2", "pydantic", "sqlalchemy"]
+
+
+def package_paths(files: int, depth: int, fanout: int = 4) -> list[str]:
+    """
+    Spreads files over a tree of packages.
+
+    :param files: Number of modules
+    :param depth: Number of package levels below the root
+    :param fanout: Number of sub-packages of each package
+
+    :return: Relative path of each module (with '/' separators), e.g. 'pkg_1/pkg_3/mod_42.py'
+    """
+    packages = [""]
+    level = [""]
+    for _ in range(depth):
+        level = [f"{parent}pkg_{i}/" for parent in level for i in range(fanout)]
+        packages.extend(level)
+
+    # Three files out of four are in the deepest packages, as in real projects
+    inner = packages[:len(packages) - len(level)] or level
+    paths = []
+    for i in range(files):
+        pool = inner if i % 4 == 0 else level
+        paths.append(f"{pool[i % len(pool)]}mod_{i}.py")
+    return paths
+
+
+def generate_project(root: str, files: int = 1000, imports: int = 10, depth: int = 3, relative: float = 0.2, stdlib: float = 0.3, external: float = 0.1, seed: int = 0) -> list[str]:
+    """
+    Writes a synthetic project: packages with '__init__.py' files, and modules importing each other.
+
+    Each import is drawn at random: relative ('from . import mod_3'), standard, external, or otherwise an absolute
+    import of another module of the project ('from pkg_1.pkg_2 import mod_7'). Modules also hold a little code,
+    so that parsing is not reduced to the import statements.
+
+    :param root: Folder of the project (created if needed)
+    :param files: Number of modules
+    :param imports: Number of imports per module
+    :param depth: Number of package levels
+    :param relative: Share of relative imports
+    :param stdlib: Share of standard library imports
+    :param external: Share of external (third-party) imports
+    :param seed: Seed of the random generator, for reproducible projects
+
+    :return: Relative paths (with '/' separators) of the generated modules, '__init__.py' files excluded
+    """
+    if relative + stdlib + external > 1:
+        raise ValueError("the shares of relative, stdlib and external imports must not exceed 1")
+
+    rng = random.Random(seed)
+    paths = package_paths(files, depth)
+    siblings = {}
+    for path in paths:
+        siblings.setdefault(path.rpartition("/")[0], []).append(path)
+
+    for package in list(siblings):
+        parts = package.split("/") if package else []
+        for i in range(1, len(parts) + 1):
+            init_path = os.path.join(root, *parts[:i], "__init__.py")
+            os.makedirs(os.path.dirname(init_path), exist_ok=True)
+            if not os.path.exists(init_path):
+                open(init_path, "w").close()
+
+    os.makedirs(root, exist_ok=True)
+    for path in paths:
+        package, _, filename = path.rpartition("/")
+        lines = []
+        for _ in range(imports):
+            draw = rng.random()
+            if draw < relative:
+                target = rng.choice(siblings[package])
+                lines.append(f"from . import {target.rpartition('/')[2][:-3]}")
+            elif draw < relative + stdlib:
+                lines.append(f"import {rng.choice(STDLIB_MODULES)}")
+            elif draw < relative + stdlib + external:
+                lines.append(f"import {rng.choice(EXTERNAL_MODULES)}")
+            else:
+                target_package, _, target = rng.choice(paths)[:-3].rpartition("/")
+                if target_package:
+                    lines.append(f"from {target_package.replace('/', '.')} import {target}")
+                else:
+                    lines.append(f"import {target}")
+
+        name = filename[:-3]
+        lines += [
+            "",
+            "",
+            f"class {name.title().replace('_', '')}:",
+            f"    def __init__(self, value=0):",
+            f"        self.value = value",
+            "",
+            f"    def compute(self, items):",
+            f"        return sorted({{item: self.value * 2 for item in items if item}}.items())",
+            "",
+            "",
+            f"def run_{name}(*args):",
+            f"    return [{name.title().replace('_', '')}(i).compute(args) for i in range(3)]",
+            "",
+        ]
+
+        with open(os.path.join(root, *path.split("/")), "w", encoding="utf-8") as f:
+            f.write("\n".join(lines))
+
+    return paths
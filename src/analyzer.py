@@ -0,0 +1,242 @@
+import os
+import sqlite3
+from .cache import (ParseCache, project_cache_dir)
+from .classifier import (CLASSIFIER_INDEX_FILENAME, ModuleClassifier, get_default_classifier)
+from .cycles import find_cycles
+from .exporter import (build_record, describe_import)
+from .graph import (KIND_INTERNAL, DependencyGraph, GraphBuilder, resolve_import)
+from .graph_generator import render_graph
+from .metrics import compute_metrics
+from .parser import (build_module_map, iter_dependencies)
+from .query import query
+from .utils import ModuleResolver
+from .watcher import (Changes, IncrementalProject)
+
+
+class Analyzer:
+    """
+    Analysis session of a project, for programs embedding depviz (build tools, editors, servers, ...).
+
+    The inventory, the imports of each file, the module map, the resolver, the classification of the imported
+    modules and the graph are kept between calls. 'refresh' parses the changed files only, and the resolver and
+    the graph are rebuilt on demand after a change: the resolved imports of unchanged files are reused as long
+    as no file was added or removed.
+
+    Nothing is printed, except by 'render' which reports the generated file like the command line.
+    """
+
+    def __init__(self, project_path: str, ignore_patterns: list[str] | None = None, use_gitignore: bool = True, extractor: str = "ast", cache_dir: str | None = None, use_cache: bool = True, jobs: int = 1, classifier: ModuleClassifier | None = None):
+        """
+        :param project_path: Path to the project directory
+        :param ignore_patterns: Additional glob patterns to ignore (see 'scanner.scan_project')
+        :param use_gitignore: True to honour the '.gitignore' files found in the project
+        :param extractor: Name of the extraction engine (see 'parser.EXTRACTORS')
+        :param cache_dir: Folder of the parse caches, holding one subfolder per project (default: '.depviz_cache' at the
+                          root of the project)
+        :param use_cache: False to parse every file at the first analysis, without reading or updating the cache
+        :param jobs: Number of processes used by the first analysis (0 = one per CPU)
+        :param classifier: Stdlib/external classifier (default: the shared one)
+        """
+        self.project_path = os.path.abspath(project_path)
+        self.cache_dir = project_cache_dir(self.project_path, cache_dir)
+        self.use_cache = use_cache
+        self.jobs = jobs
+        self.classifier = classifier or get_default_classifier()
+        self.project = IncrementalProject(self.project_path, ignore_patterns=ignore_patterns, use_gitignore=use_gitignore, extractor=extractor)
+
+        self._loaded = False
+        self._resolver = None
+        self._resolved = {}  # Relative file -> resolved imports [(node name, node kind)]
+        self._graph = None
+
+    def _load(self) -> None:
+        files = self.project.scan()
+        cache = None
+        if self.use_cache:
+            try:
+                cache = ParseCache(self.cache_dir)
+            except (OSError, sqlite3.Error):
+                cache = None  # The first analysis is simply not cached
+
+        try:
+            if cache is not None:
+                self.classifier.load(os.path.join(self.cache_dir, CLASSIFIER_INDEX_FILENAME))
+            dependencies = dict(iter_dependencies(self.project_path, files=files, cache=cache, jobs=self.jobs, extractor=self.project.extractor))
+            if cache is not None:
+                cache.prune(files)
+        finally:
+            if cache is not None:
+                cache.close()
+
+        self.project.load(files=files, dependencies=dependencies, module_map=build_module_map(self.project_path, files=files), directories=self.project.directories)
+        self._loaded = True
+
+    def refresh(self) -> Changes:
+        """
+        Analyses the project the first time, then parses again the files changed since the previous call.
+
+        :return: Changes since the previous call (every file is 'added' by the first analysis)
+        """
+        if not self._loaded:
+            self._load()
+            return Changes(list(self.project.files), [], [])
+
+        changes = self.project.refresh()
+        if changes.added or changes.removed:
+            # The candidates of module names changed: every import has to be resolved again
+            self._resolver = None
+            self._resolved.clear()
+        else:
+            for rel_path in changes.modified:
+                self._resolved.pop(rel_path, None)
+
+        if changes:
+            self._graph = None
+        return changes
+
+    def _ensure_loaded(self) -> None:
+        if not self._loaded:
+            self._load()
+
+    @property
+    def files(self) -> list[str]:
+        """
+        Inventory of the project, relative to its root.
+        """
+        self._ensure_loaded()
+        return list(self.project.files)
+
+    @property
+    def module_map(self) -> dict[str, list[str]]:
+        """
+        Dictionary module_name -> list of relative paths (see 'parser.build_module_map').
+        """
+        self._ensure_loaded()
+        return self.project.module_map
+
+    @property
+    def resolver(self) -> ModuleResolver:
+        """
+        Resolver of the internal modules, built once per module map.
+        """
+        self._ensure_loaded()
+        if self._resolver is None:
+            self._resolver = ModuleResolver(self.project.module_map)
+        return self._resolver
+
+    def _rel_path(self, file: str) -> str:
+        # Accepts absolute paths and '/' separators, like the command line
+        if os.path.isabs(file):
+            file = os.path.relpath(file, self.project_path)
+        return os.path.normpath(file)
+
+    def imports(self, file: str) -> list[str]:
+        """
+        :param file: Path of a file, relative to the project or absolute
+
+        :return: Modules imported by the file, as written in the source
+
+        :raises KeyError: If the file is not part of the analysed project
+        """
+        self._ensure_loaded()
+        return self.project.dependencies[self._rel_path(file)]
+
+    def dependencies(self, file: str) -> list[dict]:
+        """
+        :param file: Path of a file, relative to the project or absolute
+
+        :return: Imports of the file [{'name': ..., 'kind': ..., 'target': ...}] (see 'exporter.describe_import')
+
+        :raises KeyError: If the file is not part of the analysed project
+        """
+        rel_path = self._rel_path(file)
+        return build_record(rel_path, self.imports(rel_path), self.resolver, self.classifier)["imports"]
+
+    def resolve(self, name: str, file: str | None = None) -> dict:
+        """
+        Classifies a module name, and finds the file it designates if it is internal.
+
+        :param name: Module name (e.g. 'helpers.math')
+        :param file: Path of the importing file, to resolve relative and ambiguous names (optional)
+
+        :return: {'name': ..., 'kind': ..., 'target': ...} (see 'exporter.describe_import')
+        """
+        return describe_import(name, self._rel_path(file) if file else None, self.resolver, self.classifier)
+
+    def _resolved_imports(self, rel_path: str) -> list[tuple[str, int]]:
+        resolved = self._resolved.get(rel_path)
+        if resolved is None:
+            resolver = self.resolver
+            resolved = self._resolved[rel_path] = [
+                resolve_import(imp, rel_path, resolver, self.classifier) for imp in self.project.dependencies[rel_path]
+            ]
+        return resolved
+
+    @property
+    def graph(self) -> DependencyGraph:
+        """
+        Dependency graph of the project (see 'graph.build_graph'), built once per state of the project.
+        """
+        self._ensure_loaded()
+        if self._graph is None:
+            builder = GraphBuilder()
+            for source in self.project.files:
+                builder.add_node(source, KIND_INTERNAL)
+
+            for source in self.project.files:
+                source_id = builder.add_node(source, KIND_INTERNAL)
+                for name, kind in self._resolved_imports(source):
+                    builder.add_edge(source_id, builder.add_node(name, kind))
+
+            self._graph = builder.build()
+        return self._graph
+
+    def query(self, module: str, reverse: bool = False, depth: int | None = None) -> list[dict] | None:
+        """
+        Lists the dependencies, or the dependents, of a module (see 'query.query').
+
+        :param module: File path or module name
+        :param reverse: True for the files that depend on the module, False for the modules it depends on
+        :param depth: Maximum distance (None for the transitive closure, 1 for the direct ones only)
+
+        :return: Reached nodes {'name', 'kind', 'depth'}, or None if the module is unknown
+        """
+        return query(self.graph, module, reverse=reverse, depth=depth)
+
+    def cycles(self) -> list[dict]:
+        """
+        :return: Import cycles between the files of the project (see 'cycles.find_cycles')
+        """
+        return find_cycles(self.graph)
+
+    def metrics(self) -> tuple[list[dict], list[str]]:
+        """
+        :return: Metrics of each file and a longest import chain (see 'metrics.compute_metrics')
+        """
+        return compute_metrics(self.graph)
+
+    def render(self, output_path: str = "output/dependency_graph", output_format: str = "png", **options) -> None:
+        """
+        Renders the dependency graph to a file (see 'graph_generator.render_graph').
+
+        :param output_path: Output file path, without extension
+        :param output_format: Graph output format (e.g. 'png', 'svg', 'dot')
+        :param options: Rendering options (engine, collapse, group_imports, clusters, max_nodes)
+        """
+        render_graph(self.graph, output_path=output_path, output_format=output_format, **options)
+
+    def close(self) -> None:
+        """
+        Saves the classification of the imported modules next to the parse cache, for the next session.
+        """
+        if self.use_cache and self._loaded:
+            try:
+                self.classifier.save(os.path.join(self.cache_dir, CLASSIFIER_INDEX_FILENAME))
+            except OSError:
+                pass
+
+    def __enter__(self) -> "Analyzer":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
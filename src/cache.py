@@ -0,0 +1,258 @@
+import hashlib
+import json
+import os
+import sqlite3
+import sys
+
+
+DEFAULT_CACHE_DIRNAME = ".depviz_cache"
+
+# To be incremented whenever the layout or the meaning of the stored data changes
+SCHEMA_VERSION = 2
+
+
+def file_digest(data: bytes) -> str:
+    """
+    Computes the content hash used to recognise unchanged files.
+
+    :param data: Raw content of the file
+
+    :return: Hexadecimal digest
+    """
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+def default_cache_dir(project_path: str) -> str:
+    """
+    Returns the default cache location of a project.
+
+    :param project_path: Path to the project directory
+
+    :return: Path of the '.depviz_cache' folder at the root of the project
+    """
+    return os.path.join(project_path, DEFAULT_CACHE_DIRNAME)
+
+
+def project_cache_dir(project_path: str, cache_dir: str | None = None) -> str:
+    """
+    Returns the cache location of a project, in a folder chosen by the user or at the default location.
+
+    Entries are keyed by relative path, so a folder chosen by the user (e.g. a cache shared between CI jobs) holds
+    one subfolder per project, keyed by its absolute path: two projects neither read nor prune each other's entries.
+    The default folder belongs to its project alone and is used as is, so that it survives moving the project.
+
+    :param project_path: Path to the project directory
+    :param cache_dir: Folder given by the user, None for the default one
+
+    :return: Folder of the cache of the project, e.g. '<cache_dir>/projects/myapp-1a2b3c4d'
+    """
+    if cache_dir is None:
+        return default_cache_dir(project_path)
+
+    project_path = os.path.abspath(project_path)
+    key = hashlib.blake2b(project_path.encode("utf-8"), digest_size=4).hexdigest()
+    return os.path.join(cache_dir, "projects", f"{os.path.basename(project_path) or 'root'}-{key}")
+
+
+class ParseCache:
+    """
+    On-disk cache of the imports extracted from each file, stored in a SQLite database.
+    The top-level symbols of the file (see 'symbols.ModuleSymbols') are stored as well when they were collected.
+
+    Entries are keyed by the relative path of the file and validated in two steps:
+    - the modification time and size match: the file is not even read;
+    - otherwise the content hash matches (e.g. fresh checkout): the file is read but not parsed.
+
+    By default the whole index is loaded at start-up and changes are written back in a single transaction by 'close'.
+    Without preloading, each entry is read when needed and changes are written by batches, so that the memory
+    used does not grow with the size of the project.
+    """
+
+    FILENAME = "parse_cache.sqlite3"
+
+    # Number of pending changes written at once when the index is not preloaded
+    FLUSH_SIZE = 1000
+
+    def __init__(self, cache_dir: str, preload: bool = True):
+        """
+        :param cache_dir: Folder holding the cache database (created if needed)
+        :param preload: True to load the whole index in memory (fastest), False to read the entries on demand
+        """
+        os.makedirs(cache_dir, exist_ok=True)
+        self.path = os.path.join(cache_dir, self.FILENAME)
+        self.hits = 0
+        self.misses = 0
+
+        self._db = sqlite3.connect(self.path)
+        self._init_schema()
+
+        # rel_path -> (mtime_ns, size, digest, imports as JSON, symbols as JSON or None)
+        self._entries = {
+            row[0]: row[1:]
+            for row in self._db.execute("SELECT path, mtime_ns, size, digest, imports, symbols FROM files")
+        } if preload else None
+        self._updates = {}
+        self._entry_count = 0  # Number of entries when closed, if the index is not preloaded
+
+    def _init_schema(self) -> None:
+        # The results of 'ast.parse' depend on the Python version, so the cache is tied to it
+        version = f"{SCHEMA_VERSION}:{sys.version_info.major}.{sys.version_info.minor}"
+
+        self._db.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+        row = self._db.execute("SELECT value FROM meta WHERE key = 'version'").fetchone()
+
+        if row is None or row[0] != version:
+            self._db.execute("DROP TABLE IF EXISTS files")
+            self._db.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('version', ?)", (version,))
+
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS files ("
+            "path TEXT PRIMARY KEY, mtime_ns INTEGER, size INTEGER, digest TEXT, imports TEXT, symbols TEXT)"
+        )
+        self._db.commit()
+
+    def _get(self, rel_path: str) -> tuple | None:
+        if self._entries is not None:
+            return self._entries.get(rel_path)
+
+        entry = self._updates.get(rel_path)
+        if entry is None and self._db is not None:
+            entry = self._db.execute("SELECT mtime_ns, size, digest, imports, symbols FROM files WHERE path = ?", (rel_path,)).fetchone()
+        return entry
+
+    def lookup(self, rel_path: str, stat: os.stat_result, symbols: bool = False) -> list[str] | None:
+        """
+        Looks for the imports of a file whose modification time and size did not change.
+
+        :param rel_path: Path of the file relative to the project
+        :param stat: Result of 'os.stat' on the file
+        :param symbols: True to only accept an entry holding the symbols of the file too (see 'stored_symbols')
+
+        :return: Cached imports, or None if the file has to be read
+        """
+        entry = self._get(rel_path)
+        if entry is None or entry[0] != stat.st_mtime_ns or entry[1] != stat.st_size or (symbols and entry[4] is None):
+            return None
+
+        self.hits += 1
+        return json.loads(entry[3])
+
+    def stored_digest(self, rel_path: str, symbols: bool = False) -> str | None:
+        """
+        :param rel_path: Path of the file relative to the project
+        :param symbols: True to ignore an entry without the symbols of the file
+
+        :return: Content hash recorded for the file, or None if the file is unknown
+        """
+        entry = self._get(rel_path)
+        return entry[2] if entry and not (symbols and entry[4] is None) else None
+
+    def stored_symbols(self, rel_path: str) -> list | None:
+        """
+        :param rel_path: Path of the file relative to the project
+
+        :return: Symbols recorded for the file, decoded from JSON (see 'symbols.ModuleSymbols.from_json'),
+                 or None if they were not collected
+        """
+        entry = self._get(rel_path)
+        return json.loads(entry[4]) if entry and entry[4] is not None else None
+
+    def lookup_content(self, rel_path: str, stat: os.stat_result, digest: str, symbols: bool = False) -> list[str] | None:
+        """
+        Looks for the imports of a file whose content did not change, even if its modification time did.
+
+        :param rel_path: Path of the file relative to the project
+        :param stat: Result of 'os.stat' on the file
+        :param digest: Content hash of the file (see 'file_digest')
+        :param symbols: True to only accept an entry holding the symbols of the file too (see 'stored_symbols')
+
+        :return: Cached imports, or None if the file has to be parsed
+        """
+        entry = self._get(rel_path)
+        if entry is None or entry[2] != digest or (symbols and entry[4] is None):
+            return None
+
+        # Refresh the timestamp so that the next run does not even read the file
+        self._set(rel_path, (stat.st_mtime_ns, stat.st_size, digest, entry[3], entry[4]))
+        self.hits += 1
+        return json.loads(entry[3])
+
+    def store(self, rel_path: str, stat: os.stat_result, digest: str, imports: list[str], symbols=None) -> None:
+        """
+        Records the imports freshly extracted from a file.
+
+        :param rel_path: Path of the file relative to the project
+        :param stat: Result of 'os.stat' on the file, taken before reading it
+        :param digest: Content hash of the file (see 'file_digest')
+        :param imports: Imports extracted from the file
+        :param symbols: Symbols collected from the same parse (see 'symbols.ModuleSymbols'), None if not collected
+        """
+        encoded = json.dumps(symbols) if symbols is not None else None
+        self._set(rel_path, (stat.st_mtime_ns, stat.st_size, digest, json.dumps(imports), encoded))
+        self.misses += 1
+
+    def _set(self, rel_path: str, entry: tuple) -> None:
+        if self._entries is not None:
+            self._entries[rel_path] = entry
+        self._updates[rel_path] = entry
+        if self._entries is None and len(self._updates) >= self.FLUSH_SIZE:
+            self._flush()
+
+    def _flush(self) -> None:
+        self._db.executemany(
+            "INSERT OR REPLACE INTO files (path, mtime_ns, size, digest, imports, symbols) VALUES (?, ?, ?, ?, ?, ?)",
+            ((path, *entry) for path, entry in self._updates.items())
+        )
+        self._updates = {}
+
+    def prune(self, files: list[str]) -> None:
+        """
+        Forgets the files that are no longer part of the project.
+
+        :param files: Complete inventory of the project files
+        """
+        if self._entries is None:
+            self._flush()
+            files = set(files)
+            stale = [path for (path,) in self._db.execute("SELECT path FROM files") if path not in files]
+        else:
+            stale = set(self._entries) - set(files)
+            for rel_path in stale:
+                del self._entries[rel_path]
+                self._updates.pop(rel_path, None)
+
+        if stale:
+            self._db.executemany("DELETE FROM files WHERE path = ?", ((p,) for p in stale))
+
+    def stats(self) -> dict[str, int]:
+        """
+        :return: Number of hits, misses and stored entries
+        """
+        if self._entries is not None:
+            entries = len(self._entries)
+        elif self._db is not None:
+            self._flush()
+            entries = self._db.execute("SELECT COUNT(*) FROM files").fetchone()[0]
+        else:
+            entries = self._entry_count
+        return {"hits": self.hits, "misses": self.misses, "entries": entries}
+
+    def close(self) -> None:
+        """
+        Writes the pending changes to disk and closes the database.
+        """
+        if self._db is None:
+            return
+
+        self._flush()
+        if self._entries is None:
+            self._entry_count = self._db.execute("SELECT COUNT(*) FROM files").fetchone()[0]
+        self._db.commit()
+        self._db.close()
+        self._db = None
+
+    def __enter__(self) -> "ParseCache":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
@@ -0,0 +1,192 @@
+import hashlib
+import importlib.util
+import json
+import os
+import sys
+import time
+
+
+STDLIB = "stdlib"
+EXTERNAL = "external"
+
+# Name of the saved index, next to the parse cache
+CLASSIFIER_INDEX_FILENAME = "classifier.json"
+
+# Folder names that some distributions wrongly install at top level: they are more likely to be project folders
+_GENERIC_NAMES = {"test", "tests", "testing", "doc", "docs", "example", "examples", "benchmarks", "src", "scripts"}
+
+
+def _environment_key() -> str:
+    """
+    Identifies the Python environment, so that a saved index is discarded when the interpreter,
+    the search path or the installed packages (folder modification times) change.
+
+    :return: Hexadecimal digest
+    """
+    parts = [sys.version, sys.prefix]
+    for entry in sys.path:
+        try:
+            mtime = os.stat(entry or ".").st_mtime_ns
+        except OSError:
+            mtime = None
+        parts.append(f"{entry}:{mtime}")
+    return hashlib.blake2b("\n".join(parts).encode("utf-8"), digest_size=16).hexdigest()
+
+
+class ModuleClassifier:
+    """
+    Classifies imported module names as standard library, external (installed) or neither.
+
+    Only the top-level name of a module is resolved (e.g. 'os' for 'os.path.join'), and each top-level name is
+    resolved once. Standard and installed modules are recognised from 'sys.stdlib_module_names' and from the
+    index of installed distributions; 'importlib.util.find_spec' is only used for the remaining names.
+    """
+
+    def __init__(self):
+        # top-level name -> STDLIB, EXTERNAL or None
+        self._kinds = {}
+        self._distributions = None
+        self.find_spec_calls = 0
+        self.find_spec_time = 0.0
+
+    @property
+    def distributions(self) -> set[str]:
+        """
+        Top-level module names provided by the installed distributions, indexed on first use.
+        """
+        if self._distributions is None:
+            # Imported on first use: 'importlib.metadata' is the slowest module to load at start-up
+            import importlib.metadata
+
+            try:
+                names = importlib.metadata.packages_distributions()
+            except Exception:
+                names = {}
+            self._distributions = {name for name in names if name.isidentifier()} - _GENERIC_NAMES
+        return self._distributions
+
+    def classify(self, module_name: str) -> str | None:
+        """
+        Classifies a module.
+
+        :param module_name: Name of the module to be checked (e.g. 'os', 'numpy.linalg', 'helpers.utils')
+
+        :return: STDLIB, EXTERNAL, or None if the module is neither (potentially internal)
+        """
+        top = module_name.partition(".")[0]
+        try:
+            return self._kinds[top]
+        except KeyError:
+            kind = self._kinds[top] = self._resolve(top)
+            return kind
+
+    def classify_many(self, module_names) -> dict[str, str | None]:
+        """
+        Classifies a batch of modules, resolving each top-level name once.
+
+        :param module_names: Iterable of module names
+
+        :return: Dictionary module name -> STDLIB, EXTERNAL or None
+        """
+        return {name: self.classify(name) for name in set(module_names)}
+
+    def is_standard_or_external(self, module_name: str) -> bool:
+        """
+        :param module_name: Name of the module to be checked
+
+        :return: True if the module is standard or external, False otherwise (potentially internal)
+        """
+        return self.classify(module_name) is not None
+
+    def _resolve(self, top: str) -> str | None:
+        if not top:
+            return None
+
+        if top in sys.stdlib_module_names or top in sys.builtin_module_names:
+            return STDLIB
+
+        if top in self.distributions:
+            return EXTERNAL
+
+        return self._resolve_with_find_spec(top)
+
+    def _resolve_with_find_spec(self, top: str) -> str | None:
+        # Slow path: locates the module on the search path
+        self.find_spec_calls += 1
+        start = time.perf_counter()
+        try:
+            spec = importlib.util.find_spec(top)
+        except Exception:
+            return None
+        finally:
+            self.find_spec_time += time.perf_counter() - start
+
+        if spec is None:
+            return None
+
+        origin = spec.origin
+
+        # Built-in modules
+        if origin in (None, 'built-in', 'frozen'):
+            return STDLIB
+
+        # Standardisation
+        origin = origin.lower()
+
+        # External modules installed
+        if 'site-packages' in origin or 'dist-packages' in origin:
+            return EXTERNAL
+
+        # Standard modules: covers pythonXY.dll, pythonXY.zip, lib-dynload, etc. ('lib' is useful on Windows)
+        if 'python' in origin or 'lib' in origin:
+            return STDLIB
+
+        return None
+
+    def save(self, path: str) -> None:
+        """
+        Saves the resolved names, so that a later run in the same environment starts warm.
+
+        :param path: Path of the JSON index file
+        """
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        data = {
+            "environment": _environment_key(),
+            "kinds": self._kinds,
+            "distributions": sorted(self.distributions),
+        }
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(data, f)
+
+    def load(self, path: str) -> bool:
+        """
+        Loads an index saved by 'save', unless it was produced in a different environment.
+
+        :param path: Path of the JSON index file
+
+        :return: True if the index was loaded
+        """
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return False
+
+        if not isinstance(data, dict) or data.get("environment") != _environment_key():
+            return False
+
+        self._kinds.update(data.get("kinds", {}))
+        self._distributions = set(data.get("distributions", []))
+        return True
+
+
+_default_classifier = ModuleClassifier()
+
+
+def get_default_classifier() -> ModuleClassifier:
+    """
+    Returns the classifier shared by the whole process ('utils', 'parser', 'graph_generator', ...).
+
+    :return: Shared classifier
+    """
+    return _default_classifier
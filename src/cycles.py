@@ -0,0 +1,146 @@
+from array import array
+from collections import deque
+from .graph import (KIND_INTERNAL, DependencyGraph)
+
+
+def strongly_connected_components(graph: DependencyGraph) -> list[list[int]]:
+    """
+    Computes the strongly connected components of the internal part of a graph (Tarjan's algorithm).
+
+    The algorithm is iterative, so deep import chains cannot exceed the recursion limit, and runs in linear time.
+    Only internal nodes and edges between internal nodes are considered.
+
+    :param graph: Dependency graph (see 'graph.build_graph')
+
+    :return: Components, as lists of node ids, in reverse topological order (dependencies first)
+    """
+    node_count = graph.node_count
+    offsets, targets, kinds = graph.offsets, graph.targets, graph.kinds
+
+    index = array("i", [-1]) * node_count
+    lowlink = array("i", bytes(4 * node_count))
+    on_stack = bytearray(node_count)
+    stack = []
+    components = []
+    counter = 0
+
+    for root in range(node_count):
+        if index[root] != -1 or kinds[root] != KIND_INTERNAL:
+            continue
+
+        # Each frame: node, position of the next edge to visit
+        index[root] = lowlink[root] = counter
+        counter += 1
+        stack.append(root)
+        on_stack[root] = 1
+        frames = [[root, offsets[root]]]
+
+        while frames:
+            frame = frames[-1]
+            node, position = frame
+
+            if position < offsets[node + 1]:
+                frame[1] = position + 1
+                target = targets[position]
+                if kinds[target] != KIND_INTERNAL:
+                    continue
+
+                if index[target] == -1:
+                    index[target] = lowlink[target] = counter
+                    counter += 1
+                    stack.append(target)
+                    on_stack[target] = 1
+                    frames.append([target, offsets[target]])
+                elif on_stack[target] and index[target] < lowlink[node]:
+                    lowlink[node] = index[target]
+                continue
+
+            # All edges visited: the node is the root of a component, or reports its lowlink to its parent
+            frames.pop()
+            if frames:
+                parent = frames[-1][0]
+                if lowlink[node] < lowlink[parent]:
+                    lowlink[parent] = lowlink[node]
+
+            if lowlink[node] == index[node]:
+                component = []
+                while True:
+                    member = stack.pop()
+                    on_stack[member] = 0
+                    component.append(member)
+                    if member == node:
+                        break
+                components.append(component)
+
+    return components
+
+
+def shortest_cycle(graph: DependencyGraph, component: list[int]) -> list[int]:
+    """
+    Finds a shortest import cycle through the first node (lowest id) of a strongly connected component.
+
+    :param graph: Dependency graph
+    :param component: Node ids of a component with at least two nodes
+
+    :return: Cycle as a list of node ids, starting and ending with the same node
+    """
+    members = set(component)
+    start = min(component)
+    parents = {start: None}
+    queue = deque([start])
+
+    # Breadth-first search inside the component, until an edge comes back to the start node
+    while queue:
+        node = queue.popleft()
+        for target in graph.successors(node):
+            if target == start:
+                path = [start]
+                while node is not None:
+                    path.append(node)
+                    node = parents[node]
+                path.reverse()
+                return path
+            if target in members and target not in parents:
+                parents[target] = node
+                queue.append(target)
+
+    return [start]
+
+
+def find_cycles(graph: DependencyGraph) -> list[dict]:
+    """
+    Reports the import cycles between the files of a project.
+
+    :param graph: Dependency graph (see 'graph.build_graph')
+
+    :return: One entry per strongly connected component with a cycle, largest first:
+             {'files': sorted files of the component, 'cycle': example of a shortest cycle (first file repeated at the end)}
+    """
+    cycles = []
+    for component in strongly_connected_components(graph):
+        if len(component) < 2:  # Self-imports are not recorded in the graph
+            continue
+
+        cycles.append({
+            "files": sorted(graph.names[node] for node in component),
+            "cycle": [graph.names[node] for node in shortest_cycle(graph, component)],
+        })
+
+    cycles.sort(key=lambda entry: (-len(entry["files"]), entry["files"]))
+    return cycles
+
+
+def format_cycles(cycles: list[dict]) -> str:
+    """
+    :param cycles: Import cycles (see 'find_cycles')
+
+    :return: Human-readable report
+    """
+    if not cycles:
+        return "✅ No import cycle."
+
+    lines = [f"🔁 {len(cycles)} import cycle(s):"]
+    for entry in cycles:
+        lines.append(f"\n  {len(entry['files'])} file(s): {', '.join(entry['files'])}")
+        lines.append(f"  └── {' -> '.join(entry['cycle'])}")
+    return "\n".join(lines)
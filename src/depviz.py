@@ -1,10 +1,606 @@
 import argparse
+import functools
+import json
 import os
+import sqlite3
 import sys
-from .parser import (collect_all_dependencies, build_module_map)
-from .graph_generator import build_dependency_graph
+from typing import TYPE_CHECKING
+from .cache import (ParseCache, project_cache_dir)
+from .classifier import (CLASSIFIER_INDEX_FILENAME, get_default_classifier)
+from .cycles import (find_cycles, format_cycles)
+from .diff import (diff_snapshots, format_diff)
+from .exporter import (JsonWriter, NdjsonWriter, build_record)
+from .parser import (EXTRACTORS, iter_dependencies, build_module_map)
+from .query import (INDEX_FILENAME, load_index, query, save_index)
+from .rules import (RuleSet, format_violations, locate_violations)
+from .graph import build_graph
+from .graph_generator import (ENGINES, GROUP_MODES, render_diff, render_graph)
+from .instrumentation import (NullProfiler, Profiler)
+from .metrics import (METRIC_COLUMNS, compute_metrics, format_metrics, sort_metrics, write_metrics)
+from .scanner import scan_project
+from .snapshot import (Snapshot, take_snapshot)
+from .store import DependencyStore
+from .symbols import (analyse_symbols, format_symbol_report)
+from .utils import ModuleResolver
+
+# Modes that are not always used are imported on demand, to keep the start-up short
+if TYPE_CHECKING:
+    from .watcher import IncrementalProject
+
+
+def open_cache(cache_dir: str, log, preload: bool = True) -> ParseCache | None:
+    """
+    Opens the parse cache, falling back to an uncached run if the folder cannot be used.
+
+    :param cache_dir: Folder of the parse cache
+    :param log: Function used to display messages (stderr when the outputs are written to stdout)
+    :param preload: False to read the cache entries on demand instead of loading them all
+
+    :return: Opened cache, or None if unavailable
+    """
+    try:
+        return ParseCache(cache_dir, preload=preload)
+    except (OSError, sqlite3.Error) as e:
+        log(f"⚠️ Parse cache disabled ({cache_dir}): {e}")
+        return None
+
+
+def print_file_dependencies(file: str, imports: list[str]) -> None:
+    """
+    Displays the imports of a file.
+
+    :param file: Relative path of the file
+    :param imports: List of imported modules
+    """
+    print(f"\n📄 {file}")
+    if imports:
+        for imp in imports:
+            print(f"  └── import {imp}")
+    else:
+        print("  └── (no import)")
+
+
+def print_dependencies(deps: dict[str, list[str]]) -> None:
+    """
+    Displays the imports of each file.
+
+    :param deps: Relative file dictionary -> list of imported modules
+    """
+    for file, imports in deps.items():
+        print_file_dependencies(file, imports)
+
+
+def render_options(args: argparse.Namespace) -> dict:
+    """
+    :param args: Parsed command line arguments
+
+    :return: Rendering options of 'graph_generator.render_graph'
+    """
+    return {
+        "engine": args.engine,
+        "collapse": args.collapse,
+        "group_imports": args.group_imports,
+        "clusters": args.clusters,
+        "max_nodes": args.max_nodes or None,
+    }
+
+
+def report_profile(profiler: Profiler, files: list[str], graph, json_path: str | None) -> None:
+    """
+    Displays the measures of a run on stderr, and optionally writes them as JSON.
+
+    :param profiler: Profiler of the run
+    :param files: Inventory of the analysed files
+    :param graph: Dependency graph, if one was built
+    :param json_path: Path of the JSON file (optional)
+    """
+    classifier = get_default_classifier()
+    # Classification happens within the stages (module map, records, resolution): reported apart, not as a stage
+    profiler.count("find_spec_calls", classifier.find_spec_calls)
+    profiler.count("find_spec_time", classifier.find_spec_time)
+    profiler.count("files", len(files))
+    if graph is not None:
+        profiler.count("nodes", graph.node_count)
+        profiler.count("edges", graph.edge_count)
+    profiler.close()
+
+    print("\n" + profiler.format(), file=sys.stderr)
+    if json_path:
+        with open(json_path, "w", encoding="utf-8") as f:
+            json.dump(profiler.report(), f, indent=2)
+        print(f"💾 Profile saved to: {json_path}", file=sys.stderr)
+
+
+def run_watch(project: "IncrementalProject", args: argparse.Namespace, log, rules: RuleSet | None = None,
+              cycles: list[dict] | None = None, violations: list[dict] | None = None) -> tuple[list[dict], list[dict]]:
+    """
+    Watches the project and emits the outputs requested on the command line again after each batch of changes.
+
+    Only the changed files are listed. An NDJSON output gets the records of the changed files, and of the files
+    whose imports resolve differently since files were added or removed (e.g. 'import foo' once 'foo.py' exists).
+    The record of each file is kept until it has to be built again, so a JSON output is rewritten without resolving
+    the unchanged files; the graph is rebuilt, checked again against the rules and its metrics are written again.
+
+    :param project: Loaded project state
+    :param args: Parsed command line arguments
+    :param log: Function used to display messages
+    :param rules: Rules loaded with '--rules'
+    :param cycles: Cycles found before the watch
+    :param violations: Violations found before the watch
+
+    :return: Cycles and violations of the last rebuilt graph, which decide the exit code once the watch stops
+    """
+    from .watcher import (create_monitor, watch)
+
+    monitor = create_monitor(project, interval=args.interval)
+    log(f"\n👀 Watching {project.project_path} ({type(monitor).__name__}), press Ctrl+C to stop...")
+
+    # Relative file -> record of its imports (see 'exporter.build_record'), until the file or its imports change
+    records = {}
+    # Results of the last rebuilt graph
+    latest = {"cycles": cycles or [], "violations": violations or []}
+
+    def record(file):
+        entry = records.get(file)
+        if entry is None:
+            entry = records[file] = build_record(file, project.dependencies[file], project.resolver)
+        return entry
+
+    def on_change(changes):
+        log(f"\n🔄 {len(changes.added)} added, {len(changes.modified)} modified, {len(changes.removed)} removed file(s)")
+        affected = project.affected_importers(changes)
+        for file in changes.added + changes.modified + changes.removed + affected:
+            records.pop(file, None)
+
+        if args.output_ndjson:
+            with NdjsonWriter(args.output_ndjson, append=True) as writer:
+                for file in changes.removed:
+                    writer.write({"file": file, "removed": True})
+                for file in sorted(changes.added + changes.modified + affected):
+                    writer.write(record(file))
+        elif args.output_json:
+            with JsonWriter(args.output_json) as writer:
+                for file in project.files:
+                    writer.write(record(file))
+        else:
+            for file in changes.removed:
+                print(f"\n🗑️ {file}")
+            print_dependencies({file: project.dependencies[file] for file in changes.added + changes.modified})
+
+        if args.export or args.cycles or args.fail_on_cycles or args.save_index or rules is not None or args.metrics:
+            dependencies = {file: project.dependencies[file] for file in project.files}
+            graph = build_graph(dependencies, project.module_map, resolver=project.resolver)
+            if args.export:
+                render_graph(graph, output_path=args.export, output_format=args.format, **render_options(args))
+            if args.save_index:
+                save_index(graph, args.save_index, project.project_path)
+            if args.cycles or args.fail_on_cycles:
+                latest["cycles"] = find_cycles(graph)
+                log("\n" + format_cycles(latest["cycles"]))
+            if rules is not None:
+                latest["violations"] = check_rules(rules, graph, project.project_path, project.resolver, None, args, log)
+            if args.metrics:
+                report_metrics(graph, args, log)
+
+    try:
+        watch(project, on_change, monitor=monitor, debounce=args.debounce)
+    except KeyboardInterrupt:
+        log("\n👋 Watch stopped.")
+    return latest["cycles"], latest["violations"]
+
+
+def check_rules(rules: RuleSet, graph, project_path: str, resolver, classifier, args: argparse.Namespace, log) -> list[dict]:
+    """
+    Checks the dependency graph against architecture rules, and reports the violations with their lines.
+
+    :param rules: Rules loaded with '--rules'
+    :param graph: Dependency graph of the project
+    :param project_path: Path to the project directory
+    :param resolver: Resolver used to build the graph
+    :param classifier: Classifier used to build the graph (None for the shared one)
+    :param args: Parsed command line arguments
+    :param log: Function used to display messages
+
+    :return: Violations (see 'rules.RuleSet.check')
+    """
+    violations = rules.check(graph)
+    locate_violations(violations, project_path, resolver, classifier=classifier, extractor=args.extractor)
+    log("\n" + format_violations(violations))
+    return violations
+
+
+def report_metrics(graph, args: argparse.Namespace, log) -> None:
+    """
+    Computes the metrics of each file, writes them as CSV and displays the first rows.
+
+    :param graph: Dependency graph of the project
+    :param args: Parsed command line arguments
+    :param log: Function used to display messages
+    """
+    rows, chain = compute_metrics(graph)
+    rows = sort_metrics(rows, args.metrics_sort)
+    write_metrics(rows, args.metrics)
+    log("\n" + format_metrics(rows, chain, column=args.metrics_sort))
+    log(f"💾 Metrics of {len(rows)} file(s) saved to: {args.metrics}")
+
+
+def run_workspace(workspace_path: str, args: argparse.Namespace, log, profiler, rules: RuleSet | None = None) -> None:
+    """
+    Analyses several source roots of a monorepo as shards, and emits the outputs requested on the command line
+    for the merged workspace. File paths are relative to the workspace.
+
+    :param workspace_path: Path to the workspace directory
+    :param args: Parsed command line arguments
+    :param log: Function used to display messages
+    :param profiler: Profiler of the run
+    :param rules: Architecture rules to check (optional)
+    """
+    from .workspace import (WorkspaceClassifier, WorkspaceResolver, analyse_workspace, discover_roots, make_roots, merge_shards)
+
+    unsupported = [option for option, value in (("--watch", args.watch), ("--save-snapshot", args.save_snapshot), ("--symbols", args.symbols), ("--low-memory", args.low_memory)) if value]
+    if unsupported:
+        log(f"❌ Not supported with several roots: {', '.join(unsupported)}")
+        sys.exit(1)
+
+    try:
+        with profiler.stage("walk"):
+            if args.discover_roots:
+                roots = discover_roots(workspace_path, ignore_patterns=args.ignore, use_gitignore=not args.no_gitignore)
+            else:
+                roots = make_roots(workspace_path, args.root)
+    except ValueError as e:
+        log(f"❌ Invalid roots: {e}")
+        sys.exit(1)
+
+    if not roots:
+        log(f"❌ No package found in: {workspace_path}")
+        sys.exit(1)
+
+    log(f"🔍 Analysis of {len(roots)} root(s) in: {workspace_path}")
+    for root in roots:
+        log(f"  📦 {root.name}: {root.prefix or '.'}")
+
+    cache_dir = project_cache_dir(workspace_path, args.cache_dir)
+    classifier_index = os.path.join(cache_dir, CLASSIFIER_INDEX_FILENAME)
+    if not args.no_cache:
+        get_default_classifier().load(classifier_index)
+
+    with profiler.stage("parse"):
+        shards = analyse_workspace(roots, jobs=args.jobs, cache_dir=None if args.no_cache else cache_dir, ignore_patterns=args.ignore,
+                                   use_gitignore=not args.no_gitignore, extractor=args.extractor, io_threads=args.io_threads)
+        deps = merge_shards(shards)
+
+    with profiler.stage("module_map"):
+        resolver = WorkspaceResolver(shards)
+        classifier = WorkspaceClassifier(resolver.packages)
+
+    structured_output = args.output_json or args.output_ndjson
+    if structured_output:
+        with (JsonWriter if args.output_json else NdjsonWriter)(structured_output) as writer:
+            for file, imports in deps.items():
+                writer.write(build_record(file, imports, resolver, classifier))
+        log(f"💾 {writer.count} file record(s) exported to: {structured_output}")
+    else:
+        with profiler.stage("print"):
+            print_dependencies(deps)
+
+    stats = [shard.cache_stats for shard in shards if shard.cache_stats is not None]
+    if stats:
+        hits, misses = sum(s["hits"] for s in stats), sum(s["misses"] for s in stats)
+        profiler.count("cache_hits", hits)
+        profiler.count("cache_misses", misses)
+        log(f"\n♻️ Parse cache: {hits} hit(s), {misses} miss(es) in {len(stats)} shard(s)")
+
+    graph = None
+    if args.export or args.cycles or args.fail_on_cycles or args.save_index is not None or rules is not None or args.metrics:
+        with profiler.stage("resolve"):
+            graph = build_graph(deps, resolver.module_map, resolver=resolver, classifier=classifier)
+
+    if args.save_index is not None:
+        index_path = args.save_index or os.path.join(cache_dir, INDEX_FILENAME)
+        with profiler.stage("index"):
+            save_index(graph, index_path, workspace_path)
+        log(f"💾 Query index saved to: {index_path}")
+
+    if args.export:
+        log("\n🛠️ Graph generation...")
+        with profiler.stage("render"):
+            render_graph(graph, output_path=args.export, output_format=args.format, **render_options(args))
+
+    cycles = []
+    if args.cycles or args.fail_on_cycles:
+        with profiler.stage("cycles"):
+            cycles = find_cycles(graph)
+        log("\n" + format_cycles(cycles))
+
+    violations = []
+    if rules is not None:
+        with profiler.stage("rules"):
+            violations = check_rules(rules, graph, workspace_path, resolver, classifier, args, log)
+
+    if args.metrics:
+        with profiler.stage("metrics"):
+            report_metrics(graph, args, log)
+
+    if not args.no_cache:
+        try:
+            get_default_classifier().save(classifier_index)
+        except OSError as e:
+            log(f"⚠️ Could not save the module classification index: {e}")
+
+    if profiler.enabled:
+        report_profile(profiler, list(deps), graph, args.profile_json)
+
+    if (args.fail_on_cycles and cycles) or violations:
+        sys.exit(1)
+
+
+def load_revision(path: str, args: argparse.Namespace, reference: Snapshot | None, log) -> Snapshot:
+    """
+    Loads one side of a diff: a snapshot file, or a project folder analysed with its parse cache.
+
+    :param path: Snapshot file or project folder
+    :param args: Parsed command line arguments of the 'diff' command
+    :param reference: Snapshot of the other side, whose files with the same content are not parsed again (optional)
+    :param log: Function used to display messages
+
+    :return: Snapshot of the revision
+    """
+    if os.path.isfile(path):
+        try:
+            return Snapshot.load(path)
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            log(f"❌ Could not load the snapshot {path}: {e}")
+            sys.exit(1)
+
+    project_path = os.path.abspath(path)
+    if not os.path.isdir(project_path):
+        log(f"❌ The specified path is neither a folder nor a snapshot file: {project_path}")
+        sys.exit(1)
+
+    log(f"🔍 Analysis of Python files in: {project_path}")
+    files = scan_project(project_path, ignore_patterns=args.ignore, use_gitignore=not args.no_gitignore)
+    cache_dir = project_cache_dir(project_path, args.cache_dir)
+    cache = None if args.no_cache else open_cache(cache_dir, log)
+
+    try:
+        snapshot = take_snapshot(project_path, files=files, cache=cache, reference=reference, extractor=args.extractor)
+        if cache is not None:
+            cache.prune(files)
+            get_default_classifier().load(os.path.join(cache_dir, CLASSIFIER_INDEX_FILENAME))
+    finally:
+        if cache is not None:
+            cache.close()
+
+    return snapshot
+
+
+def diff_main(argv: list[str]) -> None:
+    """
+    'diff' command: compares the dependencies of two revisions of a project.
+
+    :param argv: Command line arguments following 'diff'
+    """
+    parser = argparse.ArgumentParser(
+        prog="depviz diff",
+        description="Dependency edges added and removed between two revisions of a Python project.",
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter
+    )
+
+    parser.add_argument(
+        "old",
+        help="Base revision: project folder, or snapshot file written with --save-snapshot."
+    )
+
+    parser.add_argument(
+        "new",
+        help="Compared revision: project folder, or snapshot file written with --save-snapshot."
+    )
+
+    parser.add_argument(
+        "--output-json",
+        metavar="PATH",
+        help="Write the differences as JSON ('-' for stdout) instead of the text report."
+    )
+
+    parser.add_argument(
+        "--export",
+        metavar="PATH",
+        help="Path (without extension) to export a graph of the changed edges (e.g. ./output/diff)."
+    )
+
+    parser.add_argument(
+        "--format",
+        default="png",
+        choices=["png", "svg", "pdf", "dot"],
+        help="Graph output format."
+    )
+
+    parser.add_argument(
+        "--engine",
+        default="dot",
+        choices=ENGINES,
+        help="Graphviz layout engine."
+    )
+
+    parser.add_argument(
+        "--ignore",
+        metavar="PATTERN",
+        action="append",
+        default=[],
+        help="Glob pattern of files or folders to skip (can be repeated)."
+    )
+
+    parser.add_argument(
+        "--no-gitignore",
+        action="store_true",
+        help="Do not honour the '.gitignore' files of the analysed folders."
+    )
+
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Do not read or update the parse cache of the analysed folders."
+    )
+
+    parser.add_argument(
+        "--cache-dir",
+        metavar="PATH",
+        help="Folder of the parse cache given to the analysis of the folders, which holds one subfolder per project "
+             "(default: '.depviz_cache' at the root of each analysed folder)."
+    )
+
+    parser.add_argument(
+        "--extractor",
+        default="ast",
+        choices=sorted(EXTRACTORS),
+        help="Import extraction engine."
+    )
+
+    parser.add_argument(
+        "--fail-on-cycles",
+        action="store_true",
+        help="Exit with code 1 if the compared revision introduces an import cycle (for CI)."
+    )
+
+    args = parser.parse_args(argv)
+    log = functools.partial(print, file=sys.stderr) if args.output_json == "-" else print
+
+    # Snapshot files are loaded first, so that folders only parse the files that differ from the other side
+    old = load_revision(args.old, args, None, log) if os.path.isfile(args.old) else None
+    new = load_revision(args.new, args, old, log)
+    if old is None:
+        old = load_revision(args.old, args, new, log)
+
+    diff = diff_snapshots(old, new)
+
+    if args.output_json == "-":
+        json.dump(diff, sys.stdout, indent=2)
+        sys.stdout.write("\n")
+    elif args.output_json:
+        with open(args.output_json, "w", encoding="utf-8") as f:
+            json.dump(diff, f, indent=2)
+        log(f"💾 Differences exported to: {args.output_json}")
+    else:
+        print("\n" + format_diff(diff))
+
+    if args.export:
+        log("\n🛠️ Graph generation...")
+        render_diff(diff, output_path=args.export, output_format=args.format, engine=args.engine)
+
+    if args.fail_on_cycles and diff["new_cycles"]:
+        sys.exit(1)
+
+
+def query_main(argv: list[str]) -> None:
+    """
+    'query' command: lists the dependencies or the dependents of a module, from the index saved by '--save-index'.
+
+    :param argv: Command line arguments following 'query'
+    """
+    parser = argparse.ArgumentParser(
+        prog="depviz query",
+        description="Dependencies and reverse dependencies of a module, answered from a saved index.",
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter
+    )
+
+    direction = parser.add_mutually_exclusive_group(required=True)
+
+    direction.add_argument(
+        "--rdeps",
+        metavar="MODULE",
+        help="List the files that depend on the module (file path, dotted name or imported module)."
+    )
+
+    direction.add_argument(
+        "--deps",
+        metavar="MODULE",
+        help="List the modules the file depends on (file path or dotted name)."
+    )
+
+    parser.add_argument(
+        "--depth",
+        metavar="N",
+        type=int,
+        help="Maximum number of import levels to follow (1 = direct imports only, default: transitive)."
+    )
+
+    parser.add_argument(
+        "--path",
+        default=".",
+        help="Path to the analysed project, whose cache folder holds the index."
+    )
+
+    parser.add_argument(
+        "--cache-dir",
+        metavar="PATH",
+        help="Folder of the parse cache given to the analysis that saved the index (default: '.depviz_cache' at the "
+             "root of the project)."
+    )
+
+    parser.add_argument(
+        "--index",
+        metavar="PATH",
+        help="Path of the index file (default: 'index.bin' in the cache folder of the project, see --cache-dir)."
+    )
+
+    parser.add_argument(
+        "--output-json",
+        metavar="PATH",
+        help="Write the results as JSON ('-' for stdout) instead of the text report."
+    )
+
+    args = parser.parse_args(argv)
+    log = functools.partial(print, file=sys.stderr) if args.output_json == "-" else print
+    index_path = args.index or os.path.join(project_cache_dir(os.path.abspath(args.path), args.cache_dir), INDEX_FILENAME)
+
+    if args.depth is not None and args.depth < 1:
+        log(f"❌ The depth must be at least 1: {args.depth}")
+        sys.exit(1)
+
+    try:
+        graph, _ = load_index(index_path)
+    except FileNotFoundError:
+        log(f"❌ No index found at {index_path}: run 'depviz --path PATH --save-index' first, with the same --cache-dir")
+        sys.exit(1)
+    except (OSError, ValueError, KeyError) as e:
+        log(f"❌ Could not load the index {index_path}: {e}")
+        sys.exit(1)
+
+    module = args.rdeps or args.deps
+    results = query(graph, module, reverse=args.rdeps is not None, depth=args.depth)
+    if results is None:
+        log(f"❌ Module not found in the index: {module}")
+        sys.exit(1)
+
+    if args.output_json == "-":
+        json.dump(results, sys.stdout, indent=2)
+        sys.stdout.write("\n")
+    elif args.output_json:
+        with open(args.output_json, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+        log(f"💾 {len(results)} result(s) exported to: {args.output_json}")
+    else:
+        relation = "depending on" if args.rdeps else "imported by"
+        print(f"🔎 {len(results)} module(s) {relation} {module}:")
+        for entry in results:
+            suffix = "" if entry["kind"] == "internal" else f" ({entry['kind']})"
+            print(f"  [{entry['depth']}] {entry['name']}{suffix}")
+
+
+# Subcommands, selected by the first command line argument
+COMMANDS = {
+    "diff": diff_main,
+    "query": query_main,
+}
+
+
+def main(argv: list[str] | None = None):
+    argv = sys.argv[1:] if argv is None else argv
+    if argv and argv[0] in COMMANDS:
+        COMMANDS[argv[0]](argv[1:])
+        return
 
-def main():
     # Configuring command line arguments
     parser = argparse.ArgumentParser(
         description="Internal dependency analyser for Python projects.",
@@ -30,36 +626,392 @@ def main():
         help="Graph output format."
     )
 
-    args = parser.parse_args()
+    parser.add_argument(
+        "--engine",
+        default="dot",
+        choices=ENGINES,
+        help="Graphviz layout engine ('sfdp' is recommended for large graphs)."
+    )
+
+    parser.add_argument(
+        "--collapse",
+        action="store_true",
+        help="Draw one node per package (folder) instead of one per file, with edges weighted by the number of imports."
+    )
+
+    parser.add_argument(
+        "--group-imports",
+        default="none",
+        choices=GROUP_MODES,
+        help="Merge the standard/external/unknown imports: one node per top-level module, or one node per kind."
+    )
+
+    parser.add_argument(
+        "--clusters",
+        action="store_true",
+        help="Draw the files of each package inside a box."
+    )
+
+    parser.add_argument(
+        "--max-nodes",
+        metavar="N",
+        type=int,
+        default=2000,
+        help="Above this number of nodes, the graph is automatically collapsed by package and imports are grouped by kind (0 = no limit)."
+    )
+
+    parser.add_argument(
+        "--ignore",
+        metavar="PATTERN",
+        action="append",
+        default=[],
+        help="Glob pattern of files or folders to skip (can be repeated, e.g. --ignore 'tests' --ignore '*_pb2.py')."
+    )
+
+    parser.add_argument(
+        "--no-gitignore",
+        action="store_true",
+        help="Do not honour the '.gitignore' files of the analysed project."
+    )
+
+    parser.add_argument(
+        "--cache-dir",
+        metavar="PATH",
+        help="Folder of the parse cache, which may be shared by several projects: each one gets its own subfolder "
+             "(default: '.depviz_cache' at the root of the analysed project)."
+    )
+
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Parse every file, without reading or updating the parse cache."
+    )
+
+    parser.add_argument(
+        "--jobs",
+        metavar="N",
+        type=int,
+        default=1,
+        help="Number of processes used to parse files (0 = one per CPU)."
+    )
+
+    parser.add_argument(
+        "--io-threads",
+        metavar="N",
+        type=int,
+        default=0,
+        help="Number of threads reading files ahead of the parser, for network file systems (0 = no read-ahead; ignored with --jobs)."
+    )
+
+    output = parser.add_mutually_exclusive_group()
+
+    output.add_argument(
+        "--output-json",
+        metavar="PATH",
+        help="Stream the imports of each file, resolved and classified, as a JSON array ('-' for stdout)."
+    )
+
+    output.add_argument(
+        "--output-ndjson",
+        metavar="PATH",
+        help="Stream the imports of each file, resolved and classified, as one JSON record per line ('-' for stdout)."
+    )
+
+    parser.add_argument(
+        "--extractor",
+        default="ast",
+        choices=sorted(EXTRACTORS),
+        help="Import extraction engine ('statements' only visits statement bodies, faster on large files)."
+    )
+
+    parser.add_argument(
+        "--cycles",
+        action="store_true",
+        help="Report the import cycles between the files of the project."
+    )
+
+    parser.add_argument(
+        "--fail-on-cycles",
+        action="store_true",
+        help="Report the import cycles and exit with code 1 if there is any (for CI)."
+    )
+
+    parser.add_argument(
+        "--rules",
+        metavar="PATH",
+        help="Check the dependencies against the architecture rules of a JSON file (e.g. config/depviz_rules.json), "
+             "report the violations with their file and line, and exit with code 1 if there is any (for CI)."
+    )
+
+    parser.add_argument(
+        "--metrics",
+        metavar="PATH",
+        help="Write the metrics of each file as CSV to this file: fan-in, fan-out, external imports, number of files "
+             "depended on transitively, longest import chain and PageRank centrality."
+    )
+
+    parser.add_argument(
+        "--metrics-sort",
+        default="pagerank",
+        choices=METRIC_COLUMNS,
+        help="Column the metrics are sorted by (largest first, alphabetical for 'file')."
+    )
+
+    parser.add_argument(
+        "--watch",
+        action="store_true",
+        help="Keep running and update the outputs when files change (inotify on Linux, polling elsewhere)."
+    )
+
+    parser.add_argument(
+        "--interval",
+        metavar="SECONDS",
+        type=float,
+        default=1.0,
+        help="Polling interval of the watch mode, when file notifications are not available."
+    )
+
+    parser.add_argument(
+        "--debounce",
+        metavar="SECONDS",
+        type=float,
+        default=0.3,
+        help="Quiet period of the watch mode before the changes are applied."
+    )
+
+    parser.add_argument(
+        "--save-snapshot",
+        metavar="PATH",
+        help="Save the imports and content hash of each file as JSON, to be compared later with 'depviz diff'."
+    )
+
+    parser.add_argument(
+        "--save-index",
+        metavar="PATH",
+        nargs="?",
+        const="",
+        help="Save the resolved dependencies for 'depviz query' (default location: 'index.bin' in the cache folder)."
+    )
+
+    parser.add_argument(
+        "--stats",
+        action="store_true",
+        help="Display the time and number of calls of each stage, and the slowest files to parse (on stderr)."
+    )
+
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="Like --stats, and also measure the peak memory of each stage (slower)."
+    )
+
+    parser.add_argument(
+        "--profile-json",
+        metavar="PATH",
+        help="Write the measures of --stats/--profile as JSON to this file."
+    )
+
+    parser.add_argument(
+        "--slowest",
+        metavar="N",
+        type=int,
+        default=10,
+        help="Number of slowest files listed by --stats/--profile."
+    )
+
+    parser.add_argument(
+        "--low-memory",
+        action="store_true",
+        help="Keep the memory used roughly constant on very large projects: files are listed as soon as they are parsed, "
+             "the parse cache is read on demand and the imports are spilled to a temporary database."
+    )
+
+    roots = parser.add_mutually_exclusive_group()
+
+    roots.add_argument(
+        "--root",
+        metavar="PATH",
+        action="append",
+        default=[],
+        help="Source root of a package of a monorepo, relative to --path (can be repeated): each root is analysed as a "
+             "separate shard, with its own module names and parse cache, and the shards are merged into one graph."
+    )
+
+    roots.add_argument(
+        "--discover-roots",
+        action="store_true",
+        help="Find the source roots of the packages under --path from their 'pyproject.toml' or 'setup.cfg' files."
+    )
+
+    parser.add_argument(
+        "--symbols",
+        action="store_true",
+        help="Index the top-level definitions of each module in the same parse, resolve 'from' imports to the imported "
+             "symbol and report unused and dangling imports."
+    )
+
+    args = parser.parse_args(argv)
     project_path = os.path.abspath(args.path)
 
+    # Diagnostics are sent to stderr when the standard output carries the exported data
+    structured_output = args.output_json or args.output_ndjson
+    report_cycles = args.cycles or args.fail_on_cycles
+    log = functools.partial(print, file=sys.stderr) if structured_output == "-" else print
+    profiling = args.stats or args.profile or args.profile_json
+    profiler = Profiler(memory=args.profile, slowest=args.slowest) if profiling else NullProfiler()
+
+    if args.jobs < 0:
+        log(f"❌ The number of jobs must be positive: {args.jobs}")
+        sys.exit(1)
+
+    if args.io_threads < 0:
+        log(f"❌ The number of I/O threads must be positive: {args.io_threads}")
+        sys.exit(1)
+
     if not os.path.isdir(project_path):
-        print(f"❌ The specified path is not a valid folder: {project_path}")
+        log(f"❌ The specified path is not a valid folder: {project_path}")
         sys.exit(1)
 
+    rules = None
+    if args.rules:
+        try:
+            rules = RuleSet.load(args.rules)
+        except (OSError, ValueError) as e:
+            log(f"❌ Could not load the rules {args.rules}: {e}")
+            sys.exit(1)
+
+    if args.root or args.discover_roots:
+        run_workspace(project_path, args, log, profiler, rules)
+        return
+
     # Analyse des dépendances
-    print(f"🔍 Analysis of Python files in: {project_path}\n")
-    deps = collect_all_dependencies(project_path)
-    module_map = build_module_map(project_path)
+    log(f"🔍 Analysis of Python files in: {project_path}\n")
+    directories = []
+    with profiler.stage("walk"):
+        files = scan_project(project_path, ignore_patterns=args.ignore, use_gitignore=not args.no_gitignore, directories=directories)
+    cache_dir = project_cache_dir(project_path, args.cache_dir)
+    cache = None if args.no_cache else open_cache(cache_dir, log, preload=not args.low_memory)
+    if args.save_index == "":
+        args.save_index = os.path.join(cache_dir, INDEX_FILENAME)
 
-    # Affichage simple des dépendances
-    for file, imports in deps.items():
-        print(f"\n📄 {file}")
-        if imports:
-            for imp in imports:
-                print(f"  └── import {imp}")
-        else:
-            print("  └── (no import)")
+    # Warm start of the stdlib/external classification
+    classifier_index = os.path.join(cache_dir, CLASSIFIER_INDEX_FILENAME)
+    if cache is not None:
+        with profiler.stage("classifier_load"):
+            get_default_classifier().load(classifier_index)
+
+    # The module map only needs the inventory, so it is ready before the first file is parsed
+    with profiler.stage("module_map"):
+        module_map = build_module_map(project_path, files=files)
+
+    try:
+        with profiler.stage("parse"):
+            symbols = {} if args.symbols else None
+            stream = iter_dependencies(project_path, files=files, cache=cache, jobs=args.jobs, extractor=args.extractor, io_threads=args.io_threads, symbols=symbols)
+            stream = profiler.iter_files(stream)
+
+            if structured_output:
+                # Records are written as soon as each file is parsed; imports are only kept if a graph is requested
+                writer_class = JsonWriter if args.output_json else NdjsonWriter
+                resolver = ModuleResolver(module_map)
+                keep_deps = args.export or args.watch or report_cycles or args.save_snapshot or args.save_index or rules is not None or args.metrics
+                deps = (DependencyStore() if args.low_memory else {}) if keep_deps else None
+
+                with writer_class(structured_output) as writer:
+                    for file, imports in stream:
+                        writer.write(build_record(file, imports, resolver))
+                        if deps is not None:
+                            deps[file] = imports
+            elif args.low_memory:
+                # Each file is listed as soon as it is parsed, and its imports are spilled to disk when needed
+                deps = DependencyStore()
+                for file, imports in stream:
+                    print_file_dependencies(file, imports)
+                    deps[file] = imports
+            else:
+                deps = dict(stream)
+
+        if cache is not None:
+            cache.prune(files)
+
+        if args.save_snapshot:
+            # Taken while the cache is open: without preloading, the digests of the files are read from the database
+            with profiler.stage("snapshot"):
+                take_snapshot(project_path, files=files, dependencies=deps, cache=cache).save(args.save_snapshot)
+    finally:
+        if cache is not None:
+            with profiler.stage("cache_write"):
+                cache.close()
+
+    if structured_output:
+        log(f"💾 {writer.count} file record(s) exported to: {structured_output}")
+    elif not args.low_memory:
+        # Affichage simple des dépendances
+        with profiler.stage("print"):
+            print_dependencies(deps)
+
+    if cache is not None:
+        stats = cache.stats()
+        profiler.count("cache_hits", stats["hits"])
+        profiler.count("cache_misses", stats["misses"])
+        log(f"\n♻️ Parse cache: {stats['hits']} hit(s), {stats['misses']} miss(es)")
+
+    if args.symbols:
+        with profiler.stage("symbols"):
+            report = analyse_symbols(symbols, ModuleResolver(module_map))
+        log("\n" + format_symbol_report(report))
+
+    if args.save_snapshot:
+        log(f"💾 Snapshot saved to: {args.save_snapshot}")
+
+    graph = None
+    if args.export or report_cycles or args.save_index or rules is not None or args.metrics:
+        with profiler.stage("resolve"):
+            graph = build_graph(deps, module_map)
+
+    if args.save_index:
+        with profiler.stage("index"):
+            save_index(graph, args.save_index, project_path)
+        log(f"💾 Query index saved to: {args.save_index}")
 
     if args.export:
-        print("\n🛠️ Graph generation...")
-        build_dependency_graph(
-            deps,
-            module_map,
-            project_path,
-            output_path=args.export,
-            output_format=args.format
-        )
+        log("\n🛠️ Graph generation...")
+        with profiler.stage("render"):
+            render_graph(graph, output_path=args.export, output_format=args.format, **render_options(args))
+
+    cycles = []
+    if report_cycles:
+        with profiler.stage("cycles"):
+            cycles = find_cycles(graph)
+        log("\n" + format_cycles(cycles))
+
+    violations = []
+    if rules is not None:
+        with profiler.stage("rules"):
+            violations = check_rules(rules, graph, project_path, ModuleResolver(module_map), None, args, log)
+
+    if args.metrics:
+        with profiler.stage("metrics"):
+            report_metrics(graph, args, log)
+
+    if cache is not None:
+        try:
+            get_default_classifier().save(classifier_index)
+        except OSError as e:
+            log(f"⚠️ Could not save the module classification index: {e}")
+
+    if profiler.enabled:
+        report_profile(profiler, files, graph, args.profile_json)
+
+    if args.watch:
+        from .watcher import IncrementalProject
+
+        project = IncrementalProject(project_path, ignore_patterns=args.ignore, use_gitignore=not args.no_gitignore, extractor=args.extractor)
+        project.load(files=files, dependencies=deps, module_map=module_map, directories=directories)
+        cycles, violations = run_watch(project, args, log, rules=rules, cycles=cycles, violations=violations)
+
+    if (args.fail_on_cycles and cycles) or violations:
+        sys.exit(1)
 
 if __name__ == "__main__":
     main()
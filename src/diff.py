@@ -0,0 +1,146 @@
+from .classifier import (ModuleClassifier, get_default_classifier)
+from .cycles import find_cycles
+from .graph import (KIND_INTERNAL, KIND_NAMES, build_graph, resolve_import)
+from .parser import (build_module_map, build_partial_module_map, import_prefixes, module_names_for_file)
+from .snapshot import Snapshot
+from .utils import ModuleResolver
+
+
+def changed_files(old: Snapshot, new: Snapshot) -> tuple[list[str], list[str], list[str]]:
+    """
+    Compares the inventories and the contents of two snapshots.
+
+    :param old: Snapshot of the base revision
+    :param new: Snapshot of the compared revision
+
+    :return: (added, removed, modified) sorted relative paths
+    """
+    added = sorted(new.files.keys() - old.files.keys())
+    removed = sorted(old.files.keys() - new.files.keys())
+    modified = []
+    for rel_path in new.files.keys() & old.files.keys():
+        old_digest, old_imports = old.files[rel_path]
+        new_digest, new_imports = new.files[rel_path]
+        if old_digest and new_digest:
+            if old_digest != new_digest:
+                modified.append(rel_path)
+        elif old_imports != new_imports:  # Content hash unknown: the imports are compared
+            modified.append(rel_path)
+    return added, removed, sorted(modified)
+
+
+def _file_edges(source: str, imports: list[str], resolver: ModuleResolver, classifier: ModuleClassifier) -> set[tuple[str, str, int]]:
+    edges = set()
+    for imp in imports:
+        target, kind = resolve_import(imp, source, resolver, classifier)
+        if target != source:
+            edges.add((source, target, kind))
+    return edges
+
+
+def _edge_record(edge: tuple[str, str, int]) -> dict:
+    return {"source": edge[0], "target": edge[1], "kind": KIND_NAMES[edge[2]]}
+
+
+def diff_snapshots(old: Snapshot, new: Snapshot, classifier: ModuleClassifier | None = None) -> dict:
+    """
+    Computes the dependency edges added and removed between two revisions of a project, and the new import cycles.
+
+    Only the files whose edges can differ are resolved: the added, removed and modified files, and the unchanged
+    files importing a module name that now points to other files (a file was added or removed). The module maps
+    only cover the names imported by these files, and both use the root folder name of the compared revision.
+    Cycles are only searched for when internal edges are added, since a new cycle must go through one of them.
+
+    :param old: Snapshot of the base revision
+    :param new: Snapshot of the compared revision
+    :param classifier: Stdlib/external classifier (default: the shared one)
+
+    :return: {'added_files', 'removed_files', 'modified_files': sorted relative paths,
+              'added_edges', 'removed_edges': sorted edges {'source', 'target', 'kind'},
+              'new_cycles': cycles of the compared revision that did not exist (see 'cycles.find_cycles')}
+    """
+    classifier = classifier or get_default_classifier()
+    project_path = new.project_path
+    added, removed, modified = changed_files(old, new)
+
+    changed_names = set()
+    for rel_path in added + removed:
+        changed_names.update(module_names_for_file(project_path, rel_path))
+
+    # An import can only resolve differently if one of its dotted prefixes is a module name that changed
+    affected = set(added) | set(removed) | set(modified)
+    if changed_names:
+        changed_tops = {name.partition(".")[0] for name in changed_names}
+        for rel_path, (_, imports) in new.files.items():
+            if rel_path in affected:
+                continue
+            for imp in imports:
+                if imp.partition(".")[0] in changed_tops and not import_prefixes([imp]).isdisjoint(changed_names):
+                    affected.add(rel_path)
+                    break
+
+    names = set()
+    for snapshot in (old, new):
+        for rel_path in affected:
+            if rel_path in snapshot.files:
+                names |= import_prefixes(snapshot.files[rel_path][1])
+
+    old_resolver = ModuleResolver(build_partial_module_map(project_path, list(old.files), names))
+    new_resolver = ModuleResolver(build_partial_module_map(project_path, list(new.files), names))
+    added_edges, removed_edges = set(), set()
+    for rel_path in affected:
+        old_edges = _file_edges(rel_path, old.files[rel_path][1], old_resolver, classifier) if rel_path in old.files else set()
+        new_edges = _file_edges(rel_path, new.files[rel_path][1], new_resolver, classifier) if rel_path in new.files else set()
+        added_edges |= new_edges - old_edges
+        removed_edges |= old_edges - new_edges
+
+    new_cycles = []
+    internal_edges = [(source, target) for source, target, kind in added_edges if kind == KIND_INTERNAL]
+    if internal_edges:
+        new_graph = build_graph(new.dependencies, build_module_map(project_path, files=list(new.files)), classifier=classifier)
+        candidates = [
+            entry for entry in find_cycles(new_graph)
+            if any(source in entry["files"] and target in entry["files"] for source, target in internal_edges)
+        ]
+        if candidates:
+            old_graph = build_graph(old.dependencies, build_module_map(project_path, files=list(old.files)), classifier=classifier)
+            old_components = {frozenset(entry["files"]) for entry in find_cycles(old_graph)}
+            new_cycles = [entry for entry in candidates if frozenset(entry["files"]) not in old_components]
+
+    return {
+        "added_files": added,
+        "removed_files": removed,
+        "modified_files": modified,
+        "added_edges": [_edge_record(edge) for edge in sorted(added_edges)],
+        "removed_edges": [_edge_record(edge) for edge in sorted(removed_edges)],
+        "new_cycles": new_cycles,
+    }
+
+
+def format_diff(diff: dict) -> str:
+    """
+    :param diff: Differences between two revisions (see 'diff_snapshots')
+
+    :return: Human-readable report
+    """
+    lines = [
+        f"🔀 {len(diff['added_files'])} added, {len(diff['modified_files'])} modified, "
+        f"{len(diff['removed_files'])} removed file(s)"
+    ]
+
+    for sign, key, label in (("➕", "added_edges", "added"), ("➖", "removed_edges", "removed")):
+        edges = diff[key]
+        lines.append(f"\n{sign} {len(edges)} {label} edge(s)" + (":" if edges else ""))
+        for edge in edges:
+            suffix = "" if edge["kind"] == KIND_NAMES[KIND_INTERNAL] else f" ({edge['kind']})"
+            lines.append(f"  {edge['source']} -> {edge['target']}{suffix}")
+
+    if diff["new_cycles"]:
+        lines.append(f"\n🔁 {len(diff['new_cycles'])} new import cycle(s):")
+        for entry in diff["new_cycles"]:
+            lines.append(f"\n  {len(entry['files'])} file(s): {', '.join(entry['files'])}")
+            lines.append(f"  └── {' -> '.join(entry['cycle'])}")
+    else:
+        lines.append("\n✅ No new import cycle.")
+
+    return "\n".join(lines)
@@ -0,0 +1,123 @@
+import json
+import sys
+from abc import (ABC, abstractmethod)
+from .classifier import (ModuleClassifier, get_default_classifier)
+from .utils import ModuleResolver
+
+
+INTERNAL = "internal"
+UNKNOWN = "unknown"
+
+
+def describe_import(imp: str, file: str | None, resolver: ModuleResolver, classifier: ModuleClassifier | None = None) -> dict:
+    """
+    Classifies an import, with the same classification as the dependency graph.
+
+    :param imp: Imported module (e.g. 'utils')
+    :param file: Relative path of the importing file, used to resolve relative and ambiguous names (optional)
+    :param resolver: Resolver of the internal modules of the project
+    :param classifier: Stdlib/external classifier (default: the shared one)
+
+    :return: {'name': ..., 'kind': ..., 'target': ...} where kind is 'stdlib', 'external', 'internal' or 'unknown',
+             and target is the resolved file for internal imports (None otherwise)
+    """
+    kind = (classifier or get_default_classifier()).classify(imp)
+    target = None
+
+    if kind is None:
+        target = resolver.resolve(imp, current_file=file)
+        kind = INTERNAL if target else UNKNOWN
+
+    return {"name": imp, "kind": kind, "target": target}
+
+
+def build_record(file: str, imports: list[str], resolver: ModuleResolver, classifier: ModuleClassifier | None = None) -> dict:
+    """
+    Describes the imports of a file, with the same classification as the dependency graph.
+
+    :param file: Relative path of the source file (e.g. 'main.py')
+    :param imports: Imported modules of the file (e.g. ['utils', 'os'])
+    :param resolver: Resolver of the internal modules of the project
+    :param classifier: Stdlib/external classifier (default: the shared one)
+
+    :return: Record {'file': ..., 'imports': [{'name': ..., 'kind': ..., 'target': ...}, ...]}
+             (see 'describe_import')
+    """
+    classifier = classifier or get_default_classifier()
+    return {"file": file, "imports": [describe_import(imp, file, resolver, classifier) for imp in imports]}
+
+
+class RecordWriter(ABC):
+    """
+    Base class of the streamed exports: records are written (and flushed) one at a time.
+    """
+
+    def __init__(self, path: str, append: bool = False):
+        """
+        :param path: Output file path, or '-' for the standard output
+        :param append: True to add the records at the end of an existing file
+        """
+        self.path = path
+        self.append = append
+        self._stream = None
+        self.count = 0
+
+    def __enter__(self) -> "RecordWriter":
+        self._stream = sys.stdout if self.path == "-" else open(self.path, "a" if self.append else "w", encoding="utf-8")
+        self._begin()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self._end()
+        self._stream.flush()
+        if self._stream is not sys.stdout:
+            self._stream.close()
+
+    def write(self, record: dict) -> None:
+        """
+        Writes a record to the output.
+
+        :param record: Record to be written (see 'build_record')
+        """
+        self._write(record)
+        self._stream.flush()
+        self.count += 1
+
+    def _begin(self) -> None:
+        pass
+
+    @abstractmethod
+    def _write(self, record: dict) -> None:
+        """
+        Writes a record to the stream, in the format of the subclass.
+
+        :param record: Record to be written (see 'build_record')
+        """
+
+    def _end(self) -> None:
+        pass
+
+
+class NdjsonWriter(RecordWriter):
+    """
+    Newline-delimited JSON: one record per line.
+    """
+
+    def _write(self, record: dict) -> None:
+        self._stream.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+
+class JsonWriter(RecordWriter):
+    """
+    JSON array of records, written incrementally.
+    """
+
+    def _begin(self) -> None:
+        self._stream.write("[")
+
+    def _write(self, record: dict) -> None:
+        separator = "," if self.count else ""
+        self._stream.write(f"{separator}\n  {json.dumps(record, ensure_ascii=False)}")
+
+    def _end(self) -> None:
+        self._stream.write("\n]\n" if self.count else "]\n")
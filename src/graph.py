@@ -0,0 +1,255 @@
+import sys
+from array import array
+from .classifier import (EXTERNAL, STDLIB, ModuleClassifier, get_default_classifier)
+from .utils import ModuleResolver
+
+
+# Node kinds, stored as small integers
+KIND_INTERNAL = 0
+KIND_STDLIB = 1
+KIND_EXTERNAL = 2
+KIND_UNKNOWN = 3
+
+KIND_NAMES = ("internal", "stdlib", "external", "unknown")
+
+_CLASSIFIER_KINDS = {STDLIB: KIND_STDLIB, EXTERNAL: KIND_EXTERNAL}
+
+
+class DependencyGraph:
+    """
+    Immutable directed graph of dependencies, with integer node ids and array-backed adjacency.
+
+    Node names are interned and numbered from 0; the edges of node i are
+    'targets[offsets[i]:offsets[i + 1]]' (compressed sparse row layout), in insertion order.
+    Each node has a kind: KIND_INTERNAL (project file), KIND_STDLIB, KIND_EXTERNAL or KIND_UNKNOWN.
+    """
+
+    def __init__(self, names: list[str], kinds: array, offsets: array, targets: array, ids: dict[str, int] | None = None):
+        """
+        :param names: Name of each node (file path or module name)
+        :param kinds: Kind of each node (array of type 'b')
+        :param offsets: Start of the edges of each node, plus the total number of edges (array of type 'q')
+        :param targets: Target node of each edge (array of type 'i')
+        :param ids: Dictionary name -> node id (computed from 'names' if not provided)
+        """
+        self.names = names
+        self.kinds = kinds
+        self.offsets = offsets
+        self.targets = targets
+        self._ids = ids if ids is not None else {name: i for i, name in enumerate(names)}
+        self._reverse = None
+
+    @property
+    def node_count(self) -> int:
+        return len(self.names)
+
+    @property
+    def edge_count(self) -> int:
+        return len(self.targets)
+
+    def id(self, name: str) -> int | None:
+        """
+        :param name: Name of a node
+
+        :return: Id of the node, or None if it is not in the graph
+        """
+        return self._ids.get(name)
+
+    def kind_name(self, node: int) -> str:
+        """
+        :param node: Id of a node
+
+        :return: Kind of the node ('internal', 'stdlib', 'external' or 'unknown')
+        """
+        return KIND_NAMES[self.kinds[node]]
+
+    def successors(self, node: int) -> array:
+        """
+        :param node: Id of a node
+
+        :return: Ids of the nodes it depends on
+        """
+        return self.targets[self.offsets[node]:self.offsets[node + 1]]
+
+    def out_degree(self, node: int) -> int:
+        return self.offsets[node + 1] - self.offsets[node]
+
+    def edges(self):
+        """
+        :return: Iterator over the edges, as (source id, target id)
+        """
+        offsets, targets = self.offsets, self.targets
+        for source in range(len(self.names)):
+            for i in range(offsets[source], offsets[source + 1]):
+                yield source, targets[i]
+
+    def named_edges(self):
+        """
+        :return: Iterator over the edges, as (source name, target name)
+        """
+        names = self.names
+        for source, target in self.edges():
+            yield names[source], names[target]
+
+    def reverse(self) -> "DependencyGraph":
+        """
+        Returns the graph with all edges reversed (who depends on each node), computed once.
+
+        :return: Reversed graph, sharing the names and kinds of this graph
+        """
+        if self._reverse is None:
+            sources = array("i", bytes(4 * self.edge_count))
+            for node in range(len(self.names)):
+                for i in range(self.offsets[node], self.offsets[node + 1]):
+                    sources[i] = node
+            offsets, targets = _csr(len(self.names), self.targets, sources)
+            self._reverse = DependencyGraph(self.names, self.kinds, offsets, targets, ids=self._ids)
+            self._reverse._reverse = self
+        return self._reverse
+
+    def attach_reverse(self, offsets: array, targets: array) -> "DependencyGraph":
+        """
+        Sets the reversed adjacency when it is already known (e.g. loaded from an index), instead of computing it.
+
+        :param offsets: Start of the reversed edges of each node (array of type 'q')
+        :param targets: Source node of each reversed edge (array of type 'i')
+
+        :return: Reversed graph, also returned by 'reverse()' from now on
+        """
+        self._reverse = DependencyGraph(self.names, self.kinds, offsets, targets, ids=self._ids)
+        self._reverse._reverse = self
+        return self._reverse
+
+    def memory_size(self) -> int:
+        """
+        :return: Approximate size in bytes of the adjacency arrays
+        """
+        return sum(a.itemsize * len(a) for a in (self.kinds, self.offsets, self.targets))
+
+
+def _csr(node_count: int, sources: array, targets: array) -> tuple[array, array]:
+    # Counting sort of the edges by source, keeping their relative order
+    offsets = array("q", bytes(8 * (node_count + 1)))
+    for source in sources:
+        offsets[source + 1] += 1
+    for i in range(node_count):
+        offsets[i + 1] += offsets[i]
+
+    sorted_targets = array("i", bytes(4 * len(targets)))
+    position = array("q", offsets)
+    for source, target in zip(sources, targets):
+        sorted_targets[position[source]] = target
+        position[source] += 1
+    return offsets, sorted_targets
+
+
+class GraphBuilder:
+    """
+    Incremental construction of a DependencyGraph: nodes are interned, and the duplicate edges of a source are
+    ignored as long as its edges are added consecutively (only the targets of the current source are remembered).
+    """
+
+    def __init__(self):
+        self._ids = {}
+        self._names = []
+        self._kinds = array("b")
+        self._sources = array("i")
+        self._targets = array("i")
+        self._current_source = None
+        self._seen = set()
+
+    def add_node(self, name: str, kind: int) -> int:
+        """
+        Adds a node, unless it already exists (its first kind is kept).
+
+        :param name: Name of the node
+        :param kind: Kind of the node (KIND_INTERNAL, KIND_STDLIB, KIND_EXTERNAL or KIND_UNKNOWN)
+
+        :return: Id of the node
+        """
+        node = self._ids.get(name)
+        if node is None:
+            name = sys.intern(name)
+            node = self._ids[name] = len(self._names)
+            self._names.append(name)
+            self._kinds.append(kind)
+        return node
+
+    def add_edge(self, source: int, target: int) -> None:
+        """
+        Adds an edge, ignoring self-loops and duplicates.
+
+        :param source: Id of the source node
+        :param target: Id of the target node
+        """
+        if source == target:
+            return
+        if source != self._current_source:
+            self._current_source = source
+            self._seen = set()
+        if target in self._seen:
+            return
+        self._seen.add(target)
+        self._sources.append(source)
+        self._targets.append(target)
+
+    def build(self) -> DependencyGraph:
+        """
+        :return: Graph containing the added nodes and edges
+        """
+        offsets, targets = _csr(len(self._names), self._sources, self._targets)
+        return DependencyGraph(self._names, self._kinds, offsets, targets, ids=self._ids)
+
+
+def resolve_import(imp: str, source: str, resolver: ModuleResolver, classifier: ModuleClassifier | None = None) -> tuple[str, int]:
+    """
+    Determines the node an import points to.
+
+    :param imp: Imported module (e.g. 'helpers.math')
+    :param source: Relative path of the importing file
+    :param resolver: Resolver of the internal modules
+    :param classifier: Stdlib/external classifier (default: the shared one)
+
+    :return: (node name, node kind): the resolved file for internal imports, the module name otherwise
+    """
+    kind = (classifier or get_default_classifier()).classify(imp)
+    if kind is not None:  # Standard or external import
+        return imp, _CLASSIFIER_KINDS[kind]
+
+    resolved = resolver.resolve(imp, current_file=source)
+    if resolved:  # Internal import
+        return resolved, KIND_INTERNAL
+
+    return imp, KIND_UNKNOWN  # Unknown import
+
+
+def build_graph(dependencies: dict[str, list[str]], module_map: dict[str, list[str]], resolver: ModuleResolver | None = None, classifier: ModuleClassifier | None = None) -> DependencyGraph:
+    """
+    Builds the dependency graph of a project from the imports of its files.
+
+    Each analysed file is an internal node. Each import becomes an edge to the resolved internal file,
+    to the standard or external module, or to an unknown module when it cannot be resolved.
+
+    :param dependencies: Relative file dictionary -> list of imported modules
+    :param module_map: Dictionary associating each internal module with its source paths
+    :param resolver: Resolver of the internal modules (built from 'module_map' if not provided)
+    :param classifier: Stdlib/external classifier (default: the shared one)
+
+    :return: Dependency graph
+    """
+    resolver = resolver or ModuleResolver(module_map)
+    classifier = classifier or get_default_classifier()
+    builder = GraphBuilder()
+
+    # Create nodes for all source files
+    for source in dependencies:
+        builder.add_node(source, KIND_INTERNAL)
+
+    for source, imports in dependencies.items():
+        source_id = builder.add_node(source, KIND_INTERNAL)
+
+        for imp in imports:
+            target_id = builder.add_node(*resolve_import(imp, source, resolver, classifier))
+            builder.add_edge(source_id, target_id)
+
+    return builder.build()
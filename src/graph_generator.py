@@ -1,6 +1,272 @@
-from graphviz import Digraph
+import math
 import os
-from .utils import (is_standard_or_external, resolve_module_name)
+from typing import TYPE_CHECKING
+from .graph import (KIND_EXTERNAL, KIND_INTERNAL, KIND_NAMES, KIND_STDLIB, KIND_UNKNOWN, DependencyGraph, build_graph)
+
+if TYPE_CHECKING:
+    from graphviz import Digraph
+
+
+# Visual styles of the nodes and of the edges pointing to them, by node kind
+NODE_STYLES = {
+    KIND_INTERNAL: {
+        "shape": "ellipse",
+        "style": "filled",
+        "fillcolor": "#ADD8E6",
+        "color": "#82A2AD",
+        "penwidth": "1"
+    },
+    KIND_STDLIB: {
+        "shape": "box",
+        "style": "filled",
+        "fillcolor": "#FECA66",
+        "color": "#BF984D",
+        "penwidth": "1"
+    },
+    KIND_UNKNOWN: {
+        "shape": "box",
+        "style": "filled",
+        "fillcolor": "#F18C8C",
+        "color": "#B56969",
+        "penwidth": "1"
+    },
+}
+NODE_STYLES[KIND_EXTERNAL] = NODE_STYLES[KIND_STDLIB]
+
+EDGE_STYLES = {
+    KIND_INTERNAL: {
+        "style": "solid",
+        "color": "black"
+    },
+    KIND_STDLIB: {
+        "style": "solid",
+        "color": "#787878"
+    },
+}
+EDGE_STYLES[KIND_EXTERNAL] = EDGE_STYLES[KIND_UNKNOWN] = EDGE_STYLES[KIND_STDLIB]
+
+
+# Layout engines offered for the rendering (sfdp scales to large graphs)
+ENGINES = ["dot", "sfdp", "fdp", "neato", "twopi", "circo"]
+
+# Grouping modes of the non-internal imports
+GROUP_MODES = ["none", "top-level", "kind"]
+
+ROOT_PACKAGE = "." + os.sep
+
+
+def package_of(path: str, depth: int | None = None) -> str:
+    """
+    Returns the package (folder) of a project file, used as collapsed node name.
+
+    :param path: Relative path of the file (e.g. 'src/core/parser.py')
+    :param depth: Maximum number of folder levels to keep (None for all)
+
+    :return: Folder followed by a separator (e.g. 'src/core/'), or './' for files at the root
+    """
+    parts = path.replace("\\", "/").split("/")[:-1]
+    if depth is not None:
+        parts = parts[:depth]
+    return os.sep.join(parts) + os.sep if parts else ROOT_PACKAGE
+
+
+def aggregate_graph(graph: DependencyGraph, collapse: bool = False, group_imports: str = "none", depth: int | None = None) -> tuple[dict, dict]:
+    """
+    Merges the nodes of a dependency graph into groups, summing the edges between groups.
+
+    :param graph: Dependency graph (see 'graph.build_graph')
+    :param collapse: True to merge the files of each package (folder) into one node
+    :param group_imports: 'none' to keep each import, 'top-level' for one node per top-level module
+                          (e.g. 'os' for 'os.path'), 'kind' for one node per kind (stdlib, external, unknown)
+    :param depth: Maximum folder depth of the collapsed packages (None for all)
+
+    :return: (nodes, edges) where nodes = {name: [kind, number of merged nodes]} in first-seen order
+             and edges = {(source name, target name): number of merged edges}
+    """
+    keys = []
+    for node, name in enumerate(graph.names):
+        kind = graph.kinds[node]
+        if kind == KIND_INTERNAL:
+            keys.append(package_of(name, depth) if collapse else name)
+        elif group_imports == "kind":
+            keys.append(KIND_NAMES[kind])
+        elif group_imports == "top-level":
+            keys.append(name.partition(".")[0])
+        else:
+            keys.append(name)
+
+    nodes = {}
+    for node, key in enumerate(keys):
+        entry = nodes.setdefault(key, [graph.kinds[node], 0])
+        entry[1] += 1
+
+    edges = {}
+    for source, target in graph.edges():
+        edge = (keys[source], keys[target])
+        if edge[0] != edge[1]:
+            edges[edge] = edges.get(edge, 0) + 1
+
+    return nodes, edges
+
+
+def to_digraph(graph: DependencyGraph, output_format: str = "png", engine: str = "dot", collapse: bool = False, group_imports: str = "none", clusters: bool = False, max_nodes: int | None = None) -> "Digraph":
+    """
+    Converts a dependency graph into a Graphviz graph, without rendering it.
+
+    Internal files are drawn as blue ellipses, standard and external modules as orange boxes,
+    and unresolved modules as red boxes. Merged nodes show the number of merged items, and merged edges
+    are drawn thicker according to the number of imports they stand for.
+
+    :param graph: Dependency graph (see 'graph.build_graph')
+    :param output_format: Graph output format (e.g. 'png', 'svg', 'dot') (default: 'png')
+    :param engine: Graphviz layout engine (see 'ENGINES')
+    :param collapse: True to draw one node per package (folder) instead of one per file
+    :param group_imports: Grouping of the non-internal imports (see 'aggregate_graph')
+    :param clusters: True to draw the files of each package inside a box (ignored when collapsed)
+    :param max_nodes: If the graph has more nodes, packages are collapsed and imports grouped by kind,
+                      with shallower packages until the limit is met (None for no limit)
+
+    :return: Graphviz directed graph
+    """
+    nodes, edges = aggregate_graph(graph, collapse=collapse, group_imports=group_imports)
+
+    if max_nodes is not None and len(nodes) > max_nodes:
+        collapse, group_imports = True, "kind"
+        depth = max((name.replace("\\", "/").count("/") for name, kind in zip(graph.names, graph.kinds) if kind == KIND_INTERNAL), default=0)
+        while True:
+            nodes, edges = aggregate_graph(graph, collapse=True, group_imports="kind", depth=depth)
+            if len(nodes) <= max_nodes or depth == 0:
+                break
+            depth -= 1
+
+    # Imported on first use: loading graphviz costs more than the rest of the start-up
+    from graphviz import Digraph
+
+    dot = Digraph(comment="Dependency Graph", format=output_format, engine=engine)
+    dot.attr(rankdir='LR')
+    if engine != "dot":
+        dot.attr(overlap="prism", outputorder="edgesfirst")
+
+    def add_node(target, name, kind, count):
+        attributes = dict(NODE_STYLES[kind])
+        if count > 1:
+            attributes["label"] = f"{name} ({count})"
+        target.node(name, **attributes)
+
+    if clusters and not collapse:
+        packages = {}
+        for name, (kind, count) in nodes.items():
+            if kind == KIND_INTERNAL:
+                packages.setdefault(package_of(name), []).append(name)
+            else:
+                add_node(dot, name, kind, count)
+
+        for i, (package, members) in enumerate(packages.items()):
+            with dot.subgraph(name=f"cluster_{i}") as sub:
+                sub.attr(label=package, style="rounded", color="#82A2AD")
+                for name in members:
+                    add_node(sub, name, KIND_INTERNAL, nodes[name][1])
+    else:
+        for name, (kind, count) in nodes.items():
+            add_node(dot, name, kind, count)
+
+    for (source, target), weight in edges.items():
+        style = EDGE_STYLES[nodes[target][0]]
+        if weight > 1:
+            dot.edge(source, target, label=str(weight), penwidth=f"{1 + math.log2(weight):.1f}", **style)
+        else:
+            dot.edge(source, target, **style)
+
+    return dot
+
+
+def render_graph(graph: DependencyGraph, output_path: str = "output/dependency_graph", output_format: str = "png", **options) -> None:
+    """
+    Renders a dependency graph to a file.
+
+    :param graph: Dependency graph (see 'graph.build_graph')
+    :param output_path: Output file path (without extension) for the generated graph (default: 'output/dependency_graph')
+    :param output_format: Graph output format (e.g. 'png', 'svg', 'dot') (default: 'png')
+    :param options: Rendering options of 'to_digraph' (engine, collapse, group_imports, clusters, max_nodes)
+    """
+    dot = to_digraph(graph, output_format=output_format, **options)
+
+    # Backup
+    os.makedirs(os.path.dirname(output_path) or ".", exist_ok=True)
+    dot.render(output_path, cleanup=True)
+    print(f"✅ Generated graph: {output_path}.{output_format}")
+
+
+# Styles of the edges of a diff, drawn over the usual styles of their target kind
+DIFF_EDGE_STYLES = {
+    "added_edges": {
+        "color": "#2E8B57",
+        "penwidth": "2"
+    },
+    "removed_edges": {
+        "color": "#D9534F",
+        "style": "dashed",
+        "penwidth": "2"
+    },
+}
+
+
+def diff_to_digraph(diff: dict, output_format: str = "png", engine: str = "dot") -> "Digraph":
+    """
+    Converts the differences between two revisions into a Graphviz graph, without rendering it.
+
+    Only the edges that changed are drawn: added edges in green, removed edges in red dashed lines.
+    Added, modified and removed files are drawn with a thicker outline.
+
+    :param diff: Differences between two revisions (see 'diff.diff_snapshots')
+    :param output_format: Graph output format (e.g. 'png', 'svg', 'dot') (default: 'png')
+    :param engine: Graphviz layout engine (see 'ENGINES')
+
+    :return: Graphviz directed graph
+    """
+    changed = set(diff["added_files"]) | set(diff["modified_files"]) | set(diff["removed_files"])
+
+    from graphviz import Digraph
+
+    dot = Digraph(comment="Dependency Diff", format=output_format, engine=engine)
+    dot.attr(rankdir='LR')
+
+    nodes = {}
+    for key in DIFF_EDGE_STYLES:
+        for edge in diff[key]:
+            nodes.setdefault(edge["source"], KIND_INTERNAL)
+            nodes.setdefault(edge["target"], KIND_NAMES.index(edge["kind"]))
+
+    for name, kind in nodes.items():
+        attributes = dict(NODE_STYLES[kind])
+        if name in changed:
+            attributes["penwidth"] = "3"
+        dot.node(name, **attributes)
+
+    for key, diff_style in DIFF_EDGE_STYLES.items():
+        for edge in diff[key]:
+            style = dict(EDGE_STYLES[KIND_NAMES.index(edge["kind"])])
+            style.update(diff_style)
+            dot.edge(edge["source"], edge["target"], **style)
+
+    return dot
+
+
+def render_diff(diff: dict, output_path: str = "output/dependency_diff", output_format: str = "png", engine: str = "dot") -> None:
+    """
+    Renders the differences between two revisions to a file (see 'diff_to_digraph').
+
+    :param diff: Differences between two revisions (see 'diff.diff_snapshots')
+    :param output_path: Output file path (without extension) for the generated graph (default: 'output/dependency_diff')
+    :param output_format: Graph output format (e.g. 'png', 'svg', 'dot') (default: 'png')
+    :param engine: Graphviz layout engine (see 'ENGINES')
+    """
+    dot = diff_to_digraph(diff, output_format=output_format, engine=engine)
+
+    # Backup
+    os.makedirs(os.path.dirname(output_path) or ".", exist_ok=True)
+    dot.render(output_path, cleanup=True)
+    print(f"✅ Generated diff graph: {output_path}.{output_format}")
 
 
 def build_dependency_graph(dependencies: dict[str, list[str]], module_map: dict[str, str], project_path: str, output_path: str = "output/dependency_graph", output_format: str = "png") -> None:
@@ -19,73 +285,5 @@ def build_dependency_graph(dependencies: dict[str, list[str]], module_map: dict[
     :param output_path: Output file path (without extension) for the generated graph (default: 'output/dependency_graph')
     :param output_format: Graph output format (e.g. 'png', 'svg', 'dot') (default: 'png')
     """
-    dot = Digraph(comment="Dependency Graph", format=output_format)
-    dot.attr(rankdir='LR')
-
-    # Create nodes for all source files
-    for source in dependencies:
-        dot.node(
-            source,
-            shape="ellipse",
-            style="filled",
-            fillcolor="#ADD8E6",
-            color="#82A2AD",
-            penwidth="1"
-        )
-
-    # For each file and its imports
-    for source, imports in dependencies.items():
-        seen_edges = set()  # To avoid duplicates
-
-        for imp in imports:
-            if is_standard_or_external(imp):  # Standard or external import
-                resolved = imp
-                node_style = {
-                    "shape": "box",
-                    "style": "filled",
-                    "fillcolor": "#FECA66",
-                    "color": "#BF984D",
-                    "penwidth": "1"
-                }
-                edge_style = {
-                    "style": "solid",
-                    "color": "#787878"
-                }
-
-            else:  # Internal import
-                resolved = resolve_module_name(imp, module_map, current_file=source, project_path=project_path)
-                if resolved:
-                    node_style = {
-                        "shape": "ellipse",
-                        "style": "filled",
-                        "fillcolor": "#ADD8E6",
-                        "color": "#82A2AD",
-                        "penwidth": "1"
-                    }
-                    edge_style = {
-                        "style": "solid",
-                        "color": "black"
-                    }
-                else:  # Unknown import
-                    resolved = imp
-                    node_style = {
-                        "shape": "box",
-                        "style": "filled",
-                        "fillcolor": "#F18C8C",
-                        "color": "#B56969",
-                        "penwidth": "1"
-                    }
-                    edge_style = {
-                        "style": "solid",
-                        "color": "#787878"
-                    }
-
-            if resolved != source and (source, resolved) not in seen_edges:
-                dot.node(resolved, **node_style)
-                dot.edge(source, resolved, **edge_style)
-                seen_edges.add((source, resolved))
-
-    # Backup
-    os.makedirs(os.path.dirname(output_path), exist_ok=True)
-    dot.render(output_path, cleanup=True)
-    print(f"✅ Generated graph: {output_path}.{output_format}")
+    graph = build_graph(dependencies, module_map)
+    render_graph(graph, output_path=output_path, output_format=output_format)
@@ -0,0 +1,200 @@
+import heapq
+import sys
+import time
+from contextlib import (contextmanager, nullcontext)
+
+try:
+    import resource
+except ImportError:  # Not available on Windows
+    resource = None
+
+
+def _format_size(size: int) -> str:
+    return f"{size / (1024 * 1024):.1f} MiB"
+
+
+class Profiler:
+    """
+    Records the wall time, the number of calls and optionally the peak memory of the stages of a run,
+    plus free counters and the slowest files to analyse.
+
+    Memory is measured with 'tracemalloc', which slows Python down noticeably: it is only enabled on request.
+    Stages must not be nested when memory is measured, since each stage resets the peak.
+    """
+
+    enabled = True
+
+    def __init__(self, memory: bool = False, slowest: int = 10):
+        """
+        :param memory: True to measure the peak memory allocated by Python during each stage
+        :param slowest: Number of slowest files to keep
+        """
+        self.memory = memory
+        self.slowest = slowest
+        self.stages = {}
+        self.counters = {}
+        self._files = []  # Min-heap of (seconds, relative path)
+        self._start = time.perf_counter()
+        self._tracemalloc = None
+        self._owns_tracemalloc = False
+        if memory:
+            # Imported on request only: 'tracemalloc' loads 'pickle' and 'linecache', which slow the start-up down
+            import tracemalloc
+            self._tracemalloc = tracemalloc
+            self._owns_tracemalloc = not tracemalloc.is_tracing()
+            if self._owns_tracemalloc:
+                tracemalloc.start()
+
+    @contextmanager
+    def stage(self, name: str):
+        """
+        Context manager measuring a stage; a stage entered several times accumulates its time and calls.
+
+        :param name: Name of the stage (e.g. 'parse')
+        """
+        if self.memory:
+            self._tracemalloc.reset_peak()
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - start)
+            if self.memory:
+                entry = self.stages[name]
+                entry["peak_memory"] = max(entry.get("peak_memory", 0), self._tracemalloc.get_traced_memory()[1])
+
+    def record(self, name: str, seconds: float, calls: int = 1) -> None:
+        """
+        Adds a measure taken elsewhere to a stage (e.g. a step timed by the caller itself).
+
+        :param name: Name of the stage
+        :param seconds: Wall time
+        :param calls: Number of calls
+        """
+        entry = self.stages.setdefault(name, {"time": 0.0, "calls": 0})
+        entry["time"] += seconds
+        entry["calls"] += calls
+
+    def count(self, name: str, value: float = 1) -> None:
+        """
+        :param name: Name of the counter (e.g. 'cache_hits', or 'find_spec_time' in seconds for a time that is
+                     already part of the stages)
+        :param value: Value to add
+        """
+        self.counters[name] = self.counters.get(name, 0) + value
+
+    def record_file(self, rel_path: str, seconds: float) -> None:
+        """
+        :param rel_path: Relative path of an analysed file
+        :param seconds: Time spent to analyse it
+        """
+        if len(self._files) < self.slowest:
+            heapq.heappush(self._files, (seconds, rel_path))
+        elif seconds > self._files[0][0]:
+            heapq.heapreplace(self._files, (seconds, rel_path))
+
+    def iter_files(self, stream):
+        """
+        Times each item of a stream of (relative file, result) pairs, such as 'parser.iter_dependencies'.
+
+        The time of a file is the time spent waiting for it: with several worker processes, files finished
+        in the background are returned immediately and only the wait is counted.
+
+        :param stream: Iterator over (relative file, result)
+
+        :return: Iterator over the same items
+        """
+        iterator = iter(stream)
+        while True:
+            start = time.perf_counter()
+            try:
+                item = next(iterator)
+            except StopIteration:
+                return
+            self.record_file(item[0], time.perf_counter() - start)
+            yield item
+
+    def slowest_files(self) -> list[tuple[str, float]]:
+        """
+        :return: (relative path, seconds) of the slowest files, slowest first
+        """
+        return [(rel_path, seconds) for seconds, rel_path in sorted(self._files, reverse=True)]
+
+    def report(self) -> dict:
+        """
+        :return: Measures as a JSON-serialisable dictionary
+        """
+        data = {
+            "total_time": time.perf_counter() - self._start,
+            "stages": self.stages,
+            "counters": self.counters,
+            "slowest_files": [{"file": rel_path, "time": seconds} for rel_path, seconds in self.slowest_files()],
+        }
+        if resource is not None:
+            # Kilobytes on Linux, bytes on macOS
+            max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+            data["max_rss"] = max_rss if sys.platform == "darwin" else max_rss * 1024
+        return data
+
+    def format(self) -> str:
+        """
+        :return: Human-readable report
+        """
+        data = self.report()
+        header = f"📊 Profile: {data['total_time']:.2f} s"
+        if "max_rss" in data:
+            header += f", peak RSS {_format_size(data['max_rss'])}"
+
+        lines = [header, f"  {'stage':<16}{'time':>12}{'calls':>9}" + (f"{'peak memory':>14}" if self.memory else "")]
+        for name, entry in self.stages.items():
+            line = f"  {name:<16}{entry['time'] * 1000:>9.1f} ms{entry['calls']:>9}"
+            if "peak_memory" in entry:
+                line += f"{_format_size(entry['peak_memory']):>14}"
+            lines.append(line)
+
+        if self.counters:
+            lines.append("  " + ", ".join(
+                f"{name}={value:.3f}" if isinstance(value, float) else f"{name}={value}" for name, value in self.counters.items()
+            ))
+
+        if self._files:
+            lines.append(f"  🐢 {len(self._files)} slowest file(s):")
+            for rel_path, seconds in self.slowest_files():
+                lines.append(f"  {seconds * 1000:>9.1f} ms  {rel_path}")
+
+        return "\n".join(lines)
+
+    def close(self) -> None:
+        """
+        Stops the memory measures started by this profiler.
+        """
+        if self._owns_tracemalloc:
+            self._tracemalloc.stop()
+            self._owns_tracemalloc = False
+
+
+class NullProfiler:
+    """
+    Profiler doing nothing, used when no measure is requested: its methods return immediately.
+    """
+
+    enabled = False
+    _context = nullcontext()
+
+    def stage(self, name: str):
+        return self._context
+
+    def record(self, name: str, seconds: float, calls: int = 1) -> None:
+        pass
+
+    def count(self, name: str, value: int = 1) -> None:
+        pass
+
+    def record_file(self, rel_path: str, seconds: float) -> None:
+        pass
+
+    def iter_files(self, stream):
+        return stream
+
+    def close(self) -> None:
+        pass
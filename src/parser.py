@@ -1,107 +1,704 @@
 import ast
 import os
-from collections import defaultdict
+import sys
+from bisect import insort
+from collections import (defaultdict, deque)
+from .cache import (ParseCache, file_digest)
+from .prefetch import (Prefetcher, read_file)
+from .scanner import scan_project
+from .symbols import (EMPTY_SYMBOLS, ImportBinding, ModuleSymbols)
 from .utils import is_standard_or_external
 
 
-def extract_imports_from_file(filepath: str) -> list[str]:
+# Fields through which statements can contain other statements, in the order of 'ast' node definitions
+_BODY_FIELDS = ("body", "handlers", "orelse", "finalbody", "cases")
+
+
+def iter_import_nodes_walk(tree: ast.AST):
+    """
+    Reference extractor: visits every node of the syntax tree.
+
+    :param tree: Syntax tree of a module
+
+    :return: Iterator over the 'Import' and 'ImportFrom' nodes
+    """
+    for node in ast.walk(tree):
+        if isinstance(node, (ast.Import, ast.ImportFrom)):
+            yield node
+
+
+def iter_import_nodes_statements(tree: ast.AST):
+    """
+    Fast extractor: visits statement bodies only ('if', 'try', 'with', 'match', function and class scopes, ...).
+
+    Import statements can never appear inside an expression, so expression subtrees are not visited.
+    Statements are visited breadth-first like 'ast.walk', which keeps the imports in the same order.
+
+    :param tree: Syntax tree of a module
+
+    :return: Iterator over the 'Import' and 'ImportFrom' nodes
+    """
+    todo = deque([tree])
+    while todo:
+        node = todo.popleft()
+
+        if isinstance(node, (ast.Import, ast.ImportFrom)):
+            yield node
+            continue
+
+        for field in _BODY_FIELDS:
+            children = getattr(node, field, None)
+            if isinstance(children, list):
+                todo.extend(children)
+
+
+# Available extraction engines, selected by name
+EXTRACTORS = {
+    "ast": iter_import_nodes_walk,
+    "statements": iter_import_nodes_statements,
+}
+
+
+def extract_imports_from_file(filepath: str, extractor: str = "ast") -> list[str]:
     """
     Analyses a Python file to extract imported modules.
 
     :param filepath: Path to the Python file to be analysed
+    :param extractor: Name of the extraction engine (see 'EXTRACTORS')
+
+    :return: List of imported modules (paths as strings)
+    """
+    with open(filepath, "rb") as f:
+        return extract_imports_from_source(f.read(), filepath, extractor=extractor)
+
+
+def extract_imports_from_source(source: str | bytes, filename: str = "<unknown>", extractor: str = "ast") -> list[str]:
+    """
+    Analyses Python source code to extract imported modules.
+
+    :param source: Source code (raw bytes are decoded according to the encoding declared by the file)
+    :param filename: Name of the file, used in error messages
+    :param extractor: Name of the extraction engine (see 'EXTRACTORS')
 
     :return: List of imported modules (paths as strings)
     """
+    iter_import_nodes = EXTRACTORS[extractor]
+
     # Using 'ast' to transform Python code into a syntax tree
-    with open(filepath, "r", encoding="utf-8") as f:
-        try:
-            tree = ast.parse(f.read(), filename=filepath)
-        except SyntaxError:
-            return []
+    try:
+        tree = ast.parse(source, filename=filename)
+    except (SyntaxError, ValueError):
+        return []
 
     imports = []
 
-    # Traverses all nodes in the tree
-    for node in ast.walk(tree):
+    # Traverses the import nodes of the tree
+    for node in iter_import_nodes(tree):
+        for full_name, _ in _iter_import_names(node):
+            imports.append(full_name)
 
-        # Recording of 'Imports'
-        if isinstance(node, ast.Import):
-            for alias in node.names:
-                imports.append(alias.name)
+    return imports
+
+
+def _iter_import_names(node: ast.Import | ast.ImportFrom):
+    """
+    Flattens an import statement into the imported modules, as listed by 'extract_imports_from_source'.
+
+    :param node: 'Import' or 'ImportFrom' node
 
-        # Recording 'From ... Import ...'
-        elif isinstance(node, ast.ImportFrom):
-            base = node.module if node.module else ""
-            level = node.level if hasattr(node, 'level') else 0
+    :return: Iterator over (imported module, 'alias' node)
+    """
+    # Recording of 'Imports'
+    if isinstance(node, ast.Import):
+        for alias in node.names:
+            yield alias.name, alias
+
+    # Recording 'From ... Import ...'
+    else:
+        base = node.module if node.module else ""
+        level = node.level if hasattr(node, 'level') else 0
+
+        # Reconstruct the path with the points (e.g. .parser = parser with level=1)
+        if level > 0:
+            dots = "." * level
+            base = f"{dots}{base}"
+
+        for alias in node.names:
+            name = alias.name
+            # E.g.: .parser -> .parser.collect_all_dependencies
+            full_name = f"{base}.{name}" if name != "*" else base
+            yield full_name.lstrip("."), alias
+
+
+def _module_definitions(tree: ast.Module) -> tuple[set[str], list[str] | None, bool]:
+    """
+    Collects the names bound at module level, including in 'if', 'try', 'with' and loop blocks.
+
+    :param tree: Syntax tree of a module
+
+    :return: (defined names, literal '__all__' or None, True if the module has a star import)
+    """
+    definitions = set()
+    exports = None
+    star = False
+    todo = deque(tree.body)
+
+    while todo:
+        node = todo.popleft()
 
-            # Reconstruct the path with the points (e.g. .parser = parser with level=1)
-            if level > 0:
-                dots = "." * level
-                base = f"{dots}{base}"
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+            definitions.add(node.name)
+            continue
 
+        if isinstance(node, (ast.Import, ast.ImportFrom)):
             for alias in node.names:
-                name = alias.name
-                # E.g.: .parser -> .parser.collect_all_dependencies
-                full_name = f"{base}.{name}" if name != "*" else base
-                imports.append(full_name.lstrip("."))
+                if alias.name == "*":
+                    star = True
+                elif isinstance(node, ast.Import):
+                    definitions.add(alias.asname or alias.name.partition(".")[0])
+                else:
+                    definitions.add(alias.asname or alias.name)
+            continue
+
+        if isinstance(node, (ast.Assign, ast.AnnAssign, ast.AugAssign)):
+            targets = node.targets if isinstance(node, ast.Assign) else [node.target]
+            for target in targets:
+                for name in ast.walk(target):
+                    if isinstance(name, ast.Name):
+                        definitions.add(name.id)
+
+            # Only literal lists of strings are understood, as static analysers do
+            is_all = any(isinstance(target, ast.Name) and target.id == "__all__" for target in targets)
+            if is_all and isinstance(node.value, (ast.List, ast.Tuple)):
+                names = [item.value for item in node.value.elts if isinstance(item, ast.Constant) and isinstance(item.value, str)]
+                exports = exports + names if isinstance(node, ast.AugAssign) and exports else names
+            continue
+
+        if isinstance(node, (ast.For, ast.AsyncFor)):
+            for name in ast.walk(node.target):
+                if isinstance(name, ast.Name):
+                    definitions.add(name.id)
+        elif isinstance(node, (ast.With, ast.AsyncWith)):
+            for item in node.items:
+                if item.optional_vars is not None:
+                    for name in ast.walk(item.optional_vars):
+                        if isinstance(name, ast.Name):
+                            definitions.add(name.id)
+
+        for field in _BODY_FIELDS:
+            children = getattr(node, field, None)
+            if isinstance(children, list):
+                todo.extend(children)
+
+    return definitions, exports, star
+
+
+def extract_import_lines_from_file(filepath: str, extractor: str = "ast") -> list[tuple[str, int]]:
+    """
+    Analyses a Python file to extract imported modules with the line of their import statement.
+
+    Lines are not kept by the parse cache: this is meant for the few files whose imports are reported.
+
+    :param filepath: Path to the Python file to be analysed
+    :param extractor: Name of the extraction engine (see 'EXTRACTORS')
+
+    :return: List of (imported module, line), in the order of 'extract_imports_from_source'
+    """
+    with open(filepath, "rb") as f:
+        source = f.read()
+
+    try:
+        tree = ast.parse(source, filename=filepath)
+    except (SyntaxError, ValueError):
+        return []
+
+    return [(full_name, node.lineno) for node in EXTRACTORS[extractor](tree) for full_name, _ in _iter_import_names(node)]
+
+
+def extract_symbols_from_source(source: str | bytes, filename: str = "<unknown>") -> tuple[list[str], ModuleSymbols]:
+    """
+    Analyses Python source code to extract imported modules, like 'extract_imports_from_source', together with the
+    top-level symbols of the module (see 'symbols.ModuleSymbols'), from the same syntax tree.
+
+    The whole tree is visited once, to find both the import statements and the names read by the module.
+
+    :param source: Source code (raw bytes are decoded according to the encoding declared by the file)
+    :param filename: Name of the file, used in error messages
+
+    :return: (list of imported modules, symbols of the module)
+    """
+    try:
+        tree = ast.parse(source, filename=filename)
+    except (SyntaxError, ValueError):
+        return [], EMPTY_SYMBOLS
+
+    import_nodes = []
+    used = set()
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Name):
+            if not isinstance(node.ctx, ast.Store):
+                used.add(node.id)
+        elif isinstance(node, (ast.Import, ast.ImportFrom)):
+            import_nodes.append(node)
+
+    definitions, exports, star = _module_definitions(tree)
+    if exports:
+        used.update(exports)
+
+    imports = []
+    bindings = []
+    for node in import_nodes:
+        base = (node.module or "") if isinstance(node, ast.ImportFrom) else None
+
+        for full_name, alias in _iter_import_names(node):
+            imports.append(full_name)
+            if alias.name == "*" or base == "__future__":
+                continue
+
+            name = alias.asname or (alias.name.partition(".")[0] if base is None else alias.name)
+            # 'import x as x' and 'from x import y as y' are explicit re-exports
+            is_used = name in used or alias.asname == alias.name
+            bindings.append(ImportBinding(sys.intern(full_name), base, sys.intern(name), node.lineno, is_used))
+
+    return imports, ModuleSymbols(sorted(sys.intern(name) for name in definitions), exports, bindings, star)
+
+
+def extract_imports_with_cache(full_path: str, rel_path: str, cache: ParseCache, extractor: str = "ast") -> list[str]:
+    """
+    Extracts the imports of a file, reusing the cached result when the file did not change.
+
+    :param full_path: Path to the Python file to be analysed
+    :param rel_path: Path of the file relative to the project, used as cache key
+    :param cache: Parse cache of the project
+    :param extractor: Name of the extraction engine (see 'EXTRACTORS')
+
+    :return: List of imported modules (paths as strings)
+    """
+    stat = os.stat(full_path)
+    imports = cache.lookup(rel_path, stat)
+    if imports is not None:
+        return imports
+
+    with open(full_path, "rb") as f:
+        data = f.read()
+
+    digest = file_digest(data)
+    imports = cache.lookup_content(rel_path, stat, digest)
+    if imports is None:
+        imports = extract_imports_from_source(data, full_path, extractor=extractor)
+        cache.store(rel_path, stat, digest, imports)
 
     return imports
 
 
-def collect_all_dependencies(project_path: str) -> dict[str, list[str]]:
+def extract_symbols_with_cache(full_path: str, rel_path: str, cache: ParseCache | None) -> tuple[list[str], ModuleSymbols]:
+    """
+    Extracts the imports and the symbols of a file, reusing the cached result when the file did not change
+    and its symbols were already collected.
+
+    :param full_path: Path to the Python file to be analysed
+    :param rel_path: Path of the file relative to the project, used as cache key
+    :param cache: Parse cache of the project (optional)
+
+    :return: (list of imported modules, symbols of the module)
+    """
+    if cache is None:
+        with open(full_path, "rb") as f:
+            return extract_symbols_from_source(f.read(), full_path)
+
+    stat = os.stat(full_path)
+    imports = cache.lookup(rel_path, stat, symbols=True)
+    if imports is not None:
+        return imports, ModuleSymbols.from_json(cache.stored_symbols(rel_path))
+
+    with open(full_path, "rb") as f:
+        data = f.read()
+
+    digest = file_digest(data)
+    imports = cache.lookup_content(rel_path, stat, digest, symbols=True)
+    if imports is not None:
+        return imports, ModuleSymbols.from_json(cache.stored_symbols(rel_path))
+
+    imports, module_symbols = extract_symbols_from_source(data, full_path)
+    cache.store(rel_path, stat, digest, imports, symbols=module_symbols)
+    return imports, module_symbols
+
+
+def _extract_batch(batch: list[tuple[str, str | None]], hash_files: bool, extractor: str = "ast", symbols: bool = False) -> list[tuple[list[str] | None, ModuleSymbols | None, str | None, str | None]]:
+    """
+    Worker task: extracts the imports of a batch of files.
+
+    Errors are reported per file so that an unreadable or invalid file does not abort the whole batch.
+
+    :param batch: List of (absolute path, content hash known by the cache or None)
+    :param hash_files: True to compute the content hash of each file (needed by the cache)
+    :param extractor: Name of the extraction engine (see 'EXTRACTORS')
+    :param symbols: True to collect the symbols of each file too (see 'extract_symbols_from_source')
+
+    :return: List of (imports or None if the content matches the known hash, symbols or None, content hash, error message)
+    """
+    results = []
+    for full_path, known_digest in batch:
+        try:
+            with open(full_path, "rb") as f:
+                data = f.read()
+
+            digest = file_digest(data) if hash_files else None
+            if digest is not None and digest == known_digest:
+                results.append((None, None, digest, None))
+            elif symbols:
+                results.append((*extract_symbols_from_source(data, full_path), digest, None))
+            else:
+                results.append((extract_imports_from_source(data, full_path, extractor=extractor), None, digest, None))
+
+        except Exception as e:
+            results.append(([], EMPTY_SYMBOLS if symbols else None, None, f"{type(e).__name__}: {e}"))
+
+    return results
+
+
+def _iter_parallel(project_path: str, files: list[str], cache: ParseCache | None, jobs: int, chunk_size: int, extractor: str, symbols: dict | None):
+    """
+    Extracts the imports of the files with a pool of processes, yielding the results in inventory order.
+
+    Files are sent to the workers by chunks; cache hits are answered without leaving the main process.
+    At most two chunks per worker are in flight, so that results can be consumed while the pool keeps working.
+    If a worker process dies, its chunk is processed again in the main process.
+    """
+    # Imported here: the process pool loads 'multiprocessing', which sequential runs do not need
+    from concurrent.futures import ProcessPoolExecutor
+    from concurrent.futures.process import BrokenProcessPool
+
+    hash_files = cache is not None
+    want_symbols = symbols is not None
+
+    def prepare(chunk):
+        # Splits a chunk between cached results and files that must be read by a worker
+        known, batch = {}, []
+        for rel_path in chunk:
+            full_path = os.path.join(project_path, rel_path)
+            stat = None
+
+            if cache is not None:
+                try:
+                    stat = os.stat(full_path)
+                except OSError:
+                    stat = None
+                imports = cache.lookup(rel_path, stat, symbols=want_symbols) if stat is not None else None
+                if imports is not None:
+                    known[rel_path] = imports
+                    if want_symbols:
+                        symbols[rel_path] = ModuleSymbols.from_json(cache.stored_symbols(rel_path))
+                    continue
+
+            known_digest = cache.stored_digest(rel_path, symbols=want_symbols) if cache is not None else None
+            batch.append((rel_path, stat, (full_path, known_digest)))
+        return known, batch
+
+    def finish(chunk, known, batch, future):
+        tasks = [task for _, _, task in batch]
+        try:
+            results = future.result() if future is not None else _extract_batch(tasks, hash_files, extractor, want_symbols)
+        except BrokenProcessPool:
+            results = _extract_batch(tasks, hash_files, extractor, want_symbols)
+
+        for (rel_path, stat, _), (imports, module_symbols, digest, error) in zip(batch, results):
+            if error is not None:
+                print(f"⚠️ Could not analyse {rel_path}: {error}", file=sys.stderr)
+            elif cache is not None and stat is not None:
+                if imports is None:
+                    imports = cache.lookup_content(rel_path, stat, digest, symbols=want_symbols)
+                    if want_symbols:
+                        module_symbols = ModuleSymbols.from_json(cache.stored_symbols(rel_path))
+                else:
+                    cache.store(rel_path, stat, digest, imports, symbols=module_symbols)
+            known[rel_path] = imports if imports is not None else []
+            if want_symbols:
+                symbols[rel_path] = module_symbols or EMPTY_SYMBOLS
+
+        for rel_path in chunk:
+            yield rel_path, known[rel_path]
+
+    pending = deque()
+
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        for i in range(0, len(files), chunk_size):
+            chunk = files[i:i + chunk_size]
+            known, batch = prepare(chunk)
+
+            future = None
+            if batch:
+                try:
+                    future = executor.submit(_extract_batch, [task for _, _, task in batch], hash_files, extractor, want_symbols)
+                except BrokenProcessPool:
+                    future = None
+            pending.append((chunk, known, batch, future))
+
+            # Results are emitted in order: fully cached chunks at the front are released immediately
+            while len(pending) > 2 * jobs or (pending and not pending[0][2]):
+                yield from finish(*pending.popleft())
+
+        while pending:
+            yield from finish(*pending.popleft())
+
+
+def _iter_prefetched(project_path: str, files: list[str], cache: ParseCache | None, io_threads: int, extractor: str, symbols: dict | None):
+    """
+    Extracts the imports of the files in the main process, while a pool of threads reads the next files.
+
+    With a cache, the files are first examined ahead ('os.stat') and only those whose cached entry is stale are read.
+    The cache itself is only used by the main thread.
+    """
+    def stat(rel_path):
+        return os.stat(os.path.join(project_path, rel_path))
+
+    want_symbols = symbols is not None
+
+    def read(rel_path):
+        return read_file(os.path.join(project_path, rel_path))
+
+    def extract(rel_path, data):
+        full_path = os.path.join(project_path, rel_path)
+        if want_symbols:
+            imports, symbols[rel_path] = extract_symbols_from_source(data, full_path)
+            return imports, symbols[rel_path]
+        return extract_imports_from_source(data, full_path, extractor=extractor), None
+
+    def finish(rel_path, stat_result, imports, future):
+        if future is not None:
+            try:
+                data = future.result()
+            except OSError as e:
+                print(f"⚠️ Could not analyse {rel_path}: {type(e).__name__}: {e}", file=sys.stderr)
+                if want_symbols:
+                    symbols[rel_path] = EMPTY_SYMBOLS
+                return rel_path, []
+
+            if cache is None:
+                return rel_path, extract(rel_path, data)[0]
+
+            digest = file_digest(data)
+            imports = cache.lookup_content(rel_path, stat_result, digest, symbols=want_symbols)
+            if imports is None:
+                imports, module_symbols = extract(rel_path, data)
+                cache.store(rel_path, stat_result, digest, imports, symbols=module_symbols)
+                return rel_path, imports
+
+        if want_symbols:
+            cached = cache.stored_symbols(rel_path) if stat_result is not None else None
+            symbols[rel_path] = ModuleSymbols.from_json(cached) if cached is not None else EMPTY_SYMBOLS
+        return rel_path, imports
+
+    with Prefetcher(io_threads) as prefetcher:
+        if cache is None:
+            for rel_path, future in prefetcher.map(read, files):
+                yield finish(rel_path, None, None, future)
+            return
+
+        # (relative file, stat, cached imports or None, future of the content or None)
+        pending = deque()
+
+        for rel_path, stat_future in prefetcher.map(stat, files):
+            try:
+                stat_result = stat_future.result()
+            except OSError as e:
+                print(f"⚠️ Could not analyse {rel_path}: {type(e).__name__}: {e}", file=sys.stderr)
+                pending.append((rel_path, None, [], None))
+            else:
+                imports = cache.lookup(rel_path, stat_result, symbols=want_symbols)
+                future = prefetcher.submit(read, rel_path) if imports is None else None
+                pending.append((rel_path, stat_result, imports, future))
+
+            # Cached files at the front are released immediately, the others once enough reads are in flight
+            while len(pending) > prefetcher.window or (pending and pending[0][3] is None):
+                yield finish(*pending.popleft())
+
+        while pending:
+            yield finish(*pending.popleft())
+
+
+def iter_dependencies(project_path: str, files: list[str] | None = None, cache: ParseCache | None = None, jobs: int = 1, chunk_size: int = 64, extractor: str = "ast", io_threads: int = 0, symbols: dict | None = None):
+    """
+    Analyses the Python files of a folder one by one, yielding the imports of each file as soon as it is parsed.
+
+    :param project_path: Path to the directory of the project to be analysed
+    :param files: Inventory of Python files relative to the project (see 'scanner.scan_project'),
+                  scanned from 'project_path' if not provided
+    :param cache: Parse cache used to skip unchanged files (optional)
+    :param jobs: Number of worker processes used to parse files (1 = no pool, 0 = one per CPU)
+    :param chunk_size: Number of files sent at once to a worker process
+    :param extractor: Name of the extraction engine (see 'EXTRACTORS')
+    :param io_threads: Number of threads reading the files ahead of the parser, without worker processes
+                       (0 = files are read by the parser itself)
+    :param symbols: Dictionary filled with the symbols of each file (see 'extract_symbols_from_source'),
+                    collected from the same parse as the imports; None to only extract the imports
+
+    :return: Iterator over (relative file, list of imported modules), in inventory order
+    """
+    if files is None:
+        files = scan_project(project_path)
+
+    if jobs == 0:
+        jobs = os.cpu_count() or 1
+
+    if jobs > 1:
+        yield from _iter_parallel(project_path, files, cache, jobs, chunk_size, extractor, symbols)
+        return
+
+    if io_threads > 0:
+        yield from _iter_prefetched(project_path, files, cache, io_threads, extractor, symbols)
+        return
+
+    for rel_path in files:
+        # Obtaining file imports
+        full_path = os.path.join(project_path, rel_path)
+        try:
+            if symbols is not None:
+                imports, symbols[rel_path] = extract_symbols_with_cache(full_path, rel_path, cache)
+            elif cache is None:
+                imports = extract_imports_from_file(full_path, extractor=extractor)
+            else:
+                imports = extract_imports_with_cache(full_path, rel_path, cache, extractor=extractor)
+        except OSError as e:
+            # E.g. deleted since the scan: reported like in the parallel and prefetched analyses
+            print(f"⚠️ Could not analyse {rel_path}: {type(e).__name__}: {e}", file=sys.stderr)
+            imports = []
+            if symbols is not None:
+                symbols[rel_path] = EMPTY_SYMBOLS
+        yield rel_path, imports
+
+
+def collect_all_dependencies(project_path: str, files: list[str] | None = None, cache: ParseCache | None = None, jobs: int = 1, chunk_size: int = 64, extractor: str = "ast", io_threads: int = 0, symbols: dict | None = None) -> dict[str, list[str]]:
     """
     Analyses all Python files in a folder to build a dependency map for each file.
 
     :param project_path: Path to the directory of the project to be analysed
+    :param files: Inventory of Python files relative to the project (see 'scanner.scan_project'),
+                  scanned from 'project_path' if not provided
+    :param cache: Parse cache used to skip unchanged files (optional)
+    :param jobs: Number of worker processes used to parse files (1 = no pool, 0 = one per CPU)
+    :param chunk_size: Number of files sent at once to a worker process
+    :param extractor: Name of the extraction engine (see 'EXTRACTORS')
+    :param io_threads: Number of threads reading the files ahead of the parser, without worker processes
+                       (0 = files are read by the parser itself)
+    :param symbols: Dictionary filled with the symbols of each file (see 'extract_symbols_from_source'),
+                    collected from the same parse as the imports; None to only extract the imports
 
-    :return: Relative file dictionary -> list of imported modules
+    :return: Relative file dictionary -> list of imported modules, in inventory order
     """
-    dependencies = {}
+    return dict(iter_dependencies(project_path, files=files, cache=cache, jobs=jobs, chunk_size=chunk_size, extractor=extractor, io_threads=io_threads, symbols=symbols))
 
-    # Browse all subfolders of the folder passed as a parameter
-    for root, _, files in os.walk(project_path):
-        for file in files:
-            # Processing Python files
-            if file.endswith(".py"):
-                # Calculating the absolute path and the relative path to the project
-                full_path = os.path.join(root, file)
-                rel_path = os.path.relpath(full_path, project_path)
 
-                # Obtaining file imports and storing them in the dictionary
-                imports = extract_imports_from_file(full_path)
-                dependencies[rel_path] = imports
+def module_names_for_file(project_path: str, rel_path: str) -> list[str]:
+    """
+    Lists the internal module names under which a Python file can be imported.
+
+    :param project_path: Path to the project directory
+    :param rel_path: Path of the file relative to the project (e.g. 'helpers/math.py')
+
+    :return: Module names (e.g. ['helpers.math', 'helpers.math'] without the standard 'math')
+    """
+    full_path = os.path.join(project_path, rel_path)
+
+    module_name = os.path.splitext(rel_path)[0].replace(os.sep, ".")
 
-    return dependencies
+    short_name = os.path.splitext(os.path.basename(rel_path))[0]
+    base_folder = os.path.basename(os.path.dirname(full_path))
+    with_base = f"{base_folder}.{short_name}"
 
+    return [name for name in (module_name, short_name, with_base) if not is_standard_or_external(name)]
 
-def build_module_map(project_path: str) -> dict[str, list[str]]:
+
+def import_prefixes(imports: list[str]) -> set[str]:
+    """
+    Lists the module names consulted to resolve imports (see 'utils.ModuleResolver'): an import can only resolve
+    differently if the files of one of these names changed.
+
+    :param imports: Imported modules (e.g. ['helpers.math'])
+
+    :return: Imports and their dotted prefixes (e.g. {'helpers', 'helpers.math'})
+    """
+    prefixes = set()
+    for imp in imports:
+        parts = imp.split(".")
+        prefixes.update(".".join(parts[:i]) for i in range(1, len(parts) + 1))
+    return prefixes
+
+
+def build_module_map(project_path: str, files: list[str] | None = None) -> dict[str, list[str]]:
     """
     Creates a correspondence between internal module names and Python files in the project.
 
     :param project_path: Path to the project directory
+    :param files: Inventory of Python files relative to the project (see 'scanner.scan_project'),
+                  scanned from 'project_path' if not provided
 
     :return: Dictionary module_name -> list of relative paths to the corresponding files
     """
+    if files is None:
+        files = scan_project(project_path)
+
     module_map = defaultdict(list)
 
-    for root, _, files in os.walk(project_path):
-        for file in files:
-            if file.endswith(".py"):
-                full_path = os.path.join(root, file)
-                rel_path = os.path.relpath(full_path, project_path)
+    for rel_path in files:
+        for name in module_names_for_file(project_path, rel_path):
+            module_map[name].append(rel_path)
+
+    return dict(module_map)
+
+
+def build_partial_module_map(project_path: str, files: list[str], names) -> dict[str, list[str]]:
+    """
+    Builds the part of the module map covering the given module names only, as 'build_module_map' would.
+
+    A module name always ends with the name of its file, so only the files with a matching name are examined.
 
-                module_name = os.path.splitext(rel_path)[0].replace(os.sep, ".")
+    :param project_path: Path to the project directory
+    :param files: Inventory of Python files relative to the project (see 'scanner.scan_project')
+    :param names: Iterable of module names (e.g. 'helpers.math')
 
-                short_name = os.path.splitext(file)[0]
-                base_folder = os.path.basename(os.path.dirname(full_path))
-                with_base = f"{base_folder}.{short_name}"
+    :return: Dictionary module_name -> list of relative paths, for the names that match at least one file
+    """
+    wanted = defaultdict(set)
+    for name in names:
+        wanted[name.rpartition(".")[2]].add(name)
 
-                def add(name):
-                    if not is_standard_or_external(name):
-                        module_map[name].append(rel_path)
+    module_map = defaultdict(list)
 
-                add(module_name)
-                add(short_name)
-                add(with_base)
+    for rel_path in files:
+        short_name = os.path.splitext(os.path.basename(rel_path))[0]
+        if short_name not in wanted:
+            continue
+        for name in module_names_for_file(project_path, rel_path):
+            if name in wanted[short_name]:
+                module_map[name].append(rel_path)
 
     return dict(module_map)
+
+
+def add_file_to_module_map(module_map: dict[str, list[str]], project_path: str, rel_path: str) -> None:
+    """
+    Registers a new file in a module map built by 'build_module_map', keeping the paths of each name sorted.
+
+    :param module_map: Module map to be updated in place
+    :param project_path: Path to the project directory
+    :param rel_path: Path of the file relative to the project
+    """
+    for name in module_names_for_file(project_path, rel_path):
+        insort(module_map.setdefault(name, []), rel_path)
+
+
+def remove_file_from_module_map(module_map: dict[str, list[str]], project_path: str, rel_path: str) -> None:
+    """
+    Removes a deleted file from a module map built by 'build_module_map'.
+
+    :param module_map: Module map to be updated in place
+    :param project_path: Path to the project directory
+    :param rel_path: Path of the file relative to the project
+    """
+    for name in set(module_names_for_file(project_path, rel_path)):
+        paths = [path for path in module_map.get(name, []) if path != rel_path]
+        if paths:
+            module_map[name] = paths
+        else:
+            module_map.pop(name, None)
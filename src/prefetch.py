@@ -0,0 +1,101 @@
+import mmap
+import os
+from collections import deque
+
+
+# Files at least this large are mapped in memory instead of being copied by 'read'
+MMAP_THRESHOLD = 1024 * 1024
+
+
+def read_file(path: str, mmap_threshold: int = MMAP_THRESHOLD) -> bytes | mmap.mmap:
+    """
+    Reads a whole file, in a single system call for usual sizes.
+
+    Large files are mapped in memory, and the kernel is asked to load them at once ('MADV_WILLNEED'),
+    so that the pages are read by the calling thread rather than faulted in later by the parser.
+
+    :param path: Path to the file
+    :param mmap_threshold: Size from which the file is mapped in memory
+
+    :return: Content of the file, as bytes or as a read-only memory map (both accepted by 'ast.parse' and 'hashlib')
+    """
+    fd = os.open(path, os.O_RDONLY | getattr(os, "O_BINARY", 0))
+    try:
+        size = os.fstat(fd).st_size
+        if size >= mmap_threshold > 0:
+            data = mmap.mmap(fd, 0, access=mmap.ACCESS_READ)
+            if hasattr(mmap, "MADV_WILLNEED"):
+                data.madvise(mmap.MADV_WILLNEED)
+            return data
+
+        # Asking for one more byte tells at once whether the file grew since 'fstat'
+        data = os.read(fd, size + 1)
+        if len(data) == size:
+            return data
+
+        chunks = [data]
+        while chunk := os.read(fd, 64 * 1024):
+            chunks.append(chunk)
+        return b"".join(chunks)
+    finally:
+        os.close(fd)
+
+
+class Prefetcher:
+    """
+    Pool of threads running I/O calls ahead of their consumer, such as reading the files to parse.
+
+    Threads only wait for the file system: on network file systems, where each call costs a round trip,
+    several requests are in flight while the main thread parses. The number of results waiting to be consumed
+    is bounded by 'window', which bounds the memory held by files read in advance.
+    """
+
+    def __init__(self, threads: int, window: int | None = None):
+        """
+        :param threads: Number of I/O threads
+        :param window: Number of calls started ahead of the consumer (default: 4 per thread)
+        """
+        # Imported here: the pool pulls in logging and threading, which runs without read-ahead do not need
+        from concurrent.futures import ThreadPoolExecutor
+
+        self.window = window or 4 * threads
+        self._executor = ThreadPoolExecutor(max_workers=threads, thread_name_prefix="depviz-io")
+
+    def submit(self, function, *args):
+        """
+        :param function: I/O function
+        :param args: Arguments of the function
+
+        :return: Future of the call
+        """
+        return self._executor.submit(function, *args)
+
+    def map(self, function, items):
+        """
+        Calls a function on each item, at most 'window' items ahead of the consumer.
+
+        :param function: I/O function taking an item
+        :param items: Iterable of items
+
+        :return: Iterator over (item, future of the call), in the order of the items
+        """
+        pending = deque()
+        for item in items:
+            pending.append((item, self._executor.submit(function, item)))
+            if len(pending) > self.window:
+                yield pending.popleft()
+
+        while pending:
+            yield pending.popleft()
+
+    def close(self) -> None:
+        """
+        Cancels the calls not started yet and waits for the running ones.
+        """
+        self._executor.shutdown(wait=True, cancel_futures=True)
+
+    def __enter__(self) -> "Prefetcher":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
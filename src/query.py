@@ -0,0 +1,155 @@
+import json
+import os
+import sys
+from array import array
+from collections import deque
+from .graph import (KIND_INTERNAL, DependencyGraph)
+
+
+INDEX_FILENAME = "index.bin"
+
+# First line of an index file, to be changed whenever its layout changes
+_MAGIC = b"DEPVIZ-INDEX 1\n"
+
+
+def save_index(graph: DependencyGraph, path: str, project_path: str) -> None:
+    """
+    Saves a dependency graph with its reversed adjacency, so that queries can be answered without scanning again.
+
+    The file holds a JSON header line, followed by the node names and the raw arrays of both adjacencies,
+    which are loaded back without any parsing.
+
+    :param graph: Dependency graph (see 'graph.build_graph')
+    :param path: Path of the index file
+    :param project_path: Path of the analysed project, recorded in the header
+    """
+    reverse = graph.reverse()
+    names = "\n".join(graph.names).encode("utf-8")
+    blobs = [names, graph.kinds.tobytes(), graph.offsets.tobytes(), graph.targets.tobytes(), reverse.offsets.tobytes(), reverse.targets.tobytes()]
+    header = {
+        "project": project_path,
+        "byteorder": sys.byteorder,
+        "nodes": graph.node_count,
+        "edges": graph.edge_count,
+        "sizes": [len(blob) for blob in blobs],
+    }
+
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, "wb") as f:
+        f.write(_MAGIC)
+        f.write(json.dumps(header).encode("utf-8") + b"\n")
+        for blob in blobs:
+            f.write(blob)
+
+
+def load_index(path: str) -> tuple[DependencyGraph, dict]:
+    """
+    Loads an index saved by 'save_index'.
+
+    :param path: Path of the index file
+
+    :return: (dependency graph, whose 'reverse()' is already available, header of the index)
+
+    :raises ValueError: If the file is not an index of a supported version
+    """
+    with open(path, "rb") as f:
+        if f.readline() != _MAGIC:
+            raise ValueError(f"not a depviz index: {path}")
+        header = json.loads(f.readline())
+        blobs = [f.read(size) for size in header["sizes"]]
+
+    names = blobs[0].decode("utf-8").split("\n") if header["nodes"] else []
+    arrays = []
+    for typecode, blob in zip("bqiqi", blobs[1:]):
+        values = array(typecode)
+        values.frombytes(blob)
+        if header["byteorder"] != sys.byteorder:
+            values.byteswap()
+        arrays.append(values)
+
+    kinds, offsets, targets, reverse_offsets, reverse_targets = arrays
+    graph = DependencyGraph(names, kinds, offsets, targets)
+    graph.attach_reverse(reverse_offsets, reverse_targets)
+    return graph, header
+
+
+def find_nodes(graph: DependencyGraph, module: str) -> list[int]:
+    """
+    Finds the nodes designated by a module given on the command line.
+
+    The module can be a project file ('helpers/math.py') or its dotted name ('helpers.math'), an imported module
+    ('os', which also covers the imports of its submodules such as 'os.path'), or the end of the dotted name
+    of project files ('math' for 'helpers/math.py').
+
+    :param graph: Dependency graph
+    :param module: File path or module name
+
+    :return: Ids of the matching nodes (empty if none)
+    """
+    dotted_path = module.replace(".", os.sep)
+    for name in (module.replace("/", os.sep), dotted_path + ".py", os.path.join(dotted_path, "__init__.py")):
+        node = graph.id(name)
+        if node is not None and graph.kinds[node] == KIND_INTERNAL:
+            return [node]
+
+    names, kinds = graph.names, graph.kinds
+    prefix = module + "."
+    nodes = [node for node, name in enumerate(names) if kinds[node] != KIND_INTERNAL and (name == module or name.startswith(prefix))]
+    if nodes:
+        return nodes
+
+    suffix = os.sep + dotted_path + ".py"
+    return [node for node, name in enumerate(names) if kinds[node] == KIND_INTERNAL and (os.sep + name).endswith(suffix)]
+
+
+def traverse(graph: DependencyGraph, starts: list[int], depth: int | None = None) -> list[tuple[int, int]]:
+    """
+    Breadth-first traversal of the graph from a set of nodes.
+
+    :param graph: Dependency graph (use 'graph.reverse()' to follow the dependents)
+    :param starts: Ids of the start nodes
+    :param depth: Maximum distance from the start nodes (None for the transitive closure)
+
+    :return: (node id, distance) of the reached nodes, start nodes excluded, by increasing distance
+    """
+    offsets, targets = graph.offsets, graph.targets
+    distances = dict.fromkeys(starts, 0)
+    queue = deque(starts)
+    reached = []
+
+    while queue:
+        node = queue.popleft()
+        distance = distances[node] + 1
+        if depth is not None and distance > depth:
+            continue
+
+        for i in range(offsets[node], offsets[node + 1]):
+            target = targets[i]
+            if target not in distances:
+                distances[target] = distance
+                reached.append((target, distance))
+                queue.append(target)
+
+    return reached
+
+
+def query(graph: DependencyGraph, module: str, reverse: bool = False, depth: int | None = None) -> list[dict] | None:
+    """
+    Lists the dependencies, or the dependents, of a module.
+
+    :param graph: Dependency graph
+    :param module: File path or module name (see 'find_nodes')
+    :param reverse: True for the files that depend on the module, False for the modules it depends on
+    :param depth: Maximum distance (None for the transitive closure, 1 for the direct ones only)
+
+    :return: Reached nodes {'name', 'kind', 'depth'} sorted by depth then name, or None if the module is unknown
+    """
+    starts = find_nodes(graph, module)
+    if not starts:
+        return None
+
+    reached = traverse(graph.reverse() if reverse else graph, starts, depth=depth)
+    return [
+        {"name": graph.names[node], "kind": graph.kind_name(node), "depth": distance}
+        for node, distance in sorted(reached, key=lambda entry: (entry[1], graph.names[entry[0]]))
+    ]
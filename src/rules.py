@@ -0,0 +1,227 @@
+import fnmatch
+import json
+import os
+import re
+from array import array
+from collections import defaultdict
+from typing import NamedTuple
+from .classifier import ModuleClassifier
+from .graph import (DependencyGraph, resolve_import)
+from .parser import extract_import_lines_from_file
+from .utils import ModuleResolver
+
+
+FORBIDDEN = "forbidden"
+ALLOWED = "allowed"
+
+
+class Rule(NamedTuple):
+    """
+    Constraint on the edges leaving a group of modules.
+    """
+    kind: str                  # FORBIDDEN: the edges to 'targets' are violations; ALLOWED: only those edges are permitted
+    source: str                # Name of the constrained group
+    targets: tuple[str, ...]   # Names of the groups
+    reason: str | None         # Explanation displayed with the violations (optional)
+
+
+class RuleSet:
+    """
+    Architecture rules over groups of modules, checked against a resolved dependency graph.
+
+    A group is a list of glob patterns, matched against the node names: the path of internal files with '/'
+    separators (e.g. 'src/parser.py', 'app/core/*'), the module name for the other nodes (e.g. 'graphviz',
+    'numpy.*'). '*' also matches '/'. A node belongs to the first group, in declaration order, that matches it;
+    nodes matching no group are not constrained.
+
+    - forbidden rules report every edge from the source group to one of the target groups;
+    - allowed rules report every edge from the source group to another group that is not listed (edges inside
+      the group and to ungrouped nodes are permitted).
+    """
+
+    def __init__(self, groups: dict[str, list[str]], rules: list[Rule]):
+        """
+        :param groups: Dictionary group name -> glob patterns, in order of precedence
+        :param rules: Rules over the groups
+
+        :raises ValueError: If a rule refers to an unknown group
+        """
+        for rule in rules:
+            for group in (rule.source,) + rule.targets:
+                if group not in groups:
+                    raise ValueError(f"unknown group in a {rule.kind} rule: '{group}'")
+
+        self.groups = groups
+        self.rules = rules
+        self._names = list(groups)
+
+        # All the globs are merged into a single regular expression, whose named alternatives are the groups
+        # ('fnmatch' itself may use groups named 'g<n>')
+        alternatives = [
+            f"(?P<group_{i}>{'|'.join(fnmatch.translate(pattern) for pattern in patterns)})"
+            for i, patterns in enumerate(groups.values()) if patterns
+        ]
+        self._regex = re.compile("|".join(alternatives)) if alternatives else None
+
+        # Verdict of each pair of groups: index of the violated rule, or None
+        count = len(self._names)
+        index = {name: i for i, name in enumerate(self._names)}
+        self._verdicts = [[None] * count for _ in range(count)]
+        for position, rule in enumerate(rules):
+            row = self._verdicts[index[rule.source]]
+            targets = {index[target] for target in rule.targets}
+            for target in range(count):
+                if rule.kind == FORBIDDEN:
+                    violated = target in targets
+                else:
+                    violated = target not in targets and target != index[rule.source]
+                if violated and row[target] is None:
+                    row[target] = position
+
+        # Groups without any rule are skipped by 'check' without looking at their edges
+        self._rows = [row if any(verdict is not None for verdict in row) else None for row in self._verdicts]
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "RuleSet":
+        """
+        :param data: Rules decoded from JSON:
+                     {"groups": {name: [patterns]}, "forbidden": [{"from": group, "to": [groups], "reason": ...}],
+                      "allowed": [...]}, where "to" may also be a single group name
+
+        :return: Rule set
+
+        :raises ValueError: If the rules are malformed
+        """
+        if not isinstance(data, dict) or not isinstance(data.get("groups"), dict):
+            raise ValueError("the rules must be an object with a 'groups' object")
+
+        groups = {}
+        for name, patterns in data["groups"].items():
+            patterns = [patterns] if isinstance(patterns, str) else patterns
+            if not isinstance(patterns, list) or not all(isinstance(pattern, str) for pattern in patterns):
+                raise ValueError(f"the patterns of the group '{name}' must be a list of strings")
+            groups[name] = patterns
+
+        rules = []
+        for kind in (FORBIDDEN, ALLOWED):
+            for entry in data.get(kind, []):
+                if not isinstance(entry, dict) or "from" not in entry or "to" not in entry:
+                    raise ValueError(f"each {kind} rule must have 'from' and 'to' groups")
+                targets = [entry["to"]] if isinstance(entry["to"], str) else entry["to"]
+                rules.append(Rule(kind, entry["from"], tuple(targets), entry.get("reason")))
+
+        return cls(groups, rules)
+
+    @classmethod
+    def load(cls, path: str) -> "RuleSet":
+        """
+        :param path: Path of a JSON rules file (see 'from_dict')
+
+        :return: Rule set
+
+        :raises OSError: If the file cannot be read
+        :raises ValueError: If the file is not valid JSON or the rules are malformed
+        """
+        with open(path, "r", encoding="utf-8") as f:
+            return cls.from_dict(json.load(f))
+
+    def _group_index(self, name: str) -> int:
+        match = self._regex.match(name.replace(os.sep, "/")) if self._regex is not None else None
+        return int(match.lastgroup.rpartition("_")[2]) if match else -1
+
+    def group_of(self, name: str) -> str | None:
+        """
+        :param name: Name of a node (file path or module name)
+
+        :return: Name of its group, or None if no group matches it
+        """
+        group = self._group_index(name)
+        return self._names[group] if group >= 0 else None
+
+    def check(self, graph: DependencyGraph) -> list[dict]:
+        """
+        Finds the edges of the graph that violate the rules.
+
+        Each node is matched once against the groups; the edges are then checked in a single pass, with a lookup
+        in the table of verdicts between groups.
+
+        :param graph: Dependency graph (see 'graph.build_graph')
+
+        :return: Violations {'file', 'target', 'from', 'to', 'rule', 'reason'}, in the order of the edges
+                 ('rule' is FORBIDDEN or ALLOWED)
+        """
+        groups = array("i", map(self._group_index, graph.names))
+        rows = self._rows
+
+        violations = []
+        offsets, targets, names = graph.offsets, graph.targets, graph.names
+        for source in range(graph.node_count):
+            row = rows[groups[source]] if groups[source] >= 0 else None
+            if row is None:
+                continue
+
+            seen = set()
+            for i in range(offsets[source], offsets[source + 1]):
+                target = targets[i]
+                group = groups[target]
+                if group < 0 or row[group] is None or target in seen:
+                    continue
+                seen.add(target)
+                rule = self.rules[row[group]]
+                violations.append({
+                    "file": names[source],
+                    "target": names[target],
+                    "from": self._names[groups[source]],
+                    "to": self._names[group],
+                    "rule": rule.kind,
+                    "reason": rule.reason,
+                })
+        return violations
+
+
+def locate_violations(violations: list[dict], project_path: str, resolver: ModuleResolver, classifier: ModuleClassifier | None = None, extractor: str = "ast") -> None:
+    """
+    Adds the lines of the import statements behind each violation, under 'lines'.
+
+    Only the files with violations are parsed again, since the parse cache does not keep the lines.
+
+    :param violations: Violations found by 'RuleSet.check', updated in place
+    :param project_path: Path to the project directory
+    :param resolver: Resolver of the internal modules, the one used to build the graph
+    :param classifier: Stdlib/external classifier (default: the shared one)
+    :param extractor: Name of the extraction engine (see 'parser.EXTRACTORS')
+    """
+    by_file = defaultdict(list)
+    for violation in violations:
+        by_file[violation["file"]].append(violation)
+
+    for file, entries in by_file.items():
+        lines = defaultdict(list)
+        try:
+            imports = extract_import_lines_from_file(os.path.join(project_path, file), extractor=extractor)
+        except OSError:
+            imports = []
+        for imp, line in imports:
+            lines[resolve_import(imp, file, resolver, classifier)[0]].append(line)
+
+        for violation in entries:
+            violation["lines"] = sorted(set(lines.get(violation["target"], [])))
+
+
+def format_violations(violations: list[dict]) -> str:
+    """
+    :param violations: Violations found by 'RuleSet.check', with their lines (see 'locate_violations')
+
+    :return: Human-readable report, one line per import statement
+    """
+    if not violations:
+        return "✅ No architecture rule violated."
+
+    lines = [f"🚧 {len(violations)} dependency(ies) violating the architecture rules:"]
+    for violation in violations:
+        rule = f"{violation['from']} -> {violation['to']}, {'forbidden' if violation['rule'] == FORBIDDEN else 'not allowed'}"
+        reason = f": {violation['reason']}" if violation["reason"] else ""
+        for line in violation.get("lines") or [None]:
+            location = f"{violation['file']}:{line}" if line is not None else violation["file"]
+            lines.append(f"  ❌ {location}: imports {violation['target']} ({rule}){reason}")
+    return "\n".join(lines)
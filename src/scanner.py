@@ -0,0 +1,197 @@
+import fnmatch
+import os
+import re
+
+
+# Directories that never contain project sources worth analysing
+DEFAULT_IGNORE_PATTERNS = [
+    ".git",
+    ".hg",
+    ".svn",
+    "__pycache__",
+    ".venv",
+    "venv",
+    ".tox",
+    ".nox",
+    ".mypy_cache",
+    ".pytest_cache",
+    ".ruff_cache",
+    ".depviz_cache",
+    "node_modules",
+    "build",
+    "dist",
+    "*.egg-info",
+]
+
+
+class IgnoreRules:
+    """
+    Precompiled set of ignore globs, in a simplified '.gitignore' syntax.
+
+    Patterns without a slash are matched against the entry name at any depth (e.g. 'build', '*.egg-info').
+    Patterns containing a slash are anchored to the directory that declared them (e.g. '/docs', 'src/generated').
+    A trailing slash restricts the pattern to directories. Negated patterns ('!keep.py') are not supported and ignored.
+    """
+
+    def __init__(self, patterns: list[str] | None = None):
+        self._name_patterns = {False: [], True: []}
+        self._path_patterns = {False: [], True: []}
+        self._name_regex = {}
+        self._path_regex = {}
+
+        for pattern in patterns or []:
+            self.add(pattern)
+
+    def add(self, pattern: str, base: str = "") -> None:
+        """
+        Adds a pattern to the rules.
+
+        :param pattern: Glob pattern, in '.gitignore' syntax
+        :param base: Relative directory (with '/' separators) the pattern is anchored to, for nested '.gitignore' files
+        """
+        pattern = pattern.strip()
+        if not pattern or pattern.startswith("#") or pattern.startswith("!"):
+            return
+
+        dir_only = pattern.endswith("/")
+        pattern = pattern.rstrip("/")
+        if not pattern:
+            return
+
+        if "/" in pattern:
+            pattern = pattern.lstrip("/")
+            if base:
+                pattern = f"{base}/{pattern}"
+            self._path_patterns[dir_only].append(pattern)
+        else:
+            self._name_patterns[dir_only].append(pattern)
+
+        # Invalidate the compiled expressions
+        self._name_regex.clear()
+        self._path_regex.clear()
+
+    def extend(self, other: "IgnoreRules") -> "IgnoreRules":
+        """
+        Returns a new set of rules combining these rules with another one.
+
+        :param other: Rules to be added
+
+        :return: Combined rules
+        """
+        combined = IgnoreRules()
+        for source in (self, other):
+            for dir_only in (False, True):
+                combined._name_patterns[dir_only].extend(source._name_patterns[dir_only])
+                combined._path_patterns[dir_only].extend(source._path_patterns[dir_only])
+        return combined
+
+    def matches(self, name: str, rel_path: str, is_dir: bool) -> bool:
+        """
+        Checks whether an entry is ignored.
+
+        :param name: Name of the entry (e.g. 'venv')
+        :param rel_path: Path of the entry relative to the project root, with '/' separators (e.g. 'src/venv')
+        :param is_dir: True if the entry is a directory
+
+        :return: True if the entry must be skipped
+        """
+        name_regex = self._compiled(self._name_regex, self._name_patterns, is_dir)
+        if name_regex is not None and name_regex.match(name):
+            return True
+
+        path_regex = self._compiled(self._path_regex, self._path_patterns, is_dir)
+        return path_regex is not None and path_regex.match(rel_path) is not None
+
+    @staticmethod
+    def _compiled(cache: dict, patterns: dict, is_dir: bool):
+        # All the globs are merged into a single regular expression, compiled once
+        if is_dir not in cache:
+            active = patterns[False] + (patterns[True] if is_dir else [])
+            cache[is_dir] = re.compile("|".join(fnmatch.translate(p) for p in active)) if active else None
+        return cache[is_dir]
+
+
+def read_gitignore(directory: str, base: str = "") -> IgnoreRules | None:
+    """
+    Loads the '.gitignore' file of a directory, if any.
+
+    :param directory: Absolute path of the directory
+    :param base: Path of the directory relative to the project root, with '/' separators
+
+    :return: Rules declared by the file, or None if there is no readable '.gitignore'
+    """
+    try:
+        with open(os.path.join(directory, ".gitignore"), "r", encoding="utf-8") as f:
+            lines = f.read().splitlines()
+    except (OSError, UnicodeDecodeError):
+        return None
+
+    rules = IgnoreRules()
+    for line in lines:
+        rules.add(line, base=base)
+    return rules
+
+
+def scan_project(project_path: str, ignore_patterns: list[str] | None = None, use_gitignore: bool = True, directories: list[str] | None = None) -> list[str]:
+    """
+    Lists the Python files of a project in a single directory traversal.
+
+    The traversal uses 'os.scandir' so that file types come from the directory listing itself, and ignored
+    directories (virtual environments, VCS metadata, build output, '.gitignore' entries) are never entered.
+
+    :param project_path: Path to the project directory
+    :param ignore_patterns: Additional glob patterns to ignore (default patterns are always applied)
+    :param use_gitignore: True to honour the '.gitignore' files found in the project
+    :param directories: If provided, list filled with the browsed folders, relative to the project root ('' for the root)
+
+    :return: Sorted list of the Python files, relative to the project root
+    """
+    rules = IgnoreRules(DEFAULT_IGNORE_PATTERNS + list(ignore_patterns or []))
+    files = []
+
+    # Each stack entry: absolute directory, relative directory ('/' separators), rules in effect
+    stack = [(project_path, "", rules)]
+    while stack:
+        directory, rel_dir, dir_rules = stack.pop()
+
+        try:
+            with os.scandir(directory) as it:
+                entries = list(it)
+        except OSError:
+            continue
+
+        names = {entry.name for entry in entries}
+
+        # Virtual environments can have any name: they are recognised by their marker file
+        if "pyvenv.cfg" in names and rel_dir:
+            continue
+
+        if directories is not None:
+            directories.append(rel_dir.replace("/", os.sep))
+
+        if use_gitignore and ".gitignore" in names:
+            local_rules = read_gitignore(directory, base=rel_dir)
+            if local_rules is not None:
+                dir_rules = dir_rules.extend(local_rules)
+
+        subdirs = []
+        for entry in entries:
+            rel_entry = f"{rel_dir}/{entry.name}" if rel_dir else entry.name
+
+            try:
+                is_dir = entry.is_dir(follow_symlinks=False)
+            except OSError:
+                continue
+
+            if dir_rules.matches(entry.name, rel_entry, is_dir):
+                continue
+
+            if is_dir:
+                subdirs.append((entry.path, rel_entry, dir_rules))
+            elif entry.name.endswith(".py"):
+                files.append(rel_entry.replace("/", os.sep))
+
+        # Reverse order so that directories are popped alphabetically
+        stack.extend(sorted(subdirs, reverse=True))
+
+    return sorted(files)
@@ -0,0 +1,143 @@
+import json
+import os
+from .cache import (ParseCache, file_digest)
+from .parser import extract_imports_from_source
+from .scanner import scan_project
+
+
+# To be incremented whenever the layout of the snapshot files changes
+SNAPSHOT_VERSION = 1
+
+
+class Snapshot:
+    """
+    Imports and content hash of each file of a project at a given time (e.g. a commit), saved as JSON.
+
+    A snapshot is enough to compare two revisions without their checkouts, and lets a later analysis skip
+    the files whose content did not change.
+    """
+
+    def __init__(self, project_path: str, files: dict[str, tuple[str | None, list[str]]]):
+        """
+        :param project_path: Absolute path of the analysed project
+        :param files: Relative file dictionary -> (content hash or None if unknown, list of imported modules)
+        """
+        self.project_path = project_path
+        self.files = files
+
+    @property
+    def dependencies(self) -> dict[str, list[str]]:
+        """
+        Relative file dictionary -> list of imported modules, in inventory order.
+        """
+        return {rel_path: imports for rel_path, (_, imports) in self.files.items()}
+
+    def digest(self, rel_path: str) -> str | None:
+        """
+        :param rel_path: Path of the file relative to the project
+
+        :return: Content hash of the file, or None if the file or its hash is unknown
+        """
+        entry = self.files.get(rel_path)
+        return entry[0] if entry else None
+
+    def save(self, path: str) -> None:
+        """
+        :param path: Path of the JSON snapshot file
+        """
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        data = {
+            "version": SNAPSHOT_VERSION,
+            "project": self.project_path,
+            "files": {rel_path: [digest, imports] for rel_path, (digest, imports) in self.files.items()},
+        }
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(data, f)
+
+    @classmethod
+    def load(cls, path: str) -> "Snapshot":
+        """
+        :param path: Path of a JSON snapshot file written by 'save'
+
+        :return: Loaded snapshot
+
+        :raises ValueError: If the file is not a snapshot of a supported version
+        """
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+
+        if not isinstance(data, dict) or data.get("version") != SNAPSHOT_VERSION:
+            raise ValueError(f"not a depviz snapshot (version {SNAPSHOT_VERSION}): {path}")
+
+        files = {rel_path: (digest, imports) for rel_path, (digest, imports) in data["files"].items()}
+        return cls(data["project"], files)
+
+
+def take_snapshot(project_path: str, files: list[str] | None = None, dependencies: dict[str, list[str]] | None = None, cache: ParseCache | None = None, reference: Snapshot | None = None, extractor: str = "ast") -> Snapshot:
+    """
+    Records the imports and content hash of each file of a project.
+
+    Files are parsed only if their imports are not known yet: unchanged files are answered by the parse cache
+    (without being read when their modification time did not change), then by the files of the reference
+    snapshot with the same content, even if they were moved.
+
+    :param project_path: Path to the project directory
+    :param files: Inventory of Python files relative to the project (see 'scanner.scan_project'),
+                  scanned from 'project_path' if not provided
+    :param dependencies: Imports already extracted from the files, only the content hashes are then computed
+    :param cache: Parse cache of the project (optional)
+    :param reference: Snapshot of another revision of the project, used to skip unchanged files (optional)
+    :param extractor: Name of the extraction engine (see 'parser.EXTRACTORS')
+
+    :return: Snapshot of the project
+    """
+    project_path = os.path.abspath(project_path)
+    if files is None:
+        files = scan_project(project_path)
+
+    known = {}
+    if reference is not None:
+        # Imports only depend on the content of a file: they are indexed by content hash
+        known = {digest: imports for digest, imports in reference.files.values() if digest is not None}
+
+    entries = {}
+    for rel_path in files:
+        full_path = os.path.join(project_path, rel_path)
+        try:
+            stat = os.stat(full_path)
+        except OSError:
+            continue
+
+        digest = cache.stored_digest(rel_path) if dependencies is not None and cache is not None else None
+        if digest is not None:
+            entries[rel_path] = (digest, dependencies.get(rel_path, []))
+            continue
+
+        if dependencies is None and cache is not None:
+            imports = cache.lookup(rel_path, stat)
+            if imports is not None:
+                entries[rel_path] = (cache.stored_digest(rel_path), imports)
+                continue
+
+        try:
+            with open(full_path, "rb") as f:
+                data = f.read()
+        except OSError:
+            continue
+
+        digest = file_digest(data)
+        if dependencies is not None:
+            entries[rel_path] = (digest, dependencies.get(rel_path, []))
+            continue
+
+        imports = cache.lookup_content(rel_path, stat, digest) if cache is not None else None
+        if imports is None:
+            imports = known.get(digest)
+            if imports is None:
+                imports = extract_imports_from_source(data, full_path, extractor=extractor)
+            if cache is not None:
+                cache.store(rel_path, stat, digest, imports)
+
+        entries[rel_path] = (digest, imports)
+
+    return Snapshot(project_path, entries)
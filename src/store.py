@@ -0,0 +1,142 @@
+import sqlite3
+import sys
+from collections.abc import MutableMapping
+
+
+# Default number of imported names kept in memory before spilling to disk
+DEFAULT_MEMORY_LIMIT = 100_000
+
+
+class DependencyStore(MutableMapping):
+    """
+    Mapping relative file -> list of imported modules, with a bounded memory footprint.
+
+    Entries are kept in memory until they hold 'memory_limit' imported names; they are then moved to a temporary
+    SQLite database, which SQLite itself keeps on disk beyond a small page cache and deletes when closed.
+    Iteration follows the insertion order, and module names are interned so that the lists read back share
+    their strings.
+    """
+
+    def __init__(self, memory_limit: int = DEFAULT_MEMORY_LIMIT):
+        """
+        :param memory_limit: Number of imported names kept in memory before spilling them to disk
+        """
+        self.memory_limit = memory_limit
+        self.spills = 0
+        self._memory = {}
+        self._memory_size = 0
+        self._spilled = 0
+        self._db = None
+
+    def _open(self) -> sqlite3.Connection:
+        if self._db is None:
+            # An empty file name creates a private temporary database, stored on disk and deleted on close
+            self._db = sqlite3.connect("")
+            self._db.execute("CREATE TABLE deps (seq INTEGER PRIMARY KEY, path TEXT UNIQUE, imports TEXT)")
+        return self._db
+
+    @staticmethod
+    def _decode(value: str) -> list[str]:
+        return [sys.intern(name) for name in value.split("\n")] if value else []
+
+    def _spill(self) -> None:
+        self._open().executemany(
+            "INSERT INTO deps (path, imports) VALUES (?, ?)",
+            ((path, "\n".join(imports)) for path, imports in self._memory.items())
+        )
+        self._spilled += len(self._memory)
+        self._memory = {}
+        self._memory_size = 0
+        self.spills += 1
+
+    def _spilled_row(self, rel_path: str) -> tuple | None:
+        if not self._spilled:
+            return None
+        return self._db.execute("SELECT imports FROM deps WHERE path = ?", (rel_path,)).fetchone()
+
+    def __setitem__(self, rel_path: str, imports: list[str]) -> None:
+        if rel_path not in self._memory and self._spilled_row(rel_path) is not None:
+            self._db.execute("UPDATE deps SET imports = ? WHERE path = ?", ("\n".join(imports), rel_path))
+            return
+
+        previous = self._memory.get(rel_path)
+        if previous is not None:
+            self._memory_size -= len(previous)
+        self._memory[sys.intern(rel_path)] = [sys.intern(name) for name in imports]
+        self._memory_size += len(imports)
+
+        if self._memory_size >= self.memory_limit:
+            self._spill()
+
+    def __getitem__(self, rel_path: str) -> list[str]:
+        try:
+            return self._memory[rel_path]
+        except KeyError:
+            pass
+
+        row = self._spilled_row(rel_path)
+        if row is None:
+            raise KeyError(rel_path)
+        return self._decode(row[0])
+
+    def __delitem__(self, rel_path: str) -> None:
+        if rel_path in self._memory:
+            self._memory_size -= len(self._memory.pop(rel_path))
+        elif self._spilled_row(rel_path) is not None:
+            self._db.execute("DELETE FROM deps WHERE path = ?", (rel_path,))
+            self._spilled -= 1
+        else:
+            raise KeyError(rel_path)
+
+    def __contains__(self, rel_path: object) -> bool:
+        return rel_path in self._memory or self._spilled_row(rel_path) is not None
+
+    def __len__(self) -> int:
+        return self._spilled + len(self._memory)
+
+    def _iter_rows(self, columns: str):
+        # A separate cursor streams the rows, without loading the whole table
+        cursor = self._db.execute(f"SELECT {columns} FROM deps ORDER BY seq")
+        while True:
+            rows = cursor.fetchmany(1000)
+            if not rows:
+                return
+            yield from rows
+
+    def __iter__(self):
+        if self._spilled:
+            for (path,) in self._iter_rows("path"):
+                yield path
+        yield from list(self._memory)
+
+    def items(self):
+        """
+        Streams the entries, unlike the view returned by 'dict.items'.
+
+        :return: Iterator over (relative file, list of imported modules), in insertion order
+        """
+        if self._spilled:
+            for path, imports in self._iter_rows("path, imports"):
+                yield path, self._decode(imports)
+        yield from list(self._memory.items())
+
+    def values(self):
+        for _, imports in self.items():
+            yield imports
+
+    def close(self) -> None:
+        """
+        Deletes the temporary database and forgets all entries.
+        """
+        if self._db is not None:
+            self._db.close()
+            self._db = None
+        self._memory = {}
+        self._memory_size = 0
+        self._spilled = 0
+
+    def __enter__(self) -> "DependencyStore":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
@@ -0,0 +1,139 @@
+import os
+from typing import NamedTuple
+from .classifier import (ModuleClassifier, get_default_classifier)
+from .utils import ModuleResolver
+
+
+class ImportBinding(NamedTuple):
+    """
+    Name bound in a module by an import statement.
+    """
+    module: str        # Imported module, as listed by the parser (e.g. 'helpers.math.sqrt')
+    base: str | None   # Module of a 'from' import (e.g. 'helpers.math', '' for 'from . import x'), None for 'import x'
+    name: str          # Local name bound by the import (e.g. 'sqrt', or 'np' for 'import numpy as np')
+    line: int
+    used: bool         # True if the name is read somewhere in the module, or re-exported
+
+
+class ModuleSymbols(NamedTuple):
+    """
+    Top-level symbols of a module, collected from the same syntax tree as its imports.
+    """
+    definitions: list[str]      # Names bound at module level: functions, classes, assignments and imports, sorted
+    exports: list[str] | None   # Literal '__all__' of the module, None if there is none
+    bindings: list[ImportBinding]
+    star: bool                  # True if the module has a 'from ... import *': its names cannot all be known
+
+    @classmethod
+    def from_json(cls, data: list) -> "ModuleSymbols":
+        """
+        :param data: Symbols decoded from JSON, as stored by the parse cache
+
+        :return: Symbols of the module
+        """
+        definitions, exports, bindings, star = data
+        return cls(definitions, exports, [ImportBinding(*binding) for binding in bindings], star)
+
+    @property
+    def is_open(self) -> bool:
+        """
+        True if the module may provide names that are not listed in its definitions
+        (star import, or module-level '__getattr__').
+        """
+        return self.star or "__getattr__" in self.definitions
+
+
+# Symbols of a file that could not be parsed
+EMPTY_SYMBOLS = ModuleSymbols([], None, [], False)
+
+
+def resolve_binding(binding: ImportBinding, file: str, resolver: ModuleResolver) -> tuple[str | None, str | None]:
+    """
+    Determines what a 'from' import designates: an internal module, or a symbol defined by one.
+
+    The resolver falls back on the parent names of a module, so 'from helpers.math import sqrt' resolves to
+    'helpers/math.py' both when 'sqrt' is a submodule and when it is a name defined by the module: comparing
+    with the resolution of the base module tells both cases apart.
+
+    :param binding: Import binding of a 'from' import (see 'ImportBinding')
+    :param file: Relative path of the importing file
+    :param resolver: Resolver of the internal modules
+
+    :return: (resolved file or None, imported symbol if the import designates a name defined in that file, else None)
+    """
+    target = resolver.resolve(binding.module, current_file=file)
+    if not binding.base:
+        return target, None
+
+    base_file = resolver.resolve(binding.base, current_file=file)
+    if base_file is None and target is None:
+        # A package: its names are defined by its '__init__.py'
+        base_file = resolver.resolve(f"{binding.base}.__init__", current_file=file)
+        target = base_file
+
+    if base_file is not None and base_file == target:
+        return target, binding.module.rpartition(".")[2]
+    return target, None
+
+
+def analyse_symbols(symbols: dict[str, ModuleSymbols], resolver: ModuleResolver, classifier: ModuleClassifier | None = None) -> dict:
+    """
+    Resolves the imports of each file to the exact symbol, and reports unused and dangling imports.
+
+    - unused: a name bound by an import is never read in the module (imports of '__init__.py' files and names
+      listed in '__all__' are re-exports, and not reported);
+    - dangling: a 'from' import designates a name that the internal module does not define.
+
+    Names are looked up without scopes: a name read anywhere in the module uses the import.
+
+    :param symbols: Relative file dictionary -> symbols of the file
+    :param resolver: Resolver of the internal modules
+    :param classifier: Stdlib/external classifier (default: the shared one)
+
+    :return: {'resolved': number of imports resolved to a symbol, 'unused': [...], 'dangling': [...]}
+             where each problem is {'file', 'line', 'import', 'name'}, plus 'target' for dangling imports
+    """
+    classifier = classifier or get_default_classifier()
+    resolved, unused, dangling = 0, [], []
+
+    for file, module in symbols.items():
+        reexports = os.path.basename(file) == "__init__.py"
+
+        for binding in module.bindings:
+            if not binding.used and not reexports:
+                unused.append({"file": file, "line": binding.line, "import": binding.module, "name": binding.name})
+
+            if not binding.base or classifier.classify(binding.module) is not None:
+                continue
+
+            target, symbol = resolve_binding(binding, file, resolver)
+            if symbol is None:
+                continue
+
+            target_symbols = symbols.get(target)
+            if target_symbols is None:
+                continue
+
+            if symbol in target_symbols.definitions or target_symbols.is_open:
+                resolved += 1
+            else:
+                dangling.append({"file": file, "line": binding.line, "import": binding.module, "name": symbol, "target": target})
+
+    return {"resolved": resolved, "unused": unused, "dangling": dangling}
+
+
+def format_symbol_report(report: dict) -> str:
+    """
+    :param report: Result of 'analyse_symbols'
+
+    :return: Human-readable report
+    """
+    lines = [
+        f"🔎 Symbols: {report['resolved']} import(s) resolved to a definition, "
+        f"{len(report['unused'])} unused, {len(report['dangling'])} dangling"
+    ]
+    for problem in report["dangling"]:
+        lines.append(f"  ❌ {problem['file']}:{problem['line']}: '{problem['name']}' is not defined in {problem['target']}")
+    for problem in report["unused"]:
+        lines.append(f"  ⚠️ {problem['file']}:{problem['line']}: '{problem['name']}' imported but unused ({problem['import']})")
+    return "\n".join(lines)
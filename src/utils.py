@@ -1,42 +1,18 @@
-import importlib.util
 import os
+from .classifier import get_default_classifier
 
 
 def is_standard_or_external(module_name: str) -> bool:
     """
     Determines whether a module is standard (built-in, stdlib) or external (installed via pip).
 
+    The result is memoised per top-level name by the shared classifier (see 'classifier.ModuleClassifier').
+
     :param module_name: Name of the module to be checked (e.g. 'os', 'numpy', 'helpers.utils')
 
     :return: True if the module is standard or external, False otherwise (potentially internal)
     """
-    try:
-        spec = importlib.util.find_spec(module_name)
-        if spec is None:
-            return False
-
-        origin = spec.origin
-
-        # Built-in modules
-        if origin in (None, 'built-in', 'frozen'):
-            return True
-
-        # Standardisation
-        origin = origin.lower()
-
-        # Standard or external modules installed
-        if any(part in origin for part in [
-                'site-packages',
-                'dist-packages',
-                'python',      # Covers pythonXY.dll, pythonXY.zip, lib-dynload, etc.
-                'lib'          # Useful on Windows
-            ]):
-            return True
-
-        return False
-
-    except Exception:
-        return False
+    return get_default_classifier().is_standard_or_external(module_name)
 
 
 def is_internal_module(module_name: str, module_map: dict[str, str]) -> bool:
@@ -112,3 +88,175 @@ def resolve_module_name(module_name: str, module_map: dict[str, list[str]], curr
 
     # Otherwise, return the first one
     return candidates[0][1]
+
+
+def _split_dir(path: str) -> tuple[str, ...]:
+    """
+    Splits the folder of a relative file path into normalised components, without filesystem calls.
+
+    :param path: Relative path of a file (e.g. 'src/../helpers/math.py')
+
+    :return: Folder components (e.g. ('helpers',))
+    """
+    parts = []
+    for part in path.replace("\\", "/").split("/")[:-1]:
+        if part in ("", "."):
+            continue
+        if part == ".." and parts and parts[-1] != "..":
+            parts.pop()
+        else:
+            parts.append(part)
+    return tuple(parts)
+
+
+class ModuleResolver:
+    """
+    Resolver built once from a module map, giving the same answers as 'resolve_module_name'.
+
+    Module names are stored in a trie over their dotted parts, so that all the candidates of a lookup (the full
+    name, then its shorter prefixes) are found in a single descent. The folder of each candidate is split once,
+    and the proximity to the calling file is computed on these components instead of filesystem paths.
+    Results are cached per module name, or per (folder of the calling file, module name) when several files match.
+    """
+
+    def __init__(self, module_map: dict[str, list[str]]):
+        """
+        :param module_map: Dictionary of detected internal modules (e.g. 'utils' -> ['src/utils.py'])
+        """
+        # Trie node: [children by name part or None, tuple of (relative path, folder components)]
+        self._root = [None, ()]
+        self._cache = {}
+        self._cached_keys = {}  # Top-level name -> keys of '_cache', to forget them on 'update'
+
+        # The entries of a file, and the folder components of the files of a folder, are shared between names
+        entries = {}
+        folders = {}
+
+        for module_name, paths in module_map.items():
+            if isinstance(paths, str):
+                paths = [paths]
+
+            node = self._node(module_name)
+            new_entries = []
+            for path in paths:
+                entry = entries.get(path)
+                if entry is None:
+                    folder = path.replace("\\", "/").rpartition("/")[0]
+                    components = folders.get(folder)
+                    if components is None:
+                        components = folders[folder] = _split_dir(path)
+                    entry = entries[path] = (path, components)
+                new_entries.append(entry)
+            node[1] += tuple(new_entries)
+
+    def _node(self, module_name: str) -> list:
+        # Trie node of a module name, created if needed
+        node = self._root
+        for part in module_name.split("."):
+            if node[0] is None:
+                node[0] = {}
+            child = node[0].get(part)
+            if child is None:
+                child = node[0][part] = [None, ()]
+            node = child
+        return node
+
+    def update(self, names: dict[str, list[str]]) -> None:
+        """
+        Replaces the files of some module names, e.g. after files were added to or removed from the module map
+        (see 'parser.add_file_to_module_map'), with the same answers as a resolver built from the patched map.
+
+        A lookup goes through the dotted prefixes of the name, so only the cached results of the changed names and
+        of the names below them are forgotten.
+
+        :param names: Dictionary module name -> relative paths of its files, in module map order (empty if the name
+                      no longer exists)
+        """
+        for module_name, paths in names.items():
+            self._node(module_name)[1] = tuple((path, _split_dir(path)) for path in paths)
+
+        for top in {module_name.partition(".")[0] for module_name in names}:
+            kept = []
+            for key in self._cached_keys.pop(top, []):
+                parts = (key if isinstance(key, str) else key[1]).split(".")
+                if any(".".join(parts[:i]) in names for i in range(1, len(parts) + 1)):
+                    self._cache.pop(key, None)
+                else:
+                    kept.append(key)
+            if kept:
+                self._cached_keys[top] = kept
+
+    def _remember(self, key, module_name: str, result: str | None) -> str | None:
+        # Only called on cache misses: lookups answered by the cache are not slowed down
+        self._cache[key] = result
+        self._cached_keys.setdefault(module_name.partition(".")[0], []).append(key)
+        return result
+
+    def candidates(self, module_name: str) -> list[str]:
+        """
+        :param module_name: Name of the module to be resolved (e.g. 'helpers.math')
+
+        :return: Relative paths matching the module or its parent names, most specific first
+        """
+        return [path for path, _ in self._candidates(module_name)]
+
+    def _candidates(self, module_name: str) -> list[tuple[str, tuple[str, ...]]]:
+        levels = []
+        node = self._root
+        for part in module_name.split("."):
+            children = node[0]
+            node = children.get(part) if children else None
+            if node is None:
+                break
+            if node[1]:
+                levels.append(node[1])
+
+        return [candidate for level in reversed(levels) for candidate in level]
+
+    def resolve(self, module_name: str, current_file: str | None = None) -> str | None:
+        """
+        Resolves a logical module name to a Python file path, taking into account the context of the calling file.
+
+        :param module_name: Name of the module to be resolved (e.g. 'utils', 'helpers.math')
+        :param current_file: Relative path of the calling source file (optional, to evaluate proximity)
+
+        :return: Relative path of the resolved file, or None if not found
+        """
+        # Names with at most one candidate are cached once, whatever the calling file
+        try:
+            return self._cache[module_name]
+        except KeyError:
+            pass
+
+        current_dir = _split_dir(current_file) if current_file else None
+        key = (current_dir, module_name)
+        try:
+            return self._cache[key]
+        except KeyError:
+            pass
+
+        candidates = self._candidates(module_name)
+        if len(candidates) <= 1:
+            return self._remember(module_name, module_name, candidates[0][0] if candidates else None)
+
+        # If context is provided: choose the closest one (first one in case of a tie)
+        elif current_dir is not None:
+            result = min(candidates, key=lambda candidate: self._distance(candidate[1], current_dir))[0]
+
+        # Otherwise, return the first one
+        else:
+            result = candidates[0][0]
+
+        return self._remember(key, module_name, result)
+
+    @staticmethod
+    def _distance(mod_dir: tuple[str, ...], current_dir: tuple[str, ...]) -> int:
+        # Number of separators in the relative path between both folders, like os.path.relpath(...).count(os.sep)
+        common = 0
+        for a, b in zip(mod_dir, current_dir):
+            if a != b:
+                break
+            common += 1
+
+        components = (len(mod_dir) - common) + (len(current_dir) - common)
+        return max(components - 1, 0)
@@ -0,0 +1,428 @@
+import os
+import select
+import struct
+import sys
+import time
+from bisect import bisect_left
+from collections import defaultdict
+from typing import NamedTuple
+from .parser import (add_file_to_module_map, build_module_map, extract_imports_from_file, import_prefixes,
+                     iter_dependencies, module_names_for_file, remove_file_from_module_map)
+from .scanner import scan_project
+from .utils import ModuleResolver
+
+
+class Changes(NamedTuple):
+    """
+    Files added, modified and removed since the previous state, relative to the project root.
+    """
+    added: list[str]
+    modified: list[str]
+    removed: list[str]
+
+    def __bool__(self) -> bool:
+        return bool(self.added or self.modified or self.removed)
+
+    def merge(self, other: "Changes") -> "Changes":
+        """
+        Combines two consecutive change sets (e.g. several events received during the debounce delay).
+
+        :param other: Changes that happened after these ones
+
+        :return: Overall changes
+        """
+        added1, modified1, removed1 = map(set, self)
+        added2, modified2, removed2 = map(set, other)
+
+        # A file added then removed never existed, a file removed then added again is a modification
+        added = (added1 - removed2) | (added2 - removed1)
+        removed = (removed1 - added2) | (removed2 - added1)
+        modified = (modified1 | modified2 | (removed1 & added2)) - added - removed
+        return Changes(sorted(added), sorted(modified), sorted(removed))
+
+
+def _signature(full_path: str) -> tuple[int, int] | None:
+    try:
+        stat = os.stat(full_path)
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+class IncrementalProject:
+    """
+    In-memory dependency map and module map of a project, updated file by file.
+
+    Changes are detected either by comparing a new inventory with the recorded (mtime, size) of each file,
+    or by checking a given list of paths (e.g. from filesystem notifications). Only the changed files are parsed
+    again, and the module map, its resolver and the inventory are patched for added and removed files, so that an
+    update costs in proportion to the change rather than to the project.
+    """
+
+    def __init__(self, project_path: str, ignore_patterns: list[str] | None = None, use_gitignore: bool = True, extractor: str = "ast"):
+        """
+        :param project_path: Path to the project directory
+        :param ignore_patterns: Additional glob patterns to ignore (see 'scanner.scan_project')
+        :param use_gitignore: True to honour the '.gitignore' files found in the project
+        :param extractor: Name of the extraction engine (see 'parser.EXTRACTORS')
+        """
+        self.project_path = project_path
+        self.ignore_patterns = ignore_patterns
+        self.use_gitignore = use_gitignore
+        self.extractor = extractor
+
+        self.files = []         # Inventory, sorted as by 'scanner.scan_project'
+        self.dependencies = {}  # In no particular order: see 'files'
+        self.module_map = {}
+        self.directories = []
+        self._signatures = {}
+        self._resolver = None
+        self._importers = None  # Top-level imported name -> files importing it or a name below it
+
+    def load(self, files: list[str] | None = None, dependencies: dict[str, list[str]] | None = None, module_map: dict[str, list[str]] | None = None, directories: list[str] | None = None) -> None:
+        """
+        Initialises the state, reusing the results of a previous analysis when provided.
+
+        :param files: Inventory of the project (scanned if not provided)
+        :param dependencies: Imports of each file of the inventory (parsed if not provided)
+        :param module_map: Module map of the inventory (built if not provided)
+        :param directories: Folders browsed to build the inventory (see 'scanner.scan_project'), used by notifications
+        """
+        if files is None or directories is None:
+            files = self.scan()
+        else:
+            self.directories = directories
+
+        self.files = sorted(files)
+        self._signatures = {rel_path: _signature(os.path.join(self.project_path, rel_path)) for rel_path in files}
+        self.dependencies = dependencies if dependencies is not None else dict(
+            iter_dependencies(self.project_path, files=files, extractor=self.extractor)
+        )
+        self.module_map = module_map if module_map is not None else build_module_map(self.project_path, files=files)
+        self._resolver = None
+        self._importers = None
+
+    @property
+    def resolver(self) -> ModuleResolver:
+        """
+        Resolver of the internal modules, built once and then patched with the module map.
+        """
+        if self._resolver is None:
+            self._resolver = ModuleResolver(self.module_map)
+        return self._resolver
+
+    def _index(self, rel_path: str, imports: list[str] | None, add: bool = True) -> None:
+        if self._importers is None or not imports:
+            return
+        for top in {imp.partition(".")[0] for imp in imports}:
+            if add:
+                self._importers[top].add(rel_path)
+            else:
+                self._importers[top].discard(rel_path)
+
+    def scan(self) -> list[str]:
+        """
+        Lists the files of the project, and records the browsed folders.
+
+        :return: Inventory of the project
+        """
+        directories = []
+        files = scan_project(self.project_path, ignore_patterns=self.ignore_patterns, use_gitignore=self.use_gitignore, directories=directories)
+        self.directories = directories
+        return files
+
+    def detect_changes(self, paths: set[str] | None = None) -> Changes:
+        """
+        Compares the files on disk with the recorded state.
+
+        :param paths: Relative paths known to have changed; None to scan the whole project.
+                      Paths unknown to the state trigger a scan, so that ignore rules are applied to new files.
+
+        :return: Detected changes
+        """
+        if paths is None or any(path not in self._signatures for path in paths):
+            files = set(self.scan())
+            known = set(self._signatures)
+            added = sorted(files - known)
+            removed = sorted(known - files)
+            candidates = files & known
+        else:
+            added, removed, candidates = [], [], set()
+            for path in paths:
+                if os.path.isfile(os.path.join(self.project_path, path)):
+                    candidates.add(path)
+                else:
+                    removed.append(path)
+            removed.sort()
+
+        modified = sorted(
+            rel_path for rel_path in candidates
+            if _signature(os.path.join(self.project_path, rel_path)) != self._signatures[rel_path]
+        )
+        return Changes(added, modified, removed)
+
+    def apply(self, changes: Changes) -> None:
+        """
+        Parses the added and modified files again, and patches the inventory, the module map and its resolver.
+
+        :param changes: Changes to be applied (see 'detect_changes')
+        """
+        changed_names = set()
+
+        for rel_path in changes.removed:
+            self._signatures.pop(rel_path, None)
+            self._index(rel_path, self.dependencies.pop(rel_path, None), add=False)
+            remove_file_from_module_map(self.module_map, self.project_path, rel_path)
+            changed_names.update(module_names_for_file(self.project_path, rel_path))
+
+            i = bisect_left(self.files, rel_path)
+            if i < len(self.files) and self.files[i] == rel_path:
+                del self.files[i]
+
+        for rel_path in changes.added + changes.modified:
+            full_path = os.path.join(self.project_path, rel_path)
+            self._signatures[rel_path] = _signature(full_path)
+            self._index(rel_path, self.dependencies.get(rel_path), add=False)
+            try:
+                self.dependencies[rel_path] = extract_imports_from_file(full_path, extractor=self.extractor)
+            except OSError:
+                self.dependencies[rel_path] = []
+            self._index(rel_path, self.dependencies[rel_path])
+
+        for rel_path in changes.added:
+            add_file_to_module_map(self.module_map, self.project_path, rel_path)
+            changed_names.update(module_names_for_file(self.project_path, rel_path))
+
+            # Keep the inventory order of a full analysis
+            i = bisect_left(self.files, rel_path)
+            if i == len(self.files) or self.files[i] != rel_path:
+                self.files.insert(i, rel_path)
+
+        if self._resolver is not None and changed_names:
+            self._resolver.update({name: self.module_map.get(name, []) for name in changed_names})
+
+    def affected_importers(self, changes: Changes) -> list[str]:
+        """
+        Finds the unchanged files whose imports may resolve differently after files were added or removed: those
+        importing one of the module names of these files, or a name below it (see 'parser.import_prefixes').
+
+        The candidates are taken from an index of the imports by top-level name, built on first use and then kept
+        up to date by 'apply'.
+
+        :param changes: Applied changes (see 'apply')
+
+        :return: Sorted relative paths, the changed files excluded
+        """
+        changed_names = set()
+        for rel_path in changes.added + changes.removed:
+            changed_names.update(module_names_for_file(self.project_path, rel_path))
+        if not changed_names:
+            return []
+
+        if self._importers is None:
+            self._importers = defaultdict(set)
+            for rel_path, imports in self.dependencies.items():
+                self._index(rel_path, imports)
+
+        changed = set(changes.added) | set(changes.modified) | set(changes.removed)
+        affected = set()
+        for top in {name.partition(".")[0] for name in changed_names}:
+            for rel_path in self._importers.get(top, ()):
+                if rel_path not in changed and rel_path not in affected and not import_prefixes(self.dependencies[rel_path]).isdisjoint(changed_names):
+                    affected.add(rel_path)
+        return sorted(affected)
+
+    def refresh(self) -> Changes:
+        """
+        Detects and applies the changes made since the previous state.
+
+        :return: Applied changes
+        """
+        changes = self.detect_changes()
+        self.apply(changes)
+        return changes
+
+
+class PollingMonitor:
+    """
+    Detects changes by comparing modification times at a fixed interval.
+    """
+
+    def __init__(self, project: IncrementalProject, interval: float = 1.0):
+        self.project = project
+        self.interval = interval
+
+    def wait(self, timeout: float | None = None) -> Changes:
+        """
+        Waits for the next poll and returns the changes detected since the state was last updated.
+
+        :param timeout: Maximum waiting time (default: the polling interval)
+        """
+        time.sleep(self.interval if timeout is None else min(timeout, self.interval))
+        return self.project.detect_changes()
+
+    def close(self) -> None:
+        pass
+
+
+class InotifyMonitor:
+    """
+    Detects changes with Linux 'inotify' notifications on the browsed folders: only the notified files are checked.
+    """
+
+    _IN_MODIFY = 0x002
+    _IN_CLOSE_WRITE = 0x008
+    _IN_MOVED_FROM = 0x040
+    _IN_MOVED_TO = 0x080
+    _IN_CREATE = 0x100
+    _IN_DELETE = 0x200
+    _IN_DELETE_SELF = 0x400
+    _IN_MOVE_SELF = 0x800
+    _IN_Q_OVERFLOW = 0x4000
+    _IN_IGNORED = 0x8000
+    _IN_ISDIR = 0x40000000
+    _MASK = (_IN_MODIFY | _IN_CLOSE_WRITE | _IN_MOVED_FROM | _IN_MOVED_TO | _IN_CREATE | _IN_DELETE
+             | _IN_DELETE_SELF | _IN_MOVE_SELF)
+    # Folder events that change the list of browsed folders
+    _DIRECTORY_EVENTS = _IN_CREATE | _IN_MOVED_TO | _IN_MOVED_FROM | _IN_DELETE
+
+    _EVENT = struct.Struct("iIII")
+
+    def __init__(self, project: IncrementalProject):
+        """
+        :raise OSError: If 'inotify' is not available
+        """
+        if not sys.platform.startswith("linux"):
+            raise OSError("inotify is only available on Linux")
+
+        import ctypes
+        import ctypes.util
+
+        self.project = project
+        self._libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        self._fd = self._libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self._fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+
+        self._watches = {}
+        self._watch_directories()
+
+    def _watch_directories(self) -> None:
+        watched = set(self._watches.values())
+        for rel_dir in self.project.directories:
+            if rel_dir in watched:
+                continue
+            path = os.path.join(self.project.project_path, rel_dir).encode()
+            # A folder moved inside the project keeps its watch descriptor, which now maps to its new path
+            wd = self._libc.inotify_add_watch(self._fd, path, self._MASK)
+            if wd >= 0:
+                self._watches[wd] = rel_dir
+
+        # Folders deleted or moved out of the project are no longer watched
+        directories = set(self.project.directories)
+        for wd, rel_dir in list(self._watches.items()):
+            if rel_dir not in directories:
+                self._libc.inotify_rm_watch(self._fd, wd)
+                del self._watches[wd]
+
+    def wait(self, timeout: float | None = None) -> Changes:
+        """
+        Waits for notifications and returns the changes of the notified files.
+
+        :param timeout: Maximum waiting time in seconds (None to wait indefinitely)
+        """
+        readable, _, _ = select.select([self._fd], [], [], timeout)
+        if not readable:
+            return Changes([], [], [])
+
+        paths, rescan = set(), False
+        data = self._read()
+        offset = 0
+        while offset + self._EVENT.size <= len(data):
+            wd, mask, _, length = self._EVENT.unpack_from(data, offset)
+            name = data[offset + self._EVENT.size:offset + self._EVENT.size + length].rstrip(b"\0").decode(errors="replace")
+            offset += self._EVENT.size + length
+
+            if mask & self._IN_IGNORED:
+                # Watch removed, by the kernel once its folder is gone or by '_watch_directories'
+                self._watches.pop(wd, None)
+            elif mask & (self._IN_Q_OVERFLOW | self._IN_DELETE_SELF | self._IN_MOVE_SELF) or (mask & self._IN_ISDIR and mask & self._DIRECTORY_EVENTS):
+                # Lost events, or folder added, removed or moved: the whole project is compared
+                rescan = True
+            elif wd in self._watches and name.endswith(".py"):
+                rel_dir = self._watches[wd]
+                paths.add(os.path.join(rel_dir, name) if rel_dir else name)
+
+        if rescan:
+            changes = self.project.detect_changes()
+            self._watch_directories()
+            return changes
+        return self.project.detect_changes(paths) if paths else Changes([], [], [])
+
+    def _read(self) -> bytes:
+        chunks = []
+        while True:
+            try:
+                chunk = os.read(self._fd, 65536)
+            except BlockingIOError:
+                break
+            if not chunk:
+                break
+            chunks.append(chunk)
+        return b"".join(chunks)
+
+    def close(self) -> None:
+        os.close(self._fd)
+
+
+def create_monitor(project: IncrementalProject, interval: float = 1.0, use_inotify: bool = True):
+    """
+    Returns the most efficient available change monitor.
+
+    :param project: Project to be monitored (its state must be loaded)
+    :param interval: Polling interval in seconds, if notifications are not available
+    :param use_inotify: False to force polling
+
+    :return: InotifyMonitor or PollingMonitor
+    """
+    if use_inotify:
+        try:
+            return InotifyMonitor(project)
+        except (OSError, AttributeError):
+            pass
+    return PollingMonitor(project, interval=interval)
+
+
+def watch(project: IncrementalProject, on_change, monitor=None, debounce: float = 0.3, max_updates: int | None = None) -> None:
+    """
+    Keeps the project state up to date and reports each batch of changes.
+
+    Changes are accumulated until no new change has been seen for 'debounce' seconds, then applied at once.
+
+    :param project: Project to be watched (its state must be loaded)
+    :param on_change: Function called with the applied Changes after each update
+    :param monitor: Change monitor (default: see 'create_monitor')
+    :param debounce: Quiet period in seconds before applying the changes
+    :param max_updates: Number of updates after which watching stops (None to watch until interrupted)
+    """
+    monitor = monitor or create_monitor(project)
+    updates = 0
+
+    try:
+        while max_updates is None or updates < max_updates:
+            changes = monitor.wait()
+            if not changes:
+                continue
+
+            # Debounce: wait for the burst of changes to end
+            while True:
+                more = monitor.wait(timeout=debounce)
+                if not more or more == changes:
+                    break
+                changes = changes.merge(more)
+
+            project.apply(changes)
+            on_change(changes)
+            updates += 1
+    finally:
+        monitor.close()
@@ -0,0 +1,351 @@
+import configparser
+import hashlib
+import os
+import sqlite3
+from collections import defaultdict
+from typing import NamedTuple
+from .cache import ParseCache
+from .classifier import (EXTERNAL, ModuleClassifier, get_default_classifier)
+from .parser import (build_module_map, iter_dependencies)
+from .scanner import scan_project
+from .utils import ModuleResolver
+
+try:
+    import tomllib
+except ImportError:  # Python < 3.11
+    try:
+        import tomli as tomllib
+    except ImportError:
+        tomllib = None
+
+
+# Files declaring a Python package, in order of precedence
+PROJECT_FILES = ("pyproject.toml", "setup.cfg")
+
+
+class Root(NamedTuple):
+    """
+    Source root of a package of a workspace: the folder its module names are relative to.
+    """
+    name: str    # Name of the package (from its metadata), or of its folder
+    path: str    # Absolute path of the source root
+    prefix: str  # Path of the source root relative to the workspace ('' for the workspace itself)
+
+
+class Shard(NamedTuple):
+    """
+    Result of the analysis of one root, with paths relative to the root.
+    """
+    root: Root
+    files: list[str]
+    dependencies: dict[str, list[str]]
+    module_map: dict[str, list[str]]
+    cache_stats: dict[str, int] | None
+
+
+def _read_pyproject(path: str) -> tuple[str | None, list[str]]:
+    if tomllib is None:
+        return None, []
+    try:
+        with open(path, "rb") as f:
+            data = tomllib.load(f)
+    except (OSError, ValueError):
+        return None, []
+
+    tool = data.get("tool", {})
+    setuptools = tool.get("setuptools", {})
+    poetry = tool.get("poetry", {})
+    name = data.get("project", {}).get("name") or poetry.get("name")
+
+    find = setuptools.get("packages", {})
+    if isinstance(find, dict) and find.get("find", {}).get("where"):
+        return name, list(find["find"]["where"])
+
+    package_dir = setuptools.get("package-dir", {})
+    if "" in package_dir:
+        return name, [package_dir[""]]
+
+    sources = [package["from"] for package in poetry.get("packages", []) if isinstance(package, dict) and "from" in package]
+    if sources:
+        return name, sorted(set(sources))
+
+    wheel = tool.get("hatch", {}).get("build", {}).get("targets", {}).get("wheel", {})
+    sources = [os.path.dirname(package.rstrip("/")) for package in wheel.get("packages", [])]
+    return name, sorted(set(sources))
+
+
+def _read_setup_cfg(path: str) -> tuple[str | None, list[str]]:
+    parser = configparser.ConfigParser()
+    try:
+        parser.read(path, encoding="utf-8")
+    except (OSError, configparser.Error, UnicodeDecodeError):
+        return None, []
+
+    name = parser.get("metadata", "name", fallback=None)
+
+    where = parser.get("options.packages.find", "where", fallback="").strip()
+    if where:
+        return name, [where]
+
+    # 'package_dir' lists 'package = folder' lines, the empty package being the source root
+    for line in parser.get("options", "package_dir", fallback="").splitlines():
+        package, _, folder = line.partition("=")
+        if not package.strip() and folder.strip():
+            return name, [folder.strip()]
+
+    return name, []
+
+
+def read_project_roots(project_dir: str) -> list[Root]:
+    """
+    Determines the source roots of a package from its 'pyproject.toml' (setuptools, Poetry or Hatch settings)
+    or its 'setup.cfg'. Without explicit settings, the 'src' folder is used if there is one ('src' layout),
+    otherwise the folder of the package itself.
+
+    'pyproject.toml' files are only read with 'tomllib' (Python 3.11+) or the 'tomli' package.
+
+    :param project_dir: Absolute path of the folder holding the package files
+
+    :return: Source roots of the package, with an empty prefix
+    """
+    name, sources = None, []
+    for filename in PROJECT_FILES:
+        path = os.path.join(project_dir, filename)
+        if os.path.isfile(path):
+            name, sources = (_read_pyproject if filename == "pyproject.toml" else _read_setup_cfg)(path)
+            if sources:
+                break
+
+    if not sources:
+        sources = ["src"] if os.path.isdir(os.path.join(project_dir, "src")) else ["."]
+
+    name = name or os.path.basename(os.path.abspath(project_dir))
+    return [Root(name, os.path.normpath(os.path.join(project_dir, source)), "") for source in sources]
+
+
+def discover_roots(workspace_path: str, ignore_patterns: list[str] | None = None, use_gitignore: bool = True) -> list[Root]:
+    """
+    Finds the packages of a workspace (monorepo) from their 'pyproject.toml' or 'setup.cfg' files.
+
+    Folders are browsed with the same ignore rules as the analysis. A package file whose folder contains other
+    packages is considered to configure the workspace itself (tools, shared settings), and is skipped.
+
+    :param workspace_path: Path to the workspace directory
+    :param ignore_patterns: Additional glob patterns to ignore (see 'scanner.scan_project')
+    :param use_gitignore: True to honour the '.gitignore' files found in the workspace
+
+    :return: Source roots of the packages, sorted by prefix
+    """
+    workspace_path = os.path.abspath(workspace_path)
+    directories = []
+    scan_project(workspace_path, ignore_patterns=ignore_patterns, use_gitignore=use_gitignore, directories=directories)
+
+    projects = sorted(
+        directory for directory in directories
+        if any(os.path.isfile(os.path.join(workspace_path, directory, filename)) for filename in PROJECT_FILES)
+    )
+    projects = [
+        directory for directory in projects
+        if not any(other != directory and (not directory or other.startswith(directory + os.sep)) for other in projects)
+    ]
+
+    roots = [root for directory in projects for root in read_project_roots(os.path.join(workspace_path, directory))]
+    return make_roots(workspace_path, roots)
+
+
+def make_roots(workspace_path: str, roots: list[Root | str]) -> list[Root]:
+    """
+    Normalises the roots of a workspace, and checks that they can be analysed independently.
+
+    :param workspace_path: Path to the workspace directory
+    :param roots: Roots, or paths of roots relative to the workspace
+
+    :return: Roots with absolute paths and prefixes relative to the workspace, sorted by prefix
+
+    :raises ValueError: If a root is missing, or contains another root
+    """
+    workspace_path = os.path.abspath(workspace_path)
+    result = {}
+    for root in roots:
+        if isinstance(root, str):
+            path = os.path.normpath(os.path.join(workspace_path, root))
+            root = Root(os.path.basename(path), path, "")
+
+        if not os.path.isdir(root.path):
+            raise ValueError(f"not a folder: {root.path}")
+
+        prefix = os.path.relpath(root.path, workspace_path)
+        result[prefix] = root._replace(prefix="" if prefix == os.curdir else prefix)
+
+    roots = sorted(result.values(), key=lambda root: root.prefix)
+    for root in roots:
+        for other in roots:
+            if other is not root and (not root.prefix or other.prefix.startswith(root.prefix + os.sep)):
+                raise ValueError(f"nested roots are not supported: '{other.prefix}' is inside '{root.prefix or '.'}'")
+    return roots
+
+
+def shard_cache_dir(cache_dir: str, root: Root) -> str:
+    """
+    :param cache_dir: Folder of the parse cache of the workspace
+    :param root: Root of a shard
+
+    :return: Folder of the parse cache of the shard, e.g. '<cache_dir>/shards/core-1a2b3c4d'
+    """
+    key = hashlib.blake2b(root.prefix.replace(os.sep, "/").encode("utf-8"), digest_size=4).hexdigest()
+    return os.path.join(cache_dir, "shards", f"{os.path.basename(root.path) or 'root'}-{key}")
+
+
+def analyse_shard(root: Root, ignore_patterns: list[str] | None = None, use_gitignore: bool = True, extractor: str = "ast", cache_dir: str | None = None, io_threads: int = 0) -> Shard:
+    """
+    Scans and parses one root, as a single-root analysis of that folder would.
+
+    :param root: Root to be analysed
+    :param ignore_patterns: Additional glob patterns to ignore (see 'scanner.scan_project')
+    :param use_gitignore: True to honour the '.gitignore' files found in the root
+    :param extractor: Name of the extraction engine (see 'parser.EXTRACTORS')
+    :param cache_dir: Folder of the parse cache of the shard, None to parse every file
+    :param io_threads: Number of threads reading the files ahead of the parser (see 'parser.iter_dependencies')
+
+    :return: Result of the analysis, with paths relative to the root
+    """
+    files = scan_project(root.path, ignore_patterns=ignore_patterns, use_gitignore=use_gitignore)
+
+    cache = None
+    if cache_dir is not None:
+        try:
+            cache = ParseCache(cache_dir)
+        except (OSError, sqlite3.Error):
+            cache = None
+
+    try:
+        dependencies = dict(iter_dependencies(root.path, files=files, cache=cache, extractor=extractor, io_threads=io_threads))
+        if cache is not None:
+            cache.prune(files)
+    finally:
+        if cache is not None:
+            cache.close()
+
+    return Shard(root, files, dependencies, build_module_map(root.path, files=files), cache.stats() if cache is not None else None)
+
+
+def analyse_workspace(roots: list[Root], jobs: int = 1, cache_dir: str | None = None, **options) -> list[Shard]:
+    """
+    Analyses the roots of a workspace as independent shards, in parallel.
+
+    :param roots: Roots of the workspace (see 'discover_roots' and 'make_roots')
+    :param jobs: Number of processes analysing shards at the same time (1 = no pool, 0 = one per CPU)
+    :param cache_dir: Folder of the parse cache of the workspace, holding one cache per shard (None = no cache)
+    :param options: Options of 'analyse_shard' (ignore_patterns, use_gitignore, extractor, io_threads)
+
+    :return: One shard per root, in the order of the roots
+    """
+    if jobs == 0:
+        jobs = os.cpu_count() or 1
+
+    cache_dirs = [shard_cache_dir(cache_dir, root) if cache_dir is not None else None for root in roots]
+
+    if jobs == 1 or len(roots) < 2:
+        return [analyse_shard(root, cache_dir=shard_cache, **options) for root, shard_cache in zip(roots, cache_dirs)]
+
+    from concurrent.futures import ProcessPoolExecutor
+
+    with ProcessPoolExecutor(max_workers=min(jobs, len(roots))) as executor:
+        futures = [executor.submit(analyse_shard, root, cache_dir=shard_cache, **options) for root, shard_cache in zip(roots, cache_dirs)]
+        return [future.result() for future in futures]
+
+
+class WorkspaceResolver:
+    """
+    Resolver of the modules of a workspace, with the same interface as 'utils.ModuleResolver'.
+
+    File paths are relative to the workspace. An import is first resolved inside the root of the importing file,
+    with the usual rules (full names, short names, proximity); otherwise it is resolved against the full module
+    names of the other roots only, since short names are a guess that should not cross package boundaries.
+    """
+
+    def __init__(self, shards: list[Shard]):
+        """
+        :param shards: Analysed shards of the workspace (see 'analyse_workspace')
+        """
+        self._prefixes = sorted((shard.root.prefix for shard in shards), key=len, reverse=True)
+        self._resolvers = {shard.root.prefix: ModuleResolver(shard.module_map) for shard in shards}
+
+        module_map = defaultdict(list)
+        for shard in shards:
+            for rel_path in shard.files:
+                module_map[os.path.splitext(rel_path)[0].replace(os.sep, ".")].append(os.path.join(shard.root.prefix, rel_path))
+        self.module_map = dict(module_map)
+        self.packages = {name.partition(".")[0] for name in self.module_map}
+        self._global = ModuleResolver(self.module_map)
+
+    def split(self, file: str) -> tuple[str, str] | None:
+        """
+        :param file: Path of a file relative to the workspace
+
+        :return: (prefix of its root, path relative to the root), or None if the file is outside every root
+        """
+        for prefix in self._prefixes:
+            if not prefix:
+                return prefix, file
+            if file.startswith(prefix + os.sep):
+                return prefix, file[len(prefix) + 1:]
+        return None
+
+    def resolve(self, module_name: str, current_file: str | None = None) -> str | None:
+        """
+        :param module_name: Name of the module to be resolved (e.g. 'utils', 'core.models')
+        :param current_file: Path of the calling file, relative to the workspace (optional)
+
+        :return: Path of the resolved file relative to the workspace, or None if not found
+        """
+        location = self.split(current_file) if current_file else None
+        if location is not None:
+            prefix, rel_path = location
+            resolved = self._resolvers[prefix].resolve(module_name, current_file=rel_path)
+            if resolved:
+                return os.path.join(prefix, resolved)
+
+        return self._global.resolve(module_name, current_file=current_file)
+
+
+class WorkspaceClassifier:
+    """
+    Classifier treating the packages of the workspace as internal, even when they are installed in the
+    environment (e.g. 'pip install -e'), and delegating every other name.
+    """
+
+    def __init__(self, packages: set[str], classifier: ModuleClassifier | None = None):
+        """
+        :param packages: Top-level module names of the workspace (see 'WorkspaceResolver.packages')
+        :param classifier: Underlying classifier (default: the shared one)
+        """
+        self.packages = packages
+        self.classifier = classifier or get_default_classifier()
+
+    def classify(self, module_name: str) -> str | None:
+        """
+        :param module_name: Name of the module to be checked
+
+        :return: STDLIB, EXTERNAL, or None if the module is neither (potentially internal)
+        """
+        kind = self.classifier.classify(module_name)
+        if kind == EXTERNAL and module_name.partition(".")[0] in self.packages:
+            return None
+        return kind
+
+    def is_standard_or_external(self, module_name: str) -> bool:
+        return self.classify(module_name) is not None
+
+
+def merge_shards(shards: list[Shard]) -> dict[str, list[str]]:
+    """
+    :param shards: Analysed shards of the workspace
+
+    :return: Dictionary file relative to the workspace -> list of imported modules, ordered by root then file
+    """
+    return {
+        os.path.join(shard.root.prefix, rel_path): imports
+        for shard in shards
+        for rel_path, imports in shard.dependencies.items()
+    }
@@ -0,0 +1,77 @@
+import os
+import pytest
+from src.analyzer import Analyzer
+from src.graph import build_graph
+
+
+@pytest.fixture
+def analyzer(tmp_path):
+    """
+    Creates a small project with an import cycle, and returns an analysis session on it.
+    """
+    (tmp_path / 'main.py').write_text('import utils\nimport os\n', encoding='utf-8')
+    (tmp_path / 'utils.py').write_text('import helpers.tool\n', encoding='utf-8')
+    (tmp_path / 'helpers').mkdir()
+    (tmp_path / 'helpers' / 'tool.py').write_text('import utils\nimport missing_module\n', encoding='utf-8')
+
+    with Analyzer(str(tmp_path), cache_dir=str(tmp_path / '.depviz_cache')) as session:
+        yield session
+
+
+def write(analyzer, rel_path, content):
+    full_path = os.path.join(analyzer.project_path, rel_path)
+    with open(full_path, 'w', encoding='utf-8') as f:
+        f.write(content)
+    # Make sure the modification is visible even on filesystems with a coarse timestamp resolution
+    stat = os.stat(full_path)
+    os.utime(full_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+
+def test_first_refresh_analyses_every_file(analyzer):
+    changes = analyzer.refresh()
+
+    assert sorted(changes.added) == sorted(['main.py', 'utils.py', os.path.join('helpers', 'tool.py')])
+    assert not analyzer.refresh()
+
+
+def test_dependencies_and_resolve(analyzer):
+    tool = os.path.join('helpers', 'tool.py')
+
+    assert analyzer.dependencies('main.py') == [
+        {'name': 'utils', 'kind': 'internal', 'target': 'utils.py'},
+        {'name': 'os', 'kind': 'stdlib', 'target': None},
+    ]
+    assert analyzer.dependencies(os.path.join(analyzer.project_path, 'helpers', 'tool.py'))[1]['kind'] == 'unknown'
+    assert analyzer.resolve('helpers.tool') == {'name': 'helpers.tool', 'kind': 'internal', 'target': tool}
+    assert analyzer.resolve('json')['kind'] == 'stdlib'
+    with pytest.raises(KeyError):
+        analyzer.dependencies('absent.py')
+
+
+def test_graph_matches_build_graph_and_is_reused(analyzer):
+    graph = analyzer.graph
+    expected = build_graph(analyzer.project.dependencies, analyzer.module_map)
+
+    assert sorted(graph.named_edges()) == sorted(expected.named_edges())
+    assert analyzer.graph is graph
+    assert [cycle['files'] for cycle in analyzer.cycles()] == [sorted([os.path.join('helpers', 'tool.py'), 'utils.py'])]
+    assert [entry['name'] for entry in analyzer.query('utils', reverse=True, depth=1)] == [os.path.join('helpers', 'tool.py'), 'main.py']
+
+
+def test_refresh_updates_graph(analyzer):
+    graph = analyzer.graph
+
+    write(analyzer, 'utils.py', 'import json\n')
+    changes = analyzer.refresh()
+
+    assert changes.modified == ['utils.py']
+    assert analyzer.graph is not graph
+    assert analyzer.cycles() == []
+
+    write(analyzer, 'extra.py', '')
+    write(analyzer, 'main.py', 'import tool\n')
+    changes = analyzer.refresh()
+
+    assert changes.added == ['extra.py']
+    assert analyzer.dependencies('main.py') == [{'name': 'tool', 'kind': 'internal', 'target': os.path.join('helpers', 'tool.py')}]
+    assert ('main.py', os.path.join('helpers', 'tool.py')) in set(analyzer.graph.named_edges())
@@ -0,0 +1,68 @@
+import os
+import sys
+import pytest
+from benchmarks.bench_pipeline import (STAGES, main as pipeline_main, run_pipeline)
+from benchmarks.bench_prefetch import (run_parse, simulated_latency)
+from benchmarks.bench_startup import (HEAVY_MODULES, loaded_modules)
+from benchmarks.synthetic import generate_project
+from src.parser import collect_all_dependencies
+
+
+def test_generate_project_is_reproducible(tmp_path):
+    paths = generate_project(str(tmp_path / 'a'), files=30, imports=5, depth=2, seed=1)
+    generate_project(str(tmp_path / 'b'), files=30, imports=5, depth=2, seed=1)
+
+    assert len(paths) == 30
+    assert os.path.isfile(os.path.join(tmp_path, 'a', 'pkg_0', '__init__.py'))
+    for path in paths:
+        with open(os.path.join(tmp_path, 'a', *path.split('/'))) as a, open(os.path.join(tmp_path, 'b', *path.split('/'))) as b:
+            assert a.read() == b.read()
+
+
+def test_generate_project_import_shares(tmp_path):
+    generate_project(str(tmp_path), files=20, imports=4, depth=1, relative=0, stdlib=1, external=0)
+
+    dependencies = collect_all_dependencies(str(tmp_path))
+
+    assert all(len(imports) == 4 for file, imports in dependencies.items() if not file.endswith('__init__.py'))
+    with pytest.raises(ValueError):
+        generate_project(str(tmp_path), relative=0.5, stdlib=0.5, external=0.5)
+
+
+def test_run_pipeline_times_each_stage(tmp_path):
+    generate_project(str(tmp_path), files=40, imports=6, depth=2)
+
+    timings, size = run_pipeline(str(tmp_path))
+
+    assert list(timings) == STAGES
+    assert all(elapsed >= 0 for elapsed in timings.values())
+    assert size['imports'] == 40 * 6
+    assert size['edges'] > 0
+
+
+def test_run_pipeline_requires_one_run(monkeypatch):
+    monkeypatch.setattr(sys, 'argv', ['bench_pipeline', '--repeat', '0'])
+
+    with pytest.raises(SystemExit) as exit_info:
+        pipeline_main()
+    assert exit_info.value.code == 2
+
+
+def test_simulated_latency_is_restored(tmp_path):
+    generate_project(str(tmp_path), files=10, imports=2, depth=1)
+    original_stat = os.stat
+
+    with simulated_latency(0.001):
+        assert os.stat is not original_stat
+        assert run_parse(str(tmp_path), None, 0, None) >= 0.01
+
+    assert os.stat is original_stat
+
+
+def test_startup_does_not_load_heavy_modules():
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+    for arguments in (['-c', 'import src.depviz, src.analyzer'], ['-m', 'src.depviz', '--help']):
+        modules = loaded_modules(arguments, root)
+        assert 'src.parser' in modules
+        assert not modules.intersection(HEAVY_MODULES)
@@ -0,0 +1,117 @@
+import os
+import pytest
+from src.cache import (ParseCache, default_cache_dir, project_cache_dir)
+from src.parser import collect_all_dependencies
+
+
+@pytest.fixture
+def project(tmp_path):
+    """
+    Creates a small project with two files, and returns its path and cache folder.
+    """
+    (tmp_path / 'main.py').write_text('import utils\nimport os\n', encoding='utf-8')
+    (tmp_path / 'utils.py').write_text('import sys\n', encoding='utf-8')
+    return str(tmp_path), str(tmp_path / '.depviz_cache')
+
+
+def run(project_path, cache_dir):
+    with ParseCache(cache_dir) as cache:
+        deps = collect_all_dependencies(project_path, cache=cache)
+        return deps, cache.stats()
+
+
+def test_second_run_hits_cache(project):
+    project_path, cache_dir = project
+
+    first_deps, first_stats = run(project_path, cache_dir)
+    second_deps, second_stats = run(project_path, cache_dir)
+
+    assert first_stats['misses'] == 2 and first_stats['hits'] == 0
+    assert second_stats['misses'] == 0 and second_stats['hits'] == 2
+    assert first_deps == second_deps == {'main.py': ['utils', 'os'], 'utils.py': ['sys']}
+
+
+def test_modified_file_is_parsed_again(project):
+    project_path, cache_dir = project
+    run(project_path, cache_dir)
+
+    utils_file = os.path.join(project_path, 'utils.py')
+    with open(utils_file, 'w', encoding='utf-8') as f:
+        f.write('import json\nimport sys\n')
+
+    deps, stats = run(project_path, cache_dir)
+
+    assert stats == {'hits': 1, 'misses': 1, 'entries': 2}
+    assert deps['utils.py'] == ['json', 'sys']
+
+
+def test_touched_file_is_recognised_by_content(project):
+    project_path, cache_dir = project
+    run(project_path, cache_dir)
+
+    # Same content, new modification time (e.g. fresh checkout)
+    utils_file = os.path.join(project_path, 'utils.py')
+    stat = os.stat(utils_file)
+    os.utime(utils_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+    _, stats = run(project_path, cache_dir)
+
+    assert stats['hits'] == 2 and stats['misses'] == 0
+
+
+def test_prune_forgets_deleted_files(project):
+    project_path, cache_dir = project
+    run(project_path, cache_dir)
+
+    with ParseCache(cache_dir) as cache:
+        cache.prune(['main.py'])
+
+    with ParseCache(cache_dir) as cache:
+        assert cache.stats()['entries'] == 1
+        assert cache.stored_digest('utils.py') is None
+
+
+def test_parallel_analysis_uses_cache(project):
+    project_path, cache_dir = project
+    run(project_path, cache_dir)
+
+    utils_file = os.path.join(project_path, 'utils.py')
+    stat = os.stat(utils_file)
+    os.utime(utils_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+    with ParseCache(cache_dir) as cache:
+        deps = collect_all_dependencies(project_path, cache=cache, jobs=2, chunk_size=1)
+        assert cache.stats()['hits'] == 2
+        assert deps == {'main.py': ['utils', 'os'], 'utils.py': ['sys']}
+
+
+def test_cache_without_preloading(project):
+    project_path, cache_dir = project
+    first_deps, _ = run(project_path, cache_dir)
+
+    with ParseCache(cache_dir, preload=False) as cache:
+        cache.FLUSH_SIZE = 1
+        deps = collect_all_dependencies(project_path, cache=cache)
+        stats = cache.stats()
+
+    assert deps == first_deps
+    assert stats['hits'] == 2 and stats['misses'] == 0
+    assert stats['entries'] == 2
+
+
+def test_shared_cache_folder_holds_one_cache_per_project(tmp_path):
+    shared = str(tmp_path / 'shared')
+    projects = []
+    for name, content in (('first', 'import os\n'), ('second', 'import re\n')):
+        path = tmp_path / name
+        path.mkdir()
+        (path / 'main.py').write_text(content, encoding='utf-8')
+        os.utime(path / 'main.py', ns=(1_000_000_000, 1_000_000_000))  # Same path, size and mtime in both projects
+        projects.append(str(path))
+
+    assert project_cache_dir(projects[0]) == default_cache_dir(projects[0])
+    assert project_cache_dir(projects[0], shared) != project_cache_dir(projects[1], shared)
+
+    for _ in range(2):
+        assert [run(path, project_cache_dir(path, shared))[0]['main.py'] for path in projects] == [['os'], ['re']]
+    assert run(projects[0], project_cache_dir(projects[0], shared))[1]['hits'] == 1
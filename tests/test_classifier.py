@@ -0,0 +1,63 @@
+import importlib.util
+import pytest
+from src.classifier import (EXTERNAL, STDLIB, ModuleClassifier, get_default_classifier)
+from src.utils import is_standard_or_external
+
+
+@pytest.mark.parametrize("module_name,expected", [
+    ("os", STDLIB),                     # standard module
+    ("os.path.join", STDLIB),           # attribute of a standard module
+    ("sys", STDLIB),                    # built-in module
+    ("pytest", EXTERNAL),               # installed module
+    ("nonexistentmodulexyz", None),     # unknown module
+    ("", None),                         # relative import of the package itself
+])
+def test_classify(module_name, expected):
+    assert ModuleClassifier().classify(module_name) == expected
+
+
+def test_each_top_level_name_is_resolved_once(monkeypatch):
+    calls = []
+    original_find_spec = importlib.util.find_spec
+
+    def counting_find_spec(name, *args):
+        calls.append(name)
+        return original_find_spec(name, *args)
+
+    monkeypatch.setattr(importlib.util, "find_spec", counting_find_spec)
+    classifier = ModuleClassifier()
+
+    kinds = classifier.classify_many(["os", "os.path", "helpers.math", "helpers.utils", "helpers"])
+
+    assert kinds == {"os": STDLIB, "os.path": STDLIB, "helpers.math": None, "helpers.utils": None, "helpers": None}
+    assert calls == ["helpers"]  # 'os' is known without searching for it
+    assert classifier.find_spec_calls == 1
+
+
+def test_save_and_load_index(tmp_path, monkeypatch):
+    path = str(tmp_path / "index" / "classifier.json")
+    classifier = ModuleClassifier()
+    classifier.classify("nonexistentmodulexyz")
+    classifier.save(path)
+
+    warm = ModuleClassifier()
+    assert warm.load(path) is True
+
+    monkeypatch.setattr(importlib.util, "find_spec", lambda *args: pytest.fail("find_spec must not be called"))
+    assert warm.classify("nonexistentmodulexyz") is None
+    assert warm.classify("pytest") == EXTERNAL
+
+
+def test_load_rejects_missing_or_foreign_index(tmp_path):
+    path = tmp_path / "classifier.json"
+    assert ModuleClassifier().load(str(path)) is False
+
+    path.write_text('{"environment": "other", "kinds": {"utils": "external"}}', encoding="utf-8")
+    classifier = ModuleClassifier()
+    assert classifier.load(str(path)) is False
+    assert classifier.classify("utils") is None
+
+
+def test_utils_share_the_default_classifier():
+    is_standard_or_external("json.decoder")
+    assert "json" in get_default_classifier()._kinds
@@ -0,0 +1,64 @@
+from src.cycles import (find_cycles, format_cycles, strongly_connected_components)
+from src.graph import (KIND_INTERNAL, KIND_STDLIB, GraphBuilder, build_graph)
+
+
+def make_graph(edges, external=()):
+    """
+    Builds a graph of internal nodes from (source, target) name pairs.
+    """
+    builder = GraphBuilder()
+    for source, target in edges:
+        kind = KIND_STDLIB if target in external else KIND_INTERNAL
+        builder.add_edge(builder.add_node(source, KIND_INTERNAL), builder.add_node(target, kind))
+    return builder.build()
+
+
+def test_no_cycle():
+    graph = make_graph([('a.py', 'b.py'), ('b.py', 'c.py'), ('a.py', 'c.py')])
+
+    assert find_cycles(graph) == []
+    assert format_cycles([]) == "✅ No import cycle."
+
+
+def test_components_in_reverse_topological_order():
+    graph = make_graph([('a.py', 'b.py'), ('b.py', 'a.py'), ('b.py', 'c.py')])
+
+    components = [sorted(graph.names[n] for n in component) for component in strongly_connected_components(graph)]
+
+    assert components == [['c.py'], ['a.py', 'b.py']]
+
+
+def test_find_cycles_reports_shortest_example():
+    graph = make_graph([
+        ('a.py', 'b.py'), ('b.py', 'c.py'), ('c.py', 'd.py'), ('d.py', 'a.py'),
+        ('c.py', 'a.py'),
+        ('x.py', 'y.py'), ('y.py', 'x.py'),
+        ('a.py', 'os'), ('os', 'a.py'),
+    ], external={'os'})
+
+    cycles = find_cycles(graph)
+
+    assert cycles == [
+        {'files': ['a.py', 'b.py', 'c.py', 'd.py'], 'cycle': ['a.py', 'b.py', 'c.py', 'a.py']},
+        {'files': ['x.py', 'y.py'], 'cycle': ['x.py', 'y.py', 'x.py']},
+    ]
+    assert 'a.py -> b.py -> c.py -> a.py' in format_cycles(cycles)
+
+
+def test_find_cycles_on_resolved_imports():
+    dependencies = {'a.py': ['b', 'os'], 'b.py': ['a.helper']}
+    module_map = {'a': ['a.py'], 'b': ['b.py']}
+
+    cycles = find_cycles(build_graph(dependencies, module_map))
+
+    assert cycles == [{'files': ['a.py', 'b.py'], 'cycle': ['a.py', 'b.py', 'a.py']}]
+
+
+def test_long_chain_does_not_hit_recursion_limit():
+    size = 20000
+    edges = [(f'm{i}.py', f'm{i + 1}.py') for i in range(size)] + [(f'm{size}.py', 'm0.py')]
+
+    cycles = find_cycles(make_graph(edges))
+
+    assert len(cycles) == 1
+    assert len(cycles[0]['files']) == size + 1
@@ -0,0 +1,158 @@
+import os
+import pytest
+from src import (depviz, snapshot as snapshot_module)
+from src.cache import ParseCache
+from src.diff import (diff_snapshots, format_diff)
+from src.graph_generator import diff_to_digraph
+from src.parser import (build_module_map, build_partial_module_map)
+from src.snapshot import (Snapshot, take_snapshot)
+
+
+def make_tree(root, files):
+    """
+    Creates the given files (relative paths with '/' separators) under the root directory.
+    """
+    for rel_path, content in files.items():
+        full_path = os.path.join(root, *rel_path.split('/'))
+        os.makedirs(os.path.dirname(full_path), exist_ok=True)
+        with open(full_path, 'w', encoding='utf-8') as f:
+            f.write(content)
+
+
+@pytest.fixture
+def base_tree(tmp_path):
+    root = tmp_path / 'base'
+    make_tree(root, {
+        'main.py': 'import os\nimport utils\nfrom helpers import tools\n',
+        'utils.py': 'import json\n',
+        'helpers/tools.py': 'import settings\n',
+        'helpers/settings.py': '',
+    })
+    return str(root)
+
+
+def edges(diff, key):
+    return [(edge['source'], edge['target'], edge['kind']) for edge in diff[key]]
+
+
+def test_snapshot_round_trip(base_tree, tmp_path):
+    snapshot = take_snapshot(base_tree)
+    path = str(tmp_path / 'snapshot.json')
+    snapshot.save(path)
+
+    loaded = Snapshot.load(path)
+
+    assert loaded.project_path == snapshot.project_path
+    assert loaded.dependencies == snapshot.dependencies
+    assert loaded.digest('utils.py') == snapshot.digest('utils.py') is not None
+
+
+def test_snapshot_load_rejects_other_files(tmp_path):
+    path = tmp_path / 'other.json'
+    path.write_text('{"files": {}}', encoding='utf-8')
+
+    with pytest.raises(ValueError):
+        Snapshot.load(str(path))
+
+
+def test_take_snapshot_reuses_reference_and_cache(base_tree, tmp_path):
+    reference = take_snapshot(base_tree)
+    with ParseCache(str(tmp_path / 'cache')) as cache:
+        snapshot = take_snapshot(base_tree, cache=cache, reference=reference)
+    assert snapshot.dependencies == reference.dependencies
+
+    # Files known by the reference are not parsed again: a forged entry is returned as is
+    reference.files['utils.py'] = (reference.digest('utils.py'), ['forged'])
+    assert take_snapshot(base_tree, reference=reference).dependencies['utils.py'] == ['forged']
+
+
+@pytest.mark.parametrize('low_memory', [False, True])
+def test_saved_snapshot_takes_digests_from_cache(base_tree, tmp_path, monkeypatch, low_memory):
+    options = ['--low-memory'] if low_memory else []
+    path = str(tmp_path / 'snapshot.json')
+    depviz.main(['--path', base_tree, '--save-snapshot', path] + options)
+    expected = Snapshot.load(path)
+
+    # Second run: every file is answered by the cache, so the snapshot does not hash any file either
+    def forbidden_digest(data):
+        raise AssertionError('file hashed again')
+    monkeypatch.setattr(snapshot_module, 'file_digest', forbidden_digest)
+    depviz.main(['--path', base_tree, '--save-snapshot', path] + options)
+
+    assert Snapshot.load(path).files == expected.files
+
+
+def test_diff_reuses_a_shared_cache_folder(base_tree, tmp_path, monkeypatch):
+    cache_dir = str(tmp_path / 'shared')
+    depviz.main(['--path', base_tree, '--cache-dir', cache_dir])
+
+    # Every file is answered by the cache of the project in the shared folder
+    monkeypatch.setattr(snapshot_module, 'extract_imports_from_source', lambda *args, **kwargs: pytest.fail('file parsed again'))
+    output = tmp_path / 'diff.json'
+    depviz.main(['diff', base_tree, base_tree, '--cache-dir', cache_dir, '--output-json', str(output)])
+
+    assert output.exists()
+
+
+def test_diff_of_identical_trees(base_tree):
+    diff = diff_snapshots(take_snapshot(base_tree), take_snapshot(base_tree))
+
+    assert diff['added_edges'] == diff['removed_edges'] == diff['new_cycles'] == []
+    assert format_diff(diff).endswith("✅ No new import cycle.")
+
+
+def test_diff_reports_edges_and_new_cycles(base_tree):
+    old = take_snapshot(base_tree)
+    make_tree(base_tree, {
+        'utils.py': 'import main\n',
+        'extra.py': 'import sys\n',
+    })
+    new = take_snapshot(base_tree, reference=old)
+
+    diff = diff_snapshots(old, new)
+
+    assert diff['added_files'] == ['extra.py']
+    assert diff['modified_files'] == ['utils.py']
+    assert edges(diff, 'added_edges') == [('extra.py', 'sys', 'stdlib'), ('utils.py', 'main.py', 'internal')]
+    assert edges(diff, 'removed_edges') == [('utils.py', 'json', 'stdlib')]
+    assert [entry['files'] for entry in diff['new_cycles']] == [['main.py', 'utils.py']]
+
+
+def test_diff_detects_imports_resolving_to_a_new_file(base_tree):
+    old = take_snapshot(base_tree)
+    make_tree(base_tree, {'settings.py': ''})
+    new = take_snapshot(base_tree, reference=old)
+
+    diff = diff_snapshots(old, new)
+
+    # 'helpers/tools.py' did not change, but its import is now ambiguous: the closest file is kept
+    assert diff['modified_files'] == []
+    assert edges(diff, 'added_edges') == []
+
+    os.remove(os.path.join(base_tree, 'helpers', 'settings.py'))
+    diff = diff_snapshots(new, take_snapshot(base_tree, reference=new))
+
+    assert diff['removed_files'] == [os.path.join('helpers', 'settings.py')]
+    assert edges(diff, 'added_edges') == [(os.path.join('helpers', 'tools.py'), 'settings.py', 'internal')]
+
+
+def test_build_partial_module_map_matches_full_map(base_tree):
+    files = sorted(take_snapshot(base_tree).files)
+    full_map = build_module_map(base_tree, files=files)
+    names = ['tools', 'helpers.tools', 'settings', 'missing']
+
+    assert build_partial_module_map(base_tree, files, names) == {name: full_map[name] for name in names if name in full_map}
+
+
+def test_diff_to_digraph_highlights_changes():
+    diff = {
+        'added_files': [], 'removed_files': [], 'modified_files': ['a.py'],
+        'added_edges': [{'source': 'a.py', 'target': 'b.py', 'kind': 'internal'}],
+        'removed_edges': [{'source': 'a.py', 'target': 'os', 'kind': 'stdlib'}],
+        'new_cycles': [],
+    }
+
+    source = diff_to_digraph(diff, output_format='dot').source
+
+    assert '"a.py" -> "b.py" [color="#2E8B57" penwidth=2 style=solid]' in source
+    assert '"a.py" -> os [color="#D9534F" penwidth=2 style=dashed]' in source
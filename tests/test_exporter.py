@@ -0,0 +1,88 @@
+import json
+import os
+import pytest
+from src import depviz
+from src.exporter import (JsonWriter, NdjsonWriter, RecordWriter, build_record)
+from src.parser import (build_module_map, iter_dependencies)
+from src.utils import ModuleResolver
+
+
+@pytest.fixture
+def example_project_path():
+    """
+    Returns the absolute path to the sample project
+    """
+    return os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'examples', 'project1'))
+
+
+def test_build_record_classifies_imports():
+    resolver = ModuleResolver({'utils': ['utils.py']})
+
+    record = build_record('main.py', ['utils', 'os', 'pytest', 'missing'], resolver)
+
+    assert record == {
+        'file': 'main.py',
+        'imports': [
+            {'name': 'utils', 'kind': 'internal', 'target': 'utils.py'},
+            {'name': 'os', 'kind': 'stdlib', 'target': None},
+            {'name': 'pytest', 'kind': 'external', 'target': None},
+            {'name': 'missing', 'kind': 'unknown', 'target': None},
+        ]
+    }
+
+
+@pytest.mark.parametrize("writer_class", [JsonWriter, NdjsonWriter])
+def test_writers_stream_records(writer_class, example_project_path, tmp_path):
+    output_path = str(tmp_path / 'deps.out')
+    resolver = ModuleResolver(build_module_map(example_project_path))
+
+    with writer_class(output_path) as writer:
+        for file, imports in iter_dependencies(example_project_path):
+            writer.write(build_record(file, imports, resolver))
+
+            # Each record is available as soon as it is written
+            with open(output_path, encoding='utf-8') as f:
+                assert f'"file": {json.dumps(file)}' in f.read()
+
+    with open(output_path, encoding='utf-8') as f:
+        content = f.read()
+
+    if writer_class is JsonWriter:
+        records = json.loads(content)
+    else:
+        records = [json.loads(line) for line in content.splitlines()]
+
+    assert writer.count == 3
+    assert [record['file'] for record in records] == [os.path.join('helpers', 'math.py'), 'main.py', 'utils.py']
+    main_imports = next(record['imports'] for record in records if record['file'] == 'main.py')
+    assert {'name': 'utils', 'kind': 'internal', 'target': 'utils.py'} in main_imports
+
+
+def test_writer_without_format_cannot_be_created(tmp_path):
+    class NoFormat(RecordWriter):
+        pass
+
+    with pytest.raises(TypeError):
+        NoFormat(str(tmp_path / 'records.txt'))
+
+
+def test_json_writer_without_records(tmp_path):
+    output_path = str(tmp_path / 'empty.json')
+
+    with JsonWriter(output_path):
+        pass
+
+    with open(output_path, encoding='utf-8') as f:
+        assert json.load(f) == []
+
+
+def test_json_on_stdout_stays_valid_without_cache(example_project_path, tmp_path, capsys):
+    # A file where the cache folder should be: the cache cannot be opened
+    cache_dir = tmp_path / 'not_a_folder'
+    cache_dir.write_text('', encoding='utf-8')
+
+    depviz.main(['--path', example_project_path, '--cache-dir', str(cache_dir), '--output-json', '-'])
+
+    captured = capsys.readouterr()
+    assert len(json.loads(captured.out)) == 3
+    assert 'Parse cache disabled' in captured.err
@@ -0,0 +1,70 @@
+import os
+import pytest
+from src.graph import (KIND_EXTERNAL, KIND_INTERNAL, KIND_STDLIB, KIND_UNKNOWN, GraphBuilder, build_graph)
+
+
+@pytest.fixture
+def graph():
+    dependencies = {
+        'main.py': ['utils', 'os', 'helpers.math', 'utils', 'pytest', 'missing'],
+        'utils.py': ['sys', 'os.path'],
+        os.path.join('helpers', 'math.py'): ['math', 'helpers.math'],
+    }
+    module_map = {
+        'utils': ['utils.py'],
+        'helpers.math': [os.path.join('helpers', 'math.py')],
+    }
+    return build_graph(dependencies, module_map)
+
+
+def test_build_graph_nodes_and_kinds(graph):
+    math_file = os.path.join('helpers', 'math.py')
+
+    # Source files come first, in the order of the dependencies
+    assert graph.names[:3] == ['main.py', 'utils.py', math_file]
+    assert graph.kind_name(graph.id('utils.py')) == 'internal'
+    assert graph.kinds[graph.id('os')] == KIND_STDLIB
+    assert graph.kinds[graph.id('pytest')] == KIND_EXTERNAL
+    assert graph.kinds[graph.id('missing')] == KIND_UNKNOWN
+    assert graph.kinds[graph.id(math_file)] == KIND_INTERNAL
+    assert graph.id('helpers.math') is None  # Resolved to its file
+
+
+def test_build_graph_edges(graph):
+    math_file = os.path.join('helpers', 'math.py')
+
+    assert list(graph.named_edges()) == [
+        ('main.py', 'utils.py'),
+        ('main.py', 'os'),
+        ('main.py', math_file),
+        ('main.py', 'pytest'),
+        ('main.py', 'missing'),
+        ('utils.py', 'sys'),
+        ('utils.py', 'os.path'),
+        (math_file, 'math'),
+    ]  # Duplicates and self-imports are ignored
+    assert graph.edge_count == 8
+    assert graph.out_degree(graph.id('main.py')) == 5
+    assert list(graph.successors(graph.id('utils.py'))) == [graph.id('sys'), graph.id('os.path')]
+
+
+def test_reverse_graph(graph):
+    reverse = graph.reverse()
+
+    assert reverse.edge_count == graph.edge_count
+    assert sorted(reverse.names[n] for n in reverse.successors(graph.id('utils.py'))) == ['main.py']
+    assert reverse.reverse() is graph
+
+
+def test_builder_interleaved_sources():
+    builder = GraphBuilder()
+    a, b, c = (builder.add_node(name, KIND_INTERNAL) for name in 'abc')
+    builder.add_edge(b, c)
+    builder.add_edge(a, b)
+    builder.add_edge(b, a)
+    builder.add_edge(a, a)
+
+    graph = builder.build()
+
+    assert list(graph.named_edges()) == [('a', 'b'), ('b', 'c'), ('b', 'a')]
+    assert graph.memory_size() == 3 * 1 + 4 * 8 + 3 * 4
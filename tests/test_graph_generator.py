@@ -2,7 +2,8 @@ import os
 import shutil
 import tempfile
 import pytest
-from src.graph_generator import build_dependency_graph
+from src.graph import (KIND_INTERNAL, KIND_STDLIB, build_graph)
+from src.graph_generator import (aggregate_graph, build_dependency_graph, render_graph, to_digraph)
 
 
 @pytest.fixture
@@ -55,3 +56,85 @@ def test_graph_generation_creates_output_file(test_data, temp_output_dir):
     # Assertion : vérifie que le fichier a bien été généré
     generated_file = output_path + ".png"
     assert os.path.exists(generated_file), f"Le fichier de graphe n’a pas été trouvé : {generated_file}"
+
+
+def test_to_digraph_styles_nodes_by_kind(test_data):
+    """
+    Test : vérifie les styles des nœuds sans appeler Graphviz.
+    """
+    dependencies, module_map, _ = test_data
+    source = to_digraph(build_graph(dependencies, module_map)).source
+
+    assert '"main.py" -> "examples/project1/utils.py" [color=black style=solid]' in source
+    assert '"utils.py" -> sys [color="#787878" style=solid]' in source
+    assert 'os [color="#BF984D" fillcolor="#FECA66"' in source
+    assert 'rankdir=LR' in source
+
+
+@pytest.fixture
+def package_graph():
+    """
+    Fixture : graphe d'un projet avec deux paquets.
+    """
+    dependencies = {
+        os.path.join('app', 'main.py'): ['core.a', 'core.b', 'os.path', 'os', 'numpyxyz'],
+        os.path.join('app', 'cli.py'): ['core.a', 'sys'],
+        os.path.join('core', 'a.py'): ['core.b', 'json'],
+        os.path.join('core', 'b.py'): [],
+    }
+    module_map = {
+        'core.a': [os.path.join('core', 'a.py')],
+        'core.b': [os.path.join('core', 'b.py')],
+    }
+    return build_graph(dependencies, module_map)
+
+
+def test_aggregate_graph_collapses_packages(package_graph):
+    nodes, edges = aggregate_graph(package_graph, collapse=True, group_imports='kind')
+
+    app, core = 'app' + os.sep, 'core' + os.sep
+    assert nodes[app] == [KIND_INTERNAL, 2]
+    assert nodes[core] == [KIND_INTERNAL, 2]
+    assert nodes['stdlib'] == [KIND_STDLIB, 4]
+    assert edges[(app, core)] == 3
+    assert edges[(app, 'stdlib')] == 3
+    assert (core, core) not in edges
+
+
+def test_aggregate_graph_groups_top_level_imports(package_graph):
+    nodes, edges = aggregate_graph(package_graph, group_imports='top-level')
+
+    assert nodes['os'] == [KIND_STDLIB, 2]
+    assert 'os.path' not in nodes
+    assert edges[(os.path.join('app', 'main.py'), 'os')] == 2
+
+
+def test_to_digraph_clusters_and_engine(package_graph):
+    dot = to_digraph(package_graph, engine='sfdp', clusters=True)
+
+    assert dot.engine == 'sfdp'
+    assert 'subgraph cluster_0' in dot.source
+    assert f'label="app{os.sep}"'.replace('\\', '\\\\') in dot.source
+
+
+def test_to_digraph_limits_number_of_nodes(package_graph):
+    source = to_digraph(package_graph, max_nodes=5).source
+
+    assert f'label="app{os.sep} (2)"'.replace('\\', '\\\\') in source
+    assert 'label="stdlib (4)"' in source
+    assert 'label=3 color=black penwidth=2.6' in source
+
+
+def test_render_graph_without_folder(test_data, tmp_path, monkeypatch):
+    """
+    Test : un chemin de sortie sans dossier (ex. '--export graph') est rendu dans le dossier courant.
+    """
+    graphviz = pytest.importorskip('graphviz')
+    rendered = []
+    monkeypatch.setattr(graphviz.Digraph, 'render', lambda self, path, **kwargs: rendered.append(path))
+    monkeypatch.chdir(tmp_path)
+    dependencies, module_map, _ = test_data
+
+    render_graph(build_graph(dependencies, module_map), output_path='graph', output_format='svg')
+
+    assert rendered == ['graph']
@@ -0,0 +1,78 @@
+import json
+import tracemalloc
+from src.instrumentation import (NullProfiler, Profiler)
+
+
+def test_stages_accumulate_time_and_calls():
+    profiler = Profiler()
+
+    for _ in range(3):
+        with profiler.stage('parse'):
+            pass
+    profiler.record('render', 0.5, calls=4)
+
+    assert profiler.stages['parse']['calls'] == 3
+    assert profiler.stages['render'] == {'time': 0.5, 'calls': 4}
+    assert 'peak_memory' not in profiler.stages['parse']
+
+
+def test_counters_are_reported_apart_from_stages():
+    profiler = Profiler()
+    profiler.count('find_spec_calls', 2)
+    profiler.count('find_spec_time', 0.25)
+
+    assert profiler.counters == {'find_spec_calls': 2, 'find_spec_time': 0.25}
+    assert 'find_spec_calls=2, find_spec_time=0.250' in profiler.format()
+    assert not profiler.stages
+
+
+def test_slowest_files_are_kept_in_order():
+    profiler = Profiler(slowest=2)
+
+    for rel_path, seconds in [('a.py', 0.1), ('b.py', 0.3), ('c.py', 0.2), ('d.py', 0.05)]:
+        profiler.record_file(rel_path, seconds)
+
+    assert profiler.slowest_files() == [('b.py', 0.3), ('c.py', 0.2)]
+
+
+def test_iter_files_times_each_item():
+    profiler = Profiler()
+    items = [('a.py', ['os']), ('b.py', [])]
+
+    assert list(profiler.iter_files(iter(items))) == items
+    assert sorted(rel_path for rel_path, _ in profiler.slowest_files()) == ['a.py', 'b.py']
+
+
+def test_memory_is_measured_on_request():
+    profiler = Profiler(memory=True)
+    with profiler.stage('allocate'):
+        data = [bytes(1000) for _ in range(1000)]
+    profiler.close()
+
+    assert profiler.stages['allocate']['peak_memory'] >= 1000 * 1000
+    assert not tracemalloc.is_tracing()
+    del data
+
+
+def test_report_is_serialisable():
+    profiler = Profiler()
+    with profiler.stage('walk'):
+        pass
+    profiler.count('files', 3)
+
+    report = json.loads(json.dumps(profiler.report()))
+
+    assert report['counters'] == {'files': 3}
+    assert 'walk' in profiler.format()
+
+
+def test_null_profiler_does_nothing():
+    profiler = NullProfiler()
+    stream = iter([('a.py', [])])
+
+    with profiler.stage('walk'):
+        profiler.count('files')
+        profiler.record_file('a.py', 1.0)
+
+    assert profiler.enabled is False
+    assert profiler.iter_files(stream) is stream
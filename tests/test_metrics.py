@@ -0,0 +1,85 @@
+import csv
+from src import depviz
+from src.graph import build_graph
+from src.metrics import (METRIC_COLUMNS, closure_and_depth, compute_metrics, pagerank, sort_metrics, write_metrics)
+
+
+def make_graph():
+    """
+    main -> app -> core <-> models -> utils, plus standard imports; 'tool' is not imported by anything.
+    """
+    dependencies = {
+        'main.py': ['app', 'os'],
+        'app.py': ['core', 'sys', 'os'],
+        'core.py': ['models'],
+        'models.py': ['core', 'utils', 'json'],
+        'utils.py': [],
+        'tool.py': ['utils'],
+    }
+    module_map = {file[:-3]: [file] for file in dependencies}
+    return build_graph(dependencies, module_map)
+
+
+def test_metrics_of_each_file():
+    rows, chain = compute_metrics(make_graph())
+    metrics = {row['file']: row for row in rows}
+
+    assert [row['file'] for row in rows] == ['main.py', 'app.py', 'core.py', 'models.py', 'utils.py', 'tool.py']
+    assert {name: (row['fan_in'], row['fan_out'], row['external']) for name, row in metrics.items()} == {
+        'main.py': (0, 1, 1), 'app.py': (1, 1, 2), 'core.py': (2, 1, 0),
+        'models.py': (1, 2, 1), 'utils.py': (2, 0, 0), 'tool.py': (0, 1, 0),
+    }
+    assert {name: row['reach'] for name, row in metrics.items()} == {'main.py': 4, 'app.py': 3, 'core.py': 2, 'models.py': 2, 'utils.py': 0, 'tool.py': 1}
+    # The import cycle between 'core' and 'models' counts as one step
+    assert {name: row['depth'] for name, row in metrics.items()} == {'main.py': 3, 'app.py': 2, 'core.py': 1, 'models.py': 1, 'utils.py': 0, 'tool.py': 1}
+    assert chain == ['main.py', 'app.py', 'core.py', 'models.py', 'utils.py']
+
+
+def test_pagerank_ranks_hubs_first():
+    graph = make_graph()
+    ranks = pagerank(graph)
+    files = [node for node in range(graph.node_count) if graph.kind_name(node) == 'internal']
+
+    assert abs(sum(ranks[node] for node in files) - len(files)) < 1e-6
+    assert ranks[graph.id('os')] == 0
+    assert ranks[graph.id('utils.py')] > ranks[graph.id('app.py')] > ranks[graph.id('main.py')]
+    assert ranks[graph.id('main.py')] == ranks[graph.id('tool.py')]
+
+
+def test_closure_of_a_long_chain():
+    # Deep chains are processed without recursion
+    dependencies = {f'm{i}.py': [f'm{i + 1}'] for i in range(5000)}
+    dependencies['m5000.py'] = []
+    graph = build_graph(dependencies, {file[:-3]: [file] for file in dependencies})
+
+    reach, depth, chain = closure_and_depth(graph)
+
+    assert reach[graph.id('m0.py')] == depth[graph.id('m0.py')] == 5000
+    assert len(chain) == 5001
+
+
+def test_sorted_csv(tmp_path):
+    rows, _ = compute_metrics(make_graph())
+    path = tmp_path / 'metrics.csv'
+
+    write_metrics(sort_metrics(rows, 'fan_in'), str(path))
+
+    with open(path, newline='', encoding='utf-8') as f:
+        written = list(csv.reader(f))
+    assert written[0] == list(METRIC_COLUMNS)
+    assert [line[0] for line in written[1:]] == ['core.py', 'utils.py', 'app.py', 'models.py', 'main.py', 'tool.py']
+    assert [row['file'] for row in sort_metrics(rows, 'file')] == sorted(row['file'] for row in rows)
+
+
+def test_command_line(tmp_path):
+    project = tmp_path / 'project'
+    for name, content in {'main.py': 'import app\n', 'app.py': 'import os\nimport util\n', 'util.py': ''}.items():
+        (project / name).parent.mkdir(parents=True, exist_ok=True)
+        (project / name).write_text(content, encoding='utf-8')
+    path = tmp_path / 'metrics.csv'
+
+    depviz.main(['--path', str(project), '--no-cache', '--metrics', str(path), '--metrics-sort', 'depth'])
+
+    with open(path, newline='', encoding='utf-8') as f:
+        rows = list(csv.DictReader(f))
+    assert [(row['file'], row['depth'], row['reach']) for row in rows] == [('main.py', '2', '2'), ('app.py', '1', '1'), ('util.py', '0', '0')]
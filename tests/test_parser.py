@@ -1,6 +1,6 @@
 import os
 import pytest
-from src.parser import (collect_all_dependencies, extract_imports_from_file, build_module_map)
+from src.parser import (EXTRACTORS, collect_all_dependencies, extract_imports_from_file, extract_imports_from_source, build_module_map)
 
 
 @pytest.fixture
@@ -70,3 +70,102 @@ def test_build_module_map(example_project_path):
     # Example: main -> main.py
     assert 'main' in module_map
     assert os.path.normpath('main.py') in map(os.path.normpath, module_map['main'])
+
+
+def test_collect_all_dependencies_in_parallel(example_project_path):
+    """
+    Check that the process pool returns the same results, in the same order, as the serial analysis.
+    """
+    serial = collect_all_dependencies(example_project_path)
+    parallel = collect_all_dependencies(example_project_path, jobs=2, chunk_size=1)
+
+    assert list(parallel.items()) == list(serial.items())
+
+
+def test_collect_all_dependencies_in_parallel_survives_failures(tmp_path):
+    """
+    Check that a file that cannot be analysed does not stop the parallel analysis.
+    """
+    (tmp_path / 'main.py').write_text('import os\n', encoding='utf-8')
+    (tmp_path / 'broken.py').write_text('def (:\n', encoding='utf-8')
+
+    deps = collect_all_dependencies(str(tmp_path), files=['broken.py', 'missing.py', 'main.py'], jobs=2, chunk_size=1)
+
+    assert deps == {'broken.py': [], 'missing.py': [], 'main.py': ['os']}
+
+
+@pytest.mark.parametrize('options', [{}, {'jobs': 2}, {'io_threads': 2}, {'symbols': {}}])
+def test_missing_file_is_skipped_whatever_the_mode(tmp_path, options):
+    """
+    Check that a file removed between the scan and the parse gives the same result with or without workers.
+    """
+    (tmp_path / 'main.py').write_text('import os\n', encoding='utf-8')
+
+    deps = collect_all_dependencies(str(tmp_path), files=['main.py', 'gone.py'], **options)
+
+    assert deps == {'main.py': ['os'], 'gone.py': []}
+
+
+NESTED_IMPORTS_SOURCE = '''
+import os, sys as system
+from . import sibling
+from ..pkg.mod import name, other as alias
+from json import *
+
+if TYPE_CHECKING:
+    import typing
+else:
+    try:
+        import ujson
+    except ImportError:
+        from json import loads
+    else:
+        import simplejson
+    finally:
+        import atexit
+
+def function():
+    import inner
+    while True:
+        with open('f') as f:
+            for _ in f:
+                import deep.module
+    return lambda: __import__('ignored')
+
+class Klass:
+    import klass_level
+
+    def method(self):
+        match self:
+            case 1:
+                import matched
+            case _:
+                pass
+
+async def coroutine():
+    async with lock:
+        import awaited
+'''
+
+
+def test_extractors_return_identical_results(example_project_path):
+    """
+    Check that every extraction engine returns the same imports, in the same order, as the reference one.
+    """
+    repository_path = os.path.join(example_project_path, '..', '..')
+    sources = [NESTED_IMPORTS_SOURCE]
+    for rel_path in collect_all_dependencies(repository_path):
+        with open(os.path.join(repository_path, rel_path), 'rb') as f:
+            sources.append(f.read())
+
+    for source in sources:
+        expected = extract_imports_from_source(source, extractor='ast')
+        for extractor in EXTRACTORS:
+            assert extract_imports_from_source(source, extractor=extractor) == expected
+
+
+def test_extractor_statements_finds_nested_imports():
+    imports = extract_imports_from_source(NESTED_IMPORTS_SOURCE, extractor='statements')
+
+    assert {'pkg.mod.name', 'sibling', 'json', 'ujson', 'json.loads', 'atexit', 'deep.module', 'matched', 'awaited'} <= set(imports)
+    assert 'ignored' not in imports
@@ -0,0 +1,48 @@
+import mmap
+from src.cache import ParseCache
+from src.parser import collect_all_dependencies
+from src.prefetch import (Prefetcher, read_file)
+
+
+def test_read_file_small_and_mapped(tmp_path):
+    path = tmp_path / 'module.py'
+    path.write_bytes(b'import os\n' * 100)
+
+    assert read_file(str(path)) == b'import os\n' * 100
+    mapped = read_file(str(path), mmap_threshold=10)
+    assert isinstance(mapped, mmap.mmap)
+    assert mapped[:] == b'import os\n' * 100
+
+    empty = tmp_path / 'empty.py'
+    empty.write_bytes(b'')
+    assert read_file(str(empty), mmap_threshold=1) == b''
+
+
+def test_prefetcher_map_keeps_order():
+    with Prefetcher(threads=4, window=3) as prefetcher:
+        results = [(item, future.result()) for item, future in prefetcher.map(lambda x: x * 2, range(20))]
+
+    assert results == [(i, i * 2) for i in range(20)]
+
+
+def test_prefetched_parsing_matches_sequential(tmp_path):
+    for i in range(30):
+        (tmp_path / f'mod_{i}.py').write_text(f'import os\nfrom . import mod_{(i + 1) % 30}\n', encoding='utf-8')
+    (tmp_path / 'invalid.py').write_text('import (\n', encoding='utf-8')
+    project_path = str(tmp_path)
+    cache_dir = str(tmp_path / '.depviz_cache')
+
+    expected = collect_all_dependencies(project_path)
+    assert collect_all_dependencies(project_path, io_threads=4) == expected
+
+    with ParseCache(cache_dir) as cache:
+        assert collect_all_dependencies(project_path, cache=cache, io_threads=4) == expected
+        assert cache.stats()['misses'] == 31
+
+    (tmp_path / 'mod_3.py').write_text('import json\n', encoding='utf-8')
+    with ParseCache(cache_dir) as cache:
+        deps = collect_all_dependencies(project_path, cache=cache, io_threads=4)
+        assert cache.stats()['hits'] == 30 and cache.stats()['misses'] == 1
+
+    assert list(deps) == list(expected)
+    assert deps['mod_3.py'] == ['json']
@@ -0,0 +1,105 @@
+import json
+import os
+import pytest
+from src import depviz
+from src.graph import build_graph
+from src.query import (find_nodes, load_index, query, save_index, traverse)
+
+
+@pytest.fixture
+def graph():
+    dependencies = {
+        'main.py': ['app.cli', 'os'],
+        os.path.join('app', 'cli.py'): ['app.core', 'os.path'],
+        os.path.join('app', 'core.py'): ['json'],
+        os.path.join('tests', 'test_core.py'): ['app.core'],
+    }
+    module_map = {
+        'main': ['main.py'],
+        'app.cli': [os.path.join('app', 'cli.py')],
+        'app.core': [os.path.join('app', 'core.py')],
+        'tests.test_core': [os.path.join('tests', 'test_core.py')],
+    }
+    return build_graph(dependencies, module_map)
+
+
+def names(results):
+    return [(entry['name'], entry['depth']) for entry in results]
+
+
+def test_index_round_trip(graph, tmp_path):
+    path = str(tmp_path / 'index.bin')
+    save_index(graph, path, '/project')
+
+    loaded, header = load_index(path)
+
+    assert header['project'] == '/project'
+    assert loaded.names == graph.names
+    assert list(loaded.kinds) == list(graph.kinds)
+    assert sorted(loaded.named_edges()) == sorted(graph.named_edges())
+    assert sorted(loaded.reverse().named_edges()) == sorted(graph.reverse().named_edges())
+
+
+def test_load_index_rejects_other_files(tmp_path):
+    path = tmp_path / 'other.bin'
+    path.write_bytes(b'{}\n')
+
+    with pytest.raises(ValueError):
+        load_index(str(path))
+
+
+def test_find_nodes_accepts_paths_and_module_names(graph):
+    core = graph.id(os.path.join('app', 'core.py'))
+
+    assert find_nodes(graph, 'app/core.py') == [core]
+    assert find_nodes(graph, 'app.core') == [core]
+    assert find_nodes(graph, 'core') == [core]
+    assert sorted(graph.names[node] for node in find_nodes(graph, 'os')) == ['os', 'os.path']
+    assert find_nodes(graph, 'missing') == []
+
+
+def test_reverse_dependencies_with_depth(graph):
+    assert names(query(graph, 'app.core', reverse=True)) == [
+        (os.path.join('app', 'cli.py'), 1),
+        (os.path.join('tests', 'test_core.py'), 1),
+        ('main.py', 2),
+    ]
+    assert names(query(graph, 'app.core', reverse=True, depth=1)) == [
+        (os.path.join('app', 'cli.py'), 1),
+        (os.path.join('tests', 'test_core.py'), 1),
+    ]
+    assert names(query(graph, 'os', reverse=True)) == [(os.path.join('app', 'cli.py'), 1), ('main.py', 1)]
+    assert query(graph, 'missing', reverse=True) is None
+
+
+def test_dependencies(graph):
+    results = query(graph, 'main.py')
+
+    assert names(results) == [
+        (os.path.join('app', 'cli.py'), 1),
+        ('os', 1),
+        (os.path.join('app', 'core.py'), 2),
+        ('os.path', 2),
+        ('json', 3),
+    ]
+    assert results[1]['kind'] == 'stdlib'
+
+
+def test_traverse_does_not_loop_on_cycles():
+    graph = build_graph({'a.py': ['b'], 'b.py': ['a']}, {'a': ['a.py'], 'b': ['b.py']})
+
+    assert traverse(graph, [graph.id('a.py')]) == [(graph.id('b.py'), 1)]
+
+
+def test_query_finds_the_index_in_a_shared_cache_folder(tmp_path):
+    project = tmp_path / 'project'
+    project.mkdir()
+    (project / 'main.py').write_text('import utils\n', encoding='utf-8')
+    (project / 'utils.py').write_text('', encoding='utf-8')
+    cache_dir = str(tmp_path / 'shared')
+    output = tmp_path / 'results.json'
+
+    depviz.main(['--path', str(project), '--cache-dir', cache_dir, '--save-index'])
+    depviz.main(['query', '--path', str(project), '--cache-dir', cache_dir, '--rdeps', 'utils.py', '--output-json', str(output)])
+
+    assert [entry['name'] for entry in json.loads(output.read_text(encoding='utf-8'))] == ['main.py']
@@ -0,0 +1,88 @@
+import json
+import os
+import pytest
+from src import depviz
+from src.graph import build_graph
+from src.parser import (build_module_map, collect_all_dependencies)
+from src.rules import (ALLOWED, FORBIDDEN, RuleSet, format_violations, locate_violations)
+from src.utils import ModuleResolver
+
+
+@pytest.fixture
+def project(tmp_path):
+    """
+    Creates a layered project: 'app/core' is imported by 'app/ui', and 'app/core/models.py' imports 'app/ui' back.
+    """
+    files = {
+        'app/__init__.py': '',
+        'app/core/__init__.py': '',
+        'app/core/models.py': 'import os\n\nfrom app.ui import views\nimport json\n',
+        'app/ui/__init__.py': '',
+        'app/ui/views.py': 'from app.core import models\nimport graphviz\n',
+    }
+    for rel_path, content in files.items():
+        path = tmp_path / rel_path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(content, encoding='utf-8')
+    return tmp_path
+
+
+def analyse(project):
+    module_map = build_module_map(str(project))
+    resolver = ModuleResolver(module_map)
+    return build_graph(collect_all_dependencies(str(project)), module_map, resolver=resolver), resolver
+
+
+RULES = {
+    'groups': {
+        'core': ['app/core/*'],
+        'ui': ['app/ui/*'],
+        'graphviz': 'graphviz',
+        'stdlib': ['os', 'json', 'sys'],
+    },
+    'forbidden': [{'from': 'core', 'to': ['ui'], 'reason': 'the core does not know its callers'}],
+    'allowed': [{'from': 'ui', 'to': ['core']}],
+}
+
+
+def test_groups_are_matched_in_declaration_order():
+    rules = RuleSet.from_dict({'groups': {'models': ['app/core/models.py'], 'core': ['app/core/*'], 'numpy': ['numpy', 'numpy.*']}})
+
+    assert rules.group_of(os.path.join('app', 'core', 'models.py')) == 'models'
+    assert rules.group_of('app/core/sub/tools.py') == 'core'
+    assert rules.group_of('numpy.linalg') == 'numpy'
+    assert rules.group_of('app/ui/views.py') is None
+
+
+def test_forbidden_and_allowed_edges(project):
+    graph, resolver = analyse(project)
+    models = os.path.join('app', 'core', 'models.py')
+    views = os.path.join('app', 'ui', 'views.py')
+
+    violations = RuleSet.from_dict(RULES).check(graph)
+    locate_violations(violations, str(project), resolver)
+
+    assert [(v['file'], v['target'], v['rule'], v['lines']) for v in violations] == [
+        (models, views, FORBIDDEN, [3]),
+        (views, 'graphviz', ALLOWED, [2]),
+    ]
+    assert f'{models}:3: imports {views} (core -> ui, forbidden): the core does not know its callers' in format_violations(violations)
+
+
+def test_invalid_rules():
+    with pytest.raises(ValueError):
+        RuleSet.from_dict({'groups': {'core': ['app/*']}, 'forbidden': [{'from': 'core', 'to': 'missing'}]})
+    with pytest.raises(ValueError):
+        RuleSet.from_dict({'forbidden': []})
+
+
+def test_command_line_exit_code(project, tmp_path_factory):
+    rules_path = tmp_path_factory.mktemp('rules') / 'rules.json'
+    rules_path.write_text(json.dumps(RULES), encoding='utf-8')
+
+    with pytest.raises(SystemExit) as exit_info:
+        depviz.main(['--path', str(project), '--no-cache', '--rules', str(rules_path)])
+    assert exit_info.value.code == 1
+
+    rules_path.write_text(json.dumps({'groups': RULES['groups'], 'forbidden': [{'from': 'ui', 'to': 'stdlib'}]}), encoding='utf-8')
+    depviz.main(['--path', str(project), '--no-cache', '--rules', str(rules_path)])
@@ -0,0 +1,86 @@
+import os
+import pytest
+from src.scanner import (IgnoreRules, scan_project)
+
+
+@pytest.fixture
+def example_project_path():
+    """
+    Returns the absolute path to the sample project
+    """
+    return os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'examples', 'project1'))
+
+
+def make_tree(root, files):
+    """
+    Creates the given files (relative paths with '/' separators) under the root directory.
+    """
+    for rel_path, content in files.items():
+        full_path = os.path.join(root, *rel_path.split('/'))
+        os.makedirs(os.path.dirname(full_path), exist_ok=True)
+        with open(full_path, 'w', encoding='utf-8') as f:
+            f.write(content)
+
+
+def test_scan_project_on_example_project(example_project_path):
+    files = scan_project(example_project_path)
+
+    assert files == sorted([
+        os.path.normpath('helpers/math.py'),
+        'main.py',
+        'utils.py',
+    ])
+
+
+def test_scan_project_skips_default_and_custom_ignores(tmp_path):
+    make_tree(tmp_path, {
+        'app.py': '',
+        'pkg/mod.py': '',
+        '.git/hooks/hook.py': '',
+        'build/lib/app.py': '',
+        'pkg/__pycache__/mod.py': '',
+        'pkg/mod_pb2.py': '',
+        'README.md': '',
+    })
+
+    files = scan_project(str(tmp_path), ignore_patterns=['*_pb2.py'])
+
+    assert files == ['app.py', os.path.join('pkg', 'mod.py')]
+
+
+def test_scan_project_skips_virtual_environments(tmp_path):
+    make_tree(tmp_path, {
+        'app.py': '',
+        'my-env/pyvenv.cfg': '',
+        'my-env/lib/site.py': '',
+    })
+
+    assert scan_project(str(tmp_path)) == ['app.py']
+
+
+def test_scan_project_honours_gitignore(tmp_path):
+    make_tree(tmp_path, {
+        '.gitignore': '# generated code\n/generated/\nscratch_*.py\n',
+        'app.py': '',
+        'scratch_test.py': '',
+        'generated/out.py': '',
+        'pkg/generated/kept.py': '',
+        'pkg/.gitignore': 'local.py\n',
+        'pkg/local.py': '',
+        'local.py': '',
+    })
+
+    assert scan_project(str(tmp_path)) == sorted([
+        'app.py',
+        'local.py',
+        os.path.join('pkg', 'generated', 'kept.py'),
+    ])
+
+    assert os.path.join('generated', 'out.py') in scan_project(str(tmp_path), use_gitignore=False)
+
+
+def test_ignore_rules_directory_only_pattern():
+    rules = IgnoreRules(['out/'])
+
+    assert rules.matches('out', 'src/out', is_dir=True) is True
+    assert rules.matches('out', 'src/out', is_dir=False) is False
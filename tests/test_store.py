@@ -0,0 +1,45 @@
+import pytest
+from src.store import DependencyStore
+
+
+def fill(store, count):
+    for i in range(count):
+        store[f'mod_{i}.py'] = [f'pkg.mod_{i + 1}', 'os']
+
+
+def test_entries_spill_to_disk_in_order():
+    with DependencyStore(memory_limit=4) as store:
+        fill(store, 5)
+
+        assert store.spills == 2
+        assert len(store) == 5
+        assert list(store) == [f'mod_{i}.py' for i in range(5)]
+        assert store['mod_0.py'] == ['pkg.mod_1', 'os']
+        assert dict(store.items())['mod_4.py'] == ['pkg.mod_5', 'os']
+        assert list(store.values())[2] == ['pkg.mod_3', 'os']
+
+
+def test_overwrite_and_delete_spilled_entries():
+    with DependencyStore(memory_limit=4) as store:
+        fill(store, 5)
+
+        store['mod_0.py'] = ['json']
+        del store['mod_1.py']
+        del store['mod_4.py']
+
+        assert store['mod_0.py'] == ['json']
+        assert 'mod_1.py' not in store and 'mod_4.py' not in store
+        assert 'mod_2.py' in store
+        assert len(store) == 3
+        assert list(store) == ['mod_0.py', 'mod_2.py', 'mod_3.py']
+
+
+def test_empty_imports_and_missing_keys():
+    with DependencyStore(memory_limit=1) as store:
+        store['empty.py'] = []
+        store['full.py'] = ['os']
+
+        assert store['empty.py'] == []
+        assert store.get('missing.py') is None
+        with pytest.raises(KeyError):
+            del store['missing.py']
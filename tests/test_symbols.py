@@ -0,0 +1,103 @@
+import os
+import pytest
+from src.cache import ParseCache
+from src.parser import (build_module_map, collect_all_dependencies, extract_imports_from_source, extract_symbols_from_source)
+from src.symbols import (ImportBinding, ModuleSymbols, analyse_symbols, format_symbol_report)
+from src.utils import ModuleResolver
+
+SOURCE = '''
+from __future__ import annotations
+import os, sys
+import os.path
+import numpy as np
+from .helpers import run, unused_fn as alias
+__all__ = ['alias']
+
+try:
+    import json
+except ImportError:
+    json = None
+
+
+def main():
+    return os.getcwd() + run()
+
+
+class Tool:
+    import re
+'''
+
+
+def test_symbols_are_collected_with_the_imports():
+    imports, symbols = extract_symbols_from_source(SOURCE)
+
+    assert imports == extract_imports_from_source(SOURCE)
+    assert symbols.definitions == ['Tool', '__all__', 'alias', 'annotations', 'json', 'main', 'np', 'os', 'run', 'sys']
+    assert symbols.exports == ['alias']
+    assert not symbols.star
+    assert [(binding.name, binding.used) for binding in symbols.bindings] == [
+        ('os', True), ('sys', False), ('os', True), ('np', False), ('run', True), ('alias', True), ('json', False), ('re', False),
+    ]
+    assert symbols.bindings[4] == ImportBinding('helpers.run', 'helpers', 'run', 6, True)
+
+
+def test_invalid_source_has_no_symbols():
+    assert extract_symbols_from_source('def (') == ([], ModuleSymbols([], None, [], False))
+
+
+@pytest.fixture
+def project(tmp_path):
+    """
+    Creates a project with a used import, an unused one, a dangling one and a package re-exporting a name.
+    """
+    (tmp_path / 'main.py').write_text(
+        'from helpers import run, missing\nfrom pkg import Tool\nimport os\n\nrun(Tool)\n', encoding='utf-8'
+    )
+    (tmp_path / 'helpers.py').write_text('def run(x):\n    return x\n', encoding='utf-8')
+    (tmp_path / 'pkg').mkdir()
+    (tmp_path / 'pkg' / '__init__.py').write_text('from .tool import Tool\n', encoding='utf-8')
+    (tmp_path / 'pkg' / 'tool.py').write_text('class Tool:\n    pass\n', encoding='utf-8')
+    return str(tmp_path)
+
+
+def analyse(project_path, **options):
+    symbols = {}
+    collect_all_dependencies(project_path, symbols=symbols, **options)
+    return analyse_symbols(symbols, ModuleResolver(build_module_map(project_path))), symbols
+
+
+def test_unused_and_dangling_imports(project):
+    report, _ = analyse(project)
+
+    assert report['resolved'] == 3
+    assert report['dangling'] == [{'file': 'main.py', 'line': 1, 'import': 'helpers.missing', 'name': 'missing', 'target': 'helpers.py'}]
+    assert [(problem['file'], problem['name']) for problem in report['unused']] == [('main.py', 'missing'), ('main.py', 'os')]
+    assert "'missing' is not defined in helpers.py" in format_symbol_report(report)
+
+
+def test_star_import_makes_names_unknown(project):
+    with open(os.path.join(project, 'helpers.py'), 'a', encoding='utf-8') as f:
+        f.write('from os.path import *\n')
+
+    report, _ = analyse(project)
+
+    assert report['dangling'] == []
+
+
+def test_symbols_are_cached_and_identical_in_every_mode(project, tmp_path):
+    cache_dir = str(tmp_path / '.depviz_cache')
+    _, expected = analyse(project)
+
+    # Entries stored without symbols are parsed again when symbols are requested
+    with ParseCache(cache_dir) as cache:
+        collect_all_dependencies(project, cache=cache)
+    with ParseCache(cache_dir) as cache:
+        _, symbols = analyse(project, cache=cache)
+        assert cache.stats()['misses'] == 4
+
+    for options in ({}, {'jobs': 2}, {'io_threads': 2}):
+        with ParseCache(cache_dir) as cache:
+            _, symbols = analyse(project, cache=cache, **options)
+            assert cache.stats()['hits'] == 4
+        assert symbols == expected
+        assert analyse(project, **options)[1] == expected
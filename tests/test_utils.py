@@ -1,6 +1,6 @@
 import pytest
 import os
-from src.utils import (is_standard_or_external, is_internal_module, resolve_module_name)
+from src.utils import (ModuleResolver, is_standard_or_external, is_internal_module, resolve_module_name)
 
 
 # ----------------------------------------------------------------------------
@@ -86,3 +86,65 @@ def test_resolve_module_name_context_closest():
     result = resolve_module_name("utils", module_map, current_file=current_file, project_path=project_path)
 
     assert result in {"src/utils.py", "other/utils.py"}  # L’un des deux doit être sélectionné
+
+
+
+# ----------------------------------------------------------------------------
+# Tests pour ModuleResolver
+# ----------------------------------------------------------------------------
+
+RESOLVER_MODULE_MAP = {
+    "utils": ["src/utils.py", "other/utils.py", "examples/project1/utils.py"],
+    "helpers": ["helpers/__init__.py"],
+    "helpers.math": ["examples/project1/helpers/math.py", "helpers/math.py"],
+    "project1.main": ["examples/project1/main.py"],
+    "a.b.c": ["deep/a/b/c.py"],
+}
+
+
+@pytest.mark.parametrize("module_name", [
+    "utils", "utils.function", "helpers", "helpers.math", "helpers.math.sqrt", "helpers.other",
+    "project1.main", "a.b.c.d", "a.b", "unknown", "",
+])
+@pytest.mark.parametrize("current_file", [
+    None, "main.py", "examples/project1/main.py", "examples/project1/helpers/math.py", "src/depviz.py",
+    "deep/a/b/x.py", "other/../src/tool.py",
+])
+def test_module_resolver_matches_resolve_module_name(module_name, current_file):
+    project_path = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+    resolver = ModuleResolver(RESOLVER_MODULE_MAP)
+
+    expected = resolve_module_name(module_name, RESOLVER_MODULE_MAP, current_file=current_file, project_path=project_path)
+
+    assert resolver.resolve(module_name, current_file=current_file) == expected
+    # Second call answered from the cache
+    assert resolver.resolve(module_name, current_file=current_file) == expected
+
+
+def test_module_resolver_candidates_most_specific_first():
+    resolver = ModuleResolver(RESOLVER_MODULE_MAP)
+
+    assert resolver.candidates("helpers.math.sqrt") == [
+        "examples/project1/helpers/math.py", "helpers/math.py", "helpers/__init__.py"
+    ]
+
+
+def test_module_resolver_update_matches_a_new_resolver():
+    module_map = {name: list(paths) for name, paths in RESOLVER_MODULE_MAP.items()}
+    resolver = ModuleResolver(module_map)
+    names = ["utils", "utils.function", "helpers.math.sqrt", "a.b.c.d", "a.b", "foo", "foo.bar"]
+    files = [None, "examples/project1/main.py", "deep/a/b/x.py"]
+    for name in names:
+        for current_file in files:
+            resolver.resolve(name, current_file=current_file)
+
+    # 'a.b' appears, 'helpers.math' loses a file, 'utils' disappears
+    module_map["a.b"] = ["deep/a/b.py"]
+    module_map["helpers.math"] = ["helpers/math.py"]
+    del module_map["utils"]
+    resolver.update({"a.b": module_map["a.b"], "helpers.math": module_map["helpers.math"], "utils": []})
+
+    fresh = ModuleResolver(module_map)
+    for name in names:
+        for current_file in files:
+            assert resolver.resolve(name, current_file=current_file) == fresh.resolve(name, current_file=current_file)
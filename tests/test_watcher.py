@@ -0,0 +1,232 @@
+import argparse
+import csv
+import json
+import os
+import shutil
+import sys
+import pytest
+from src import depviz
+from src.parser import build_module_map
+from src.rules import RuleSet
+from src.utils import ModuleResolver
+from src import watcher
+from src.watcher import (Changes, IncrementalProject, InotifyMonitor, PollingMonitor, watch)
+
+
+@pytest.fixture
+def project(tmp_path):
+    """
+    Creates a small project and returns its loaded state.
+    """
+    (tmp_path / 'main.py').write_text('import utils\n', encoding='utf-8')
+    (tmp_path / 'utils.py').write_text('import os\n', encoding='utf-8')
+    (tmp_path / 'pkg').mkdir()
+    (tmp_path / 'pkg' / 'tool.py').write_text('import json\n', encoding='utf-8')
+
+    state = IncrementalProject(str(tmp_path))
+    state.load()
+    return state
+
+
+def write(project, rel_path, content):
+    full_path = os.path.join(project.project_path, rel_path)
+    with open(full_path, 'w', encoding='utf-8') as f:
+        f.write(content)
+    # Make sure the modification is visible even on filesystems with a coarse timestamp resolution
+    stat = os.stat(full_path)
+    os.utime(full_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+
+def test_refresh_without_changes(project):
+    assert not project.refresh()
+
+
+def test_refresh_reparses_modified_files_only(project):
+    write(project, 'utils.py', 'import os\nimport sys\n')
+
+    changes = project.refresh()
+
+    assert changes == Changes([], ['utils.py'], [])
+    assert project.dependencies['utils.py'] == ['os', 'sys']
+    assert project.dependencies['main.py'] == ['utils']
+
+
+def test_refresh_patches_module_map(project):
+    write(project, os.path.join('pkg', 'new.py'), 'import utils\n')
+    os.remove(os.path.join(project.project_path, 'utils.py'))
+
+    changes = project.refresh()
+
+    assert changes == Changes([os.path.join('pkg', 'new.py')], [], ['utils.py'])
+    assert 'utils.py' not in project.dependencies
+    assert project.files == sorted(project.dependencies)
+    assert project.module_map == build_module_map(project.project_path)
+
+
+def test_detect_changes_of_given_paths(project):
+    write(project, 'main.py', 'import json\n')
+    os.remove(os.path.join(project.project_path, 'utils.py'))
+
+    assert project.detect_changes({'main.py', 'utils.py'}) == Changes([], ['main.py'], ['utils.py'])
+
+
+def test_changes_merge():
+    first = Changes(['a.py'], ['b.py'], ['c.py'])
+    second = Changes(['c.py'], ['d.py'], ['a.py'])
+
+    assert first.merge(second) == Changes([], ['b.py', 'c.py', 'd.py'], [])
+
+
+def test_watch_applies_changes(project):
+    class ScriptedMonitor:
+        # Returns a change on the first call, then nothing
+        def __init__(self):
+            self.calls = 0
+            self.closed = False
+
+        def wait(self, timeout=None):
+            self.calls += 1
+            if self.calls == 1:
+                write(project, 'main.py', 'import utils\nimport pkg.tool\n')
+                return project.detect_changes()
+            return Changes([], [], [])
+
+        def close(self):
+            self.closed = True
+
+    monitor = ScriptedMonitor()
+    received = []
+
+    watch(project, received.append, monitor=monitor, debounce=0, max_updates=1)
+
+    assert received == [Changes([], ['main.py'], [])]
+    assert project.dependencies['main.py'] == ['utils', 'pkg.tool']
+    assert monitor.closed
+
+
+def test_polling_monitor(project):
+    write(project, 'utils.py', 'import re\n')
+
+    assert PollingMonitor(project, interval=0).wait() == Changes([], ['utils.py'], [])
+
+
+@pytest.mark.skipif(not sys.platform.startswith('linux'), reason="inotify is only available on Linux")
+def test_inotify_monitor(project):
+    monitor = InotifyMonitor(project)
+    try:
+        write(project, os.path.join('pkg', 'tool.py'), 'import re\n')
+        assert monitor.wait(timeout=5) == Changes([], [os.path.join('pkg', 'tool.py')], [])
+    finally:
+        monitor.close()
+
+
+@pytest.mark.skipif(not sys.platform.startswith('linux'), reason="inotify is only available on Linux")
+def test_inotify_monitor_folder_moved_out(project, tmp_path_factory):
+    monitor = InotifyMonitor(project)
+    try:
+        shutil.move(os.path.join(project.project_path, 'pkg'), str(tmp_path_factory.mktemp('moved')))
+
+        assert monitor.wait(timeout=5) == Changes([], [], [os.path.join('pkg', 'tool.py')])
+        assert 'pkg' not in monitor._watches.values()
+    finally:
+        monitor.close()
+
+
+def test_added_file_is_resolved_by_its_importers(project):
+    write(project, 'main.py', 'import utils\nimport foo\n')
+    project.refresh()
+    assert project.resolver.resolve('foo') is None
+
+    write(project, 'foo.py', '')
+    changes = project.refresh()
+
+    assert changes == Changes(['foo.py'], [], [])
+    assert project.affected_importers(changes) == ['main.py']
+    assert project.resolver.resolve('foo') == 'foo.py'
+    assert project.files == ['foo.py', 'main.py', os.path.join('pkg', 'tool.py'), 'utils.py']
+
+    os.remove(os.path.join(project.project_path, 'utils.py'))
+    changes = project.refresh()
+
+    assert project.affected_importers(changes) == ['main.py']
+    assert project.resolver.resolve('utils') == ModuleResolver(project.module_map).resolve('utils') is None
+
+
+def test_watch_emits_the_records_of_affected_importers(project, tmp_path_factory, monkeypatch):
+    output = tmp_path_factory.mktemp('output') / 'records.ndjson'
+    write(project, 'main.py', 'import utils\nimport foo\n')
+    project.refresh()
+
+    def watch_once(project, on_change, monitor=None, debounce=0):
+        write(project, 'foo.py', 'import os\n')
+        changes = project.detect_changes()
+        project.apply(changes)
+        on_change(changes)
+
+    monkeypatch.setattr(watcher, 'create_monitor', lambda project, interval: PollingMonitor(project, interval=interval))
+    monkeypatch.setattr(watcher, 'watch', watch_once)
+    args = argparse.Namespace(interval=1.0, debounce=0, output_ndjson=str(output), output_json=None, export=None,
+                              cycles=False, fail_on_cycles=False, save_index=None, metrics=None)
+
+    depviz.run_watch(project, args, lambda *a: None)
+
+    records = [json.loads(line) for line in output.read_text(encoding='utf-8').splitlines()]
+    assert [record['file'] for record in records] == ['foo.py', 'main.py']
+    assert {'name': 'foo', 'kind': 'internal', 'target': 'foo.py'} in records[1]['imports']
+
+
+def test_watch_checks_the_rules_again(project, monkeypatch):
+    rules = RuleSet.from_dict({'groups': {'main': ['main.py'], 'utils': ['utils.py']}, 'forbidden': [{'from': 'main', 'to': 'utils'}]})
+
+    def watch_once(project, on_change, monitor=None, debounce=0):
+        write(project, 'main.py', 'import os\n')
+        changes = project.detect_changes()
+        project.apply(changes)
+        on_change(changes)
+
+    monkeypatch.setattr(watcher, 'create_monitor', lambda project, interval: PollingMonitor(project, interval=interval))
+    monkeypatch.setattr(watcher, 'watch', watch_once)
+    args = argparse.Namespace(interval=1.0, debounce=0, output_ndjson=None, output_json=None, export=None,
+                              cycles=False, fail_on_cycles=False, save_index=None, metrics=None, extractor='ast')
+    violations = [{'from': 'main.py', 'to': 'utils.py'}]
+
+    # The violation is fixed during the watch, so the exit code no longer depends on it
+    assert depviz.run_watch(project, args, lambda *a: None, rules=rules, violations=violations) == ([], [])
+
+
+def test_watch_keeps_the_latest_cycles(project, monkeypatch):
+    def watch_once(project, on_change, monitor=None, debounce=0):
+        write(project, 'utils.py', 'import main\n')
+        changes = project.detect_changes()
+        project.apply(changes)
+        on_change(changes)
+
+    monkeypatch.setattr(watcher, 'create_monitor', lambda project, interval: PollingMonitor(project, interval=interval))
+    monkeypatch.setattr(watcher, 'watch', watch_once)
+    args = argparse.Namespace(interval=1.0, debounce=0, output_ndjson=None, output_json=None, export=None,
+                              cycles=False, fail_on_cycles=True, save_index=None, metrics=None)
+
+    # The cycle appears during the watch, so '--fail-on-cycles' exits with code 1 once it stops
+    cycles, _ = depviz.run_watch(project, args, lambda *a: None, cycles=[])
+    assert [cycle['files'] for cycle in cycles] == [['main.py', 'utils.py']]
+
+
+def test_watch_writes_the_metrics_again(project, tmp_path_factory, monkeypatch):
+    path = tmp_path_factory.mktemp('output') / 'metrics.csv'
+
+    def watch_once(project, on_change, monitor=None, debounce=0):
+        write(project, 'utils.py', 'from pkg import tool\n')
+        changes = project.detect_changes()
+        project.apply(changes)
+        on_change(changes)
+
+    monkeypatch.setattr(watcher, 'create_monitor', lambda project, interval: PollingMonitor(project, interval=interval))
+    monkeypatch.setattr(watcher, 'watch', watch_once)
+    args = argparse.Namespace(interval=1.0, debounce=0, output_ndjson=None, output_json=None, export=None,
+                              cycles=False, fail_on_cycles=False, save_index=None, metrics=str(path), metrics_sort='depth')
+
+    depviz.run_watch(project, args, lambda *a: None)
+
+    with open(path, newline='', encoding='utf-8') as f:
+        rows = list(csv.DictReader(f))
+    assert [(row['file'], row['depth']) for row in rows][:2] == [('main.py', '2'), ('utils.py', '1')]
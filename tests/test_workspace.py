@@ -0,0 +1,98 @@
+import json
+import os
+import pytest
+from src import depviz
+from src.classifier import EXTERNAL
+from src.workspace import (Root, WorkspaceClassifier, WorkspaceResolver, analyse_workspace, discover_roots, make_roots, merge_shards, tomllib)
+
+
+@pytest.fixture
+def workspace(tmp_path):
+    """
+    Creates a monorepo with three packages: 'core' (pyproject.toml, 'src' layout), 'api' (setup.cfg with a
+    'package_dir') and a flat 'cli' tool, plus a workspace-level pyproject.toml.
+    """
+    files = {
+        'pyproject.toml': '[tool.ruff]\nline-length = 100\n',
+        'packages/core/pyproject.toml': '[project]\nname = "acme-core"\n[tool.setuptools.packages.find]\nwhere = ["src"]\n',
+        'packages/core/src/core/__init__.py': '',
+        'packages/core/src/core/models.py': 'from core import utils\n',
+        'packages/core/src/core/utils.py': 'import os\nfrom core.models import Model\n',
+        'packages/api/setup.cfg': '[metadata]\nname = acme-api\n[options]\npackage_dir =\n    =src\n',
+        'packages/api/src/api/__init__.py': '',
+        'packages/api/src/api/views.py': 'from core.models import Model\nimport utils\nimport json\n',
+        'tools/cli/setup.cfg': '[metadata]\nname = acme-cli\n',
+        'tools/cli/main.py': 'import api.views\n',
+    }
+    for rel_path, content in files.items():
+        path = tmp_path / rel_path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(content, encoding='utf-8')
+    return tmp_path
+
+
+def test_discover_roots(workspace):
+    roots = discover_roots(str(workspace))
+    prefixes = [root.prefix for root in roots]
+
+    assert prefixes == [os.path.join('packages', 'api', 'src'), os.path.join('packages', 'core', 'src'), os.path.join('tools', 'cli')]
+    assert roots[0].name == 'acme-api'
+    assert roots[2].name == 'acme-cli'
+    if tomllib is not None:
+        assert roots[1].name == 'acme-core'
+
+
+def test_make_roots_rejects_nested_and_missing_roots(workspace):
+    assert make_roots(str(workspace), ['tools/cli'])[0] == Root('cli', str(workspace / 'tools' / 'cli'), os.path.join('tools', 'cli'))
+
+    with pytest.raises(ValueError):
+        make_roots(str(workspace), ['packages', 'packages/core/src'])
+    with pytest.raises(ValueError):
+        make_roots(str(workspace), ['absent'])
+
+
+def test_resolution_across_packages(workspace):
+    shards = analyse_workspace(discover_roots(str(workspace)))
+    resolver = WorkspaceResolver(shards)
+    views = os.path.join('packages', 'api', 'src', 'api', 'views.py')
+    models = os.path.join('packages', 'core', 'src', 'core', 'models.py')
+
+    assert resolver.resolve('core.models', current_file=views) == models
+    # Short names are only guessed inside the root of the importing file
+    assert resolver.resolve('utils', current_file=views) is None
+    assert resolver.resolve('utils', current_file=models) == os.path.join('packages', 'core', 'src', 'core', 'utils.py')
+    assert resolver.split(views) == (os.path.join('packages', 'api', 'src'), os.path.join('api', 'views.py'))
+    assert resolver.packages == {'api', 'core', 'main'}
+
+
+def test_workspace_classifier_keeps_installed_packages_internal():
+    class Installed:
+        def classify(self, module_name):
+            return EXTERNAL
+
+    classifier = WorkspaceClassifier({'core'}, Installed())
+
+    assert classifier.classify('core.models') is None
+    assert classifier.classify('requests') == EXTERNAL
+
+
+def test_parallel_shards_and_cache(workspace):
+    roots = discover_roots(str(workspace))
+    cache_dir = str(workspace / '.depviz_cache')
+
+    sequential = merge_shards(analyse_workspace(roots, jobs=1, cache_dir=cache_dir))
+    shards = analyse_workspace(roots, jobs=2, cache_dir=cache_dir)
+
+    assert merge_shards(shards) == sequential
+    assert all(shard.cache_stats['misses'] == 0 for shard in shards)
+    assert len(os.listdir(os.path.join(cache_dir, 'shards'))) == len(roots)
+
+
+def test_command_line(workspace, tmp_path_factory):
+    output = tmp_path_factory.mktemp('out') / 'deps.ndjson'
+
+    depviz.main(['--path', str(workspace), '--discover-roots', '--no-cache', '--output-ndjson', str(output)])
+
+    records = {record['file']: record for record in map(json.loads, output.read_text(encoding='utf-8').splitlines())}
+    views = records[os.path.join('packages', 'api', 'src', 'api', 'views.py')]
+    assert [imp['kind'] for imp in views['imports']] == ['internal', 'unknown', 'stdlib']